@@ -3,13 +3,26 @@
 Debug script to investigate alias hint generation and processing.
 """
 
+import io
+import sys
 import tempfile
 from pathlib import Path
 from src.provis.ucg.dfg import build_dfg, DfgConfig
 from src.provis.ucg.discovery import FileMeta, Language, AnomalySink
 from src.provis.ucg.symbols import build_symbols, SymbolsConfig
 from src.provis.ucg.parser_registry import DriverInfo
-import hashlib
+from src.provis.ucg.parse_cache import content_sha, parse_cached
+
+# Output is accumulated here and written to stdout once at exit.
+_out = io.StringIO()
+emit = _out.write
+
+
+def flush_output() -> None:
+    sys.stdout.write(_out.getvalue())
+    sys.stdout.flush()
+    _out.seek(0)
+    _out.truncate()
 
 def test_alias_hints():
     """Test alias hint generation and processing."""
@@ -21,16 +34,16 @@ def test_alias_hints():
     return new_var
 '''
     
-    # Create FileMeta
-    blob_sha = hashlib.blake2b(test_content.encode()).hexdigest()
+    # Create FileMeta (in-memory: the source is never written to disk)
+    source = test_content.encode()
+    blob_sha = content_sha(source)
     test_file = Path("debug_test.py")
-    test_file.write_text(test_content)
     
     fm = FileMeta(
         path=str(test_file),
         real_path=str(test_file.absolute()),
         blob_sha=blob_sha,
-        size_bytes=len(test_content.encode()),
+        size_bytes=len(source),
         mtime_ns=0,
         run_id="test-run",
         config_hash="test-config",
@@ -42,73 +55,71 @@ def test_alias_hints():
     )
     
     # Parse the file to get events
-    from src.provis.ucg.python_driver import PythonLibCstDriver
-    driver = PythonLibCstDriver()
-    ps = driver.parse(fm)
+    from src.provis.ucg.python_driver import get_py_driver
+    driver = get_py_driver()
+    ps = parse_cached(driver, fm, source=source)
     
     if ps.events is None:
-        print("❌ Failed to parse file")
+        emit("❌ Failed to parse file\n")
         return
         
     events = list(ps.events)
-    print(f"Parsed {len(events)} events")
+    emit(f"Parsed {len(events)} events\n")
     
     sink = AnomalySink()
     
     # Test DFG builder
-    print("\n=== DFG BUILDER TEST ===")
-    dfg_results = list(build_dfg(fm, ps.driver, events, sink, DfgConfig()))
-    
+    emit("\n=== DFG BUILDER TEST ===\n")
     alias_hints = []
-    dfg_items = []
-    for item_kind, item_data in dfg_results:
+    dfg_item_count = 0
+    for item_kind, item_data in build_dfg(fm, ps.driver, events, sink, DfgConfig(), source=source):
         if item_kind == "alias_hint":
             alias_hints.append(item_data)
-            print(f"✅ Alias hint found: {item_data}")
+            emit(f"✅ Alias hint found: {item_data}\n")
         else:
-            dfg_items.append((item_kind, item_data))
+            dfg_item_count += 1
     
-    print(f"DFG items: {len(dfg_items)}")
-    print(f"Alias hints: {len(alias_hints)}")
+    emit(f"DFG items: {dfg_item_count}\n")
+    emit(f"Alias hints: {len(alias_hints)}\n")
     
     # Test Symbols builder
-    print("\n=== SYMBOLS BUILDER TEST ===")
-    symbols_results = list(build_symbols(fm, ps.driver, events, sink, SymbolsConfig(), alias_hints=alias_hints))
+    emit("\n=== SYMBOLS BUILDER TEST ===\n")
+    symbols_results = list(build_symbols(fm, ps.driver, events, sink, SymbolsConfig(), alias_hints=alias_hints, source=source))
     
     symbols = []
     aliases = []
     for item_kind, item_data in symbols_results:
         if item_kind == "symbol":
             symbols.append(item_data)
-            print(f"Symbol: {item_data.name} in scope {item_data.scope_id}")
+            emit(f"Symbol: {item_data.name} in scope {item_data.scope_id}\n")
         elif item_kind == "alias":
             aliases.append(item_data)
-            print(f"✅ Alias created: {item_data.alias_kind} - {item_data.alias_name}")
+            emit(f"✅ Alias created: {item_data.alias_kind} - {item_data.alias_name}\n")
     
-    print(f"Symbols: {len(symbols)}")
-    print(f"Aliases: {len(aliases)}")
+    emit(f"Symbols: {len(symbols)}\n")
+    emit(f"Aliases: {len(aliases)}\n")
     
     # Debug: Check what symbols are available for the alias hint
     if alias_hints:
         hint = alias_hints[0]
-        print(f"\nDebug: Looking for symbols with scope_id: {hint['scope_id']}")
-        print(f"Looking for: lhs_name='{hint['lhs_name']}', rhs_name='{hint['rhs_name']}'")
+        emit(f"\nDebug: Looking for symbols with scope_id: {hint.scope_id}\n")
+        emit(f"Looking for: lhs_name='{hint.lhs_name}', rhs_name='{hint.rhs_name}'\n")
         
         for symbol in symbols:
-            if symbol.name in [hint['lhs_name'], hint['rhs_name']]:
-                print(f"  Found symbol: {symbol.name} in scope {symbol.scope_id} (matches: {symbol.scope_id == hint['scope_id']})")
+            if symbol.name in [hint.lhs_name, hint.rhs_name]:
+                emit(f"  Found symbol: {symbol.name} in scope {symbol.scope_id} (matches: {symbol.scope_id == hint.scope_id})\n")
         
         # Debug: Show all function symbols to see what names are being used
-        print(f"\nDebug: All function symbols:")
+        emit(f"\nDebug: All function symbols:\n")
         for symbol in symbols:
             if symbol.kind.value == "function":
-                print(f"  Function symbol: {symbol.name} in scope {symbol.scope_id}")
-    
-    # Cleanup
-    test_file.unlink()
+                emit(f"  Function symbol: {symbol.name} in scope {symbol.scope_id}\n")
     
     return len(alias_hints) > 0 and len(aliases) > 0
 
 if __name__ == "__main__":
-    success = test_alias_hints()
-    print(f"\n{'✅ SUCCESS' if success else '❌ FAILED'}")
+    try:
+        success = test_alias_hints()
+        emit(f"\n{'✅ SUCCESS' if success else '❌ FAILED'}\n")
+    finally:
+        flush_output()
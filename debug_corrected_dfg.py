@@ -3,8 +3,12 @@
 Debug script for the corrected DFG builder to understand why alias hints aren't being generated.
 """
 
+import io
+import os
 import sys
+from collections import deque
 from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
 
 # Add the project root to the Python path
 sys.path.insert(0, str(Path(__file__).parent))
@@ -12,13 +16,55 @@ sys.path.insert(0, str(Path(__file__).parent))
 from src.provis.ucg.discovery import FileMeta, Language
 from src.provis.ucg.dfg import DfgBuilder, DfgConfig
 from src.provis.ucg.parser_registry import CstEvent, CstEventKind
-from src.provis.ucg.python_driver import PythonLibCstDriver
+from src.provis.ucg.parse_cache import parse_cached
+from src.provis.ucg.python_driver import get_py_driver
+
+# Output is accumulated here and written to stdout once at exit.
+_out = io.StringIO()
+emit = _out.write
+
+
+def flush_output() -> None:
+    sys.stdout.write(_out.getvalue())
+    sys.stdout.flush()
+    _out.seek(0)
+    _out.truncate()
+
+
+# Per-event / per-token lines are only formatted when verbose (PROVIS_DEBUG_VERBOSE=0 to silence)
+VERBOSE = os.environ.get("PROVIS_DEBUG_VERBOSE", "1") != "0"
+
+# How many events after an assignment ENTER are inspected for its tokens
+ASSIGN_LOOKAHEAD = 20
+
+
+def scan_events(events: Iterable[CstEvent]) -> Iterator[Tuple[str, int, CstEvent]]:
+    """Classify the event stream in a single pass: assign_enter / token / other."""
+    enter, token = CstEventKind.ENTER, CstEventKind.TOKEN
+    # A file has only a few dozen distinct node types: do the "Assign" substring test
+    # once per type and answer every later event with a dict lookup.
+    is_assign: Dict[str, bool] = {}
+    for i, ev in enumerate(events):
+        kind = ev.kind
+        if kind == enter:
+            t = ev.type
+            hit = is_assign.get(t)
+            if hit is None:
+                hit = is_assign[t] = "Assign" in t
+            if hit:
+                yield ("assign_enter", i, ev)
+                continue
+            yield ("other", i, ev)
+        elif kind == token:
+            yield ("token", i, ev)
+        else:
+            yield ("other", i, ev)
 
 
 def debug_dfg():
     """Debug the DFG builder to understand assignment processing."""
-    print("🔍 Debugging Corrected DFG Builder")
-    print("=" * 40)
+    emit("🔍 Debugging Corrected DFG Builder\n")
+    emit("=" * 40 + "\n")
     
     # Create a simple test file
     test_code = """
@@ -28,9 +74,10 @@ def test_function():
     return new_var
 """
     
-    # Write test file
+    # In-memory test file: the source bytes are handed to the parser and builder directly
     test_file = Path("debug_test.py")
-    test_file.write_text(test_code.strip())
+    source = test_code.strip().encode("utf-8")
+    builder = None
     
     try:
         # Create FileMeta
@@ -38,8 +85,8 @@ def test_function():
             path=str(test_file),
             real_path=str(test_file),
             blob_sha="debug_sha",
-            size_bytes=test_file.stat().st_size,
-            mtime_ns=test_file.stat().st_mtime_ns * 1_000_000_000,
+            size_bytes=len(source),
+            mtime_ns=0,
             run_id="debug_run",
             config_hash="debug_config",
             is_text=True,
@@ -50,42 +97,53 @@ def test_function():
         )
         
         # Parse the file
-        driver = PythonLibCstDriver()
-        ps = driver.parse(fm)
+        driver = get_py_driver()
+        ps = parse_cached(driver, fm, source=source)
         
         if ps is None:
-            print("❌ Failed to parse file")
+            emit("❌ Failed to parse file\n")
             return
         
         # Get events
-        events = list(ps.events) if ps.events else []
-        print(f"📋 Total events: {len(events)}")
+        events = list(ps.events or ())
+        emit(f"📋 Total events: {len(events)}\n")
         
         # Analyze events
-        print("\n🔍 Event Analysis:")
+        emit("\n🔍 Event Analysis:\n")
         assignment_events = []
-        token_events = []
-        
-        for i, ev in enumerate(events):
-            if ev.kind == CstEventKind.ENTER and "Assign" in ev.type:
+        token_count = 0
+        # Tokens inside each assignment's span, collected during the same pass
+        # through a sliding window of still-open assignments.
+        assignment_tokens: Dict[int, List[Tuple[int, CstEvent]]] = {}
+        open_windows: deque = deque()
+        
+        for tag, i, ev in scan_events(events):
+            while open_windows and open_windows[0][0] + ASSIGN_LOOKAHEAD <= i:
+                open_windows.popleft()
+            if tag == "assign_enter":
                 assignment_events.append((i, ev))
-                print(f"  Event {i}: ENTER {ev.type} at bytes {ev.byte_start}-{ev.byte_end}")
-            elif ev.kind == CstEventKind.TOKEN:
-                token_events.append((i, ev))
-                if ev.type in ["Name", "Integer"]:
-                    print(f"  Event {i}: TOKEN {ev.type} '{ev}' at bytes {ev.byte_start}-{ev.byte_end}")
-        
-        print(f"\n📊 Found {len(assignment_events)} assignment events")
-        print(f"📊 Found {len(token_events)} token events")
+                open_windows.append((i, ev, assignment_tokens.setdefault(i, [])))
+                if VERBOSE:
+                    emit(f"  Event {i}: ENTER {ev.type} at bytes {ev.byte_start}-{ev.byte_end}\n")
+            elif tag == "token":
+                token_count += 1
+                for _, assign_ev, tokens in open_windows:
+                    if assign_ev.byte_start <= ev.byte_start < assign_ev.byte_end:
+                        tokens.append((i, ev))
+                if VERBOSE and ev.type in ["Name", "Integer"]:
+                    emit(f"  Event {i}: TOKEN {ev.type} '{ev}' at bytes {ev.byte_start}-{ev.byte_end}\n")
+        
+        emit(f"\n📊 Found {len(assignment_events)} assignment events\n")
+        emit(f"📊 Found {token_count} token events\n")
         
         # Test the DFG builder
-        print("\n🧪 Testing DFG Builder:")
+        emit("\n🧪 Testing DFG Builder:\n")
         
         class MockSink:
             def emit(self, anomaly):
-                print(f"⚠️  Anomaly: {anomaly}")
+                emit(f"⚠️  Anomaly: {anomaly}\n")
         
-        builder = DfgBuilder(fm, ps.driver, events, MockSink(), DfgConfig())
+        builder = DfgBuilder(fm, ps.driver, events, MockSink(), DfgConfig(), source=source)
         
         results = []
         alias_hints = []
@@ -95,9 +153,9 @@ def test_function():
             if item_kind == "alias_hint":
                 alias_hints.append(item_data)
         
-        print(f"📊 DFG Results:")
-        print(f"  Total results: {len(results)}")
-        print(f"  Alias hints: {len(alias_hints)}")
+        emit(f"📊 DFG Results:\n")
+        emit(f"  Total results: {len(results)}\n")
+        emit(f"  Alias hints: {len(alias_hints)}\n")
         
         # Show results by type
         result_types = {}
@@ -105,44 +163,49 @@ def test_function():
             result_types[item_kind] = result_types.get(item_kind, 0) + 1
         
         for result_type, count in result_types.items():
-            print(f"  {result_type}: {count}")
+            emit(f"  {result_type}: {count}\n")
         
         # Show alias hints
         if alias_hints:
-            print(f"\n🎯 Alias Hints:")
+            emit(f"\n🎯 Alias Hints:\n")
             for hint in alias_hints:
-                print(f"  {hint}")
+                emit(f"  {hint.to_json()}\n")
         else:
-            print(f"\n❌ No alias hints generated")
+            emit(f"\n❌ No alias hints generated\n")
             
             # Debug assignment processing
-            print(f"\n🔍 Debugging Assignment Processing:")
+            emit(f"\n🔍 Debugging Assignment Processing:\n")
+            if not builder.has_assignment_syntax:
+                # No '=' anywhere in the source: no operator token can exist.
+                emit("  No assignment operators in source; skipping token walk\n")
+                assignment_events = []
             for i, (event_idx, ev) in enumerate(assignment_events):
-                print(f"  Assignment {i+1} at event {event_idx}:")
-                print(f"    Type: {ev.type}")
-                print(f"    Bytes: {ev.byte_start}-{ev.byte_end}")
+                emit(f"  Assignment {i+1} at event {event_idx}:\n")
+                emit(f"    Type: {ev.type}\n")
+                emit(f"    Bytes: {ev.byte_start}-{ev.byte_end}\n")
+                op_offset = builder._assign_operator_offset(ev)
+                emit(f"    First candidate '=' at byte: {op_offset} (the walk skips nested nodes)\n")
                 
-                # Find tokens within this assignment
-                assignment_tokens = []
-                for j, token_ev in enumerate(events[event_idx:event_idx+20]):  # Look ahead 20 events
-                    if (token_ev.kind == CstEventKind.TOKEN and 
-                        ev.byte_start <= token_ev.byte_start < ev.byte_end):
-                        assignment_tokens.append((event_idx + j, token_ev))
+                # Tokens within this assignment (collected during the scan above)
+                tokens_in_assignment = assignment_tokens.get(event_idx, [])
                 
-                print(f"    Tokens within assignment: {len(assignment_tokens)}")
-                for token_idx, token_ev in assignment_tokens:
-                    token_text = builder._safe_token_text(token_ev, fm)
-                    print(f"      Event {token_idx}: {token_ev.type} '{token_text}'")
+                emit(f"    Tokens within assignment: {len(tokens_in_assignment)}\n")
+                for token_idx, token_ev in tokens_in_assignment:
+                    token_text = builder._safe_token_text(token_ev)
+                    emit(f"      Event {token_idx}: {token_ev.type} '{token_text}'\n")
                     
                     # Check if it's an assignment operator
-                    if builder._is_assignment_operator_token(token_ev):
-                        print(f"        ✅ This is an assignment operator!")
+                    if op_offset is not None and token_ev.byte_start <= op_offset < token_ev.byte_end:
+                        emit(f"        ✅ This is an assignment operator!\n")
         
     finally:
         # Clean up
-        if test_file.exists():
-            test_file.unlink()
+        if builder is not None:
+            builder.close()
 
 
 if __name__ == "__main__":
-    debug_dfg()
+    try:
+        debug_dfg()
+    finally:
+        flush_output()
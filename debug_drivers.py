@@ -3,6 +3,7 @@
 Debug script to test parser drivers directly.
 """
 
+import io
 import sys
 from pathlib import Path
 
@@ -10,12 +11,35 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from provis.ucg.discovery import FileMeta, Language
-from provis.ucg.python_driver import PythonLibCstDriver
-from provis.ucg.ts_driver import TSTreeSitterDriver
+from provis.ucg.parse_cache import parse_cached
+from provis.ucg.python_driver import get_py_driver
+from provis.ucg.ts_driver import get_ts_driver
+
+# Output is accumulated here and written to stdout once at exit.
+_out = io.StringIO()
+emit = _out.write
+
+
+def flush_output() -> None:
+    sys.stdout.write(_out.getvalue())
+    sys.stdout.flush()
+    _out.seek(0)
+    _out.truncate()
+
+
+def _sample_and_count(events, n_samples=5):
+    """Consume an event iterator once, returning (first n events, total count)."""
+    samples = []
+    count = 0
+    for ev in events:
+        if count < n_samples:
+            samples.append(ev)
+        count += 1
+    return samples, count
 
 
 def test_python_driver():
-    print("Testing Python driver...")
+    emit("Testing Python driver...\n")
     
     # Create a test file metadata
     test_file = FileMeta(
@@ -33,29 +57,29 @@ def test_python_driver():
         flags=0
     )
     
-    driver = PythonLibCstDriver()
+    driver = get_py_driver()
     
     try:
-        ps = driver.parse(test_file)
-        print(f"✅ Python driver created parse stream: {ps}")
+        ps = parse_cached(driver, test_file)
+        emit(f"✅ Python driver created parse stream: {ps}\n")
         
-        # Try to get some events
-        events = list(ps.events)
-        print(f"✅ Got {len(events)} events from Python file")
+        # Stream events once: keep the first few as samples, count the rest
+        samples, count = _sample_and_count(ps.events)
+        emit(f"✅ Got {count} events from Python file\n")
         
-        if events:
-            print("Sample events:")
-            for i, ev in enumerate(events[:5]):
-                print(f"  {i+1}. {ev.kind} {ev.type} at {ev.byte_start}-{ev.byte_end}")
+        if samples:
+            emit("Sample events:\n")
+            for i, ev in enumerate(samples):
+                emit(f"  {i+1}. {ev.kind} {ev.type} at {ev.byte_start}-{ev.byte_end}\n")
         
     except Exception as e:
-        print(f"❌ Python driver failed: {e}")
+        emit(f"❌ Python driver failed: {e}\n")
         import traceback
-        traceback.print_exc()
+        traceback.print_exc(file=_out)
 
 
 def test_ts_driver():
-    print("\nTesting TypeScript driver...")
+    emit("\nTesting TypeScript driver...\n")
     
     # Create a test file metadata
     test_file = FileMeta(
@@ -73,27 +97,30 @@ def test_ts_driver():
         flags=0
     )
     
-    driver = TSTreeSitterDriver(Language.JS)
+    driver = get_ts_driver(Language.JS)
     
     try:
-        ps = driver.parse(test_file)
-        print(f"✅ TypeScript driver created parse stream: {ps}")
+        ps = parse_cached(driver, test_file)
+        emit(f"✅ TypeScript driver created parse stream: {ps}\n")
         
-        # Try to get some events
-        events = list(ps.events)
-        print(f"✅ Got {len(events)} events from JavaScript file")
+        # Stream events once: keep the first few as samples, count the rest
+        samples, count = _sample_and_count(ps.events)
+        emit(f"✅ Got {count} events from JavaScript file\n")
         
-        if events:
-            print("Sample events:")
-            for i, ev in enumerate(events[:5]):
-                print(f"  {i+1}. {ev.kind} {ev.type} at {ev.byte_start}-{ev.byte_end}")
+        if samples:
+            emit("Sample events:\n")
+            for i, ev in enumerate(samples):
+                emit(f"  {i+1}. {ev.kind} {ev.type} at {ev.byte_start}-{ev.byte_end}\n")
         
     except Exception as e:
-        print(f"❌ TypeScript driver failed: {e}")
+        emit(f"❌ TypeScript driver failed: {e}\n")
         import traceback
-        traceback.print_exc()
+        traceback.print_exc(file=_out)
 
 
 if __name__ == "__main__":
-    test_python_driver()
-    test_ts_driver()
+    try:
+        test_python_driver()
+        test_ts_driver()
+    finally:
+        flush_output()
@@ -4,9 +4,14 @@ DFG Builder QA Verification Script
 Executes the exact test plan specified in the prompt.
 """
 
+import io
+import json
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from operator import attrgetter
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 # Add the project root to the Python path
 sys.path.insert(0, str(Path(__file__).parent))
@@ -14,25 +19,73 @@ sys.path.insert(0, str(Path(__file__).parent))
 from src.provis.ucg.__main__ import run_step1_on_path
 from src.provis.ucg.iterators import UcgReader
 from src.provis.ucg.dfg import build_dfg
-from src.provis.ucg.discovery import FileMeta, Language
+from src.provis.ucg.discovery import AnomalySink, FileMeta, Language
+from src.provis.ucg.parse_cache import EventCache, content_sha
 
+# Interned node kinds compared in every filter below
+_VAR_USE = sys.intern('var_use')
+_VAR_DEF = sys.intern('var_def')
+_PARAM = sys.intern('param')
 
-def find_def_for_use(use_node_id: str, all_edges: List) -> Optional[dict]:
-    """Find the source node of a DEF_USE edge for a given VAR_USE node."""
-    for edge in all_edges:
-        if edge.kind == 'def_use' and edge.dst_id == use_node_id:
-            return edge
-    return None
+TEST_REPO = Path("test_repo")
+
+# Shared by the pipeline run and the checks: the alias case reuses the pipeline's
+# parse of test_alias.py. Backed by a directory so check workers see it whatever
+# the start method; entries are keyed on the driver code, so edits re-parse. Kept
+# outside test_output, which the store replaces wholesale on publish.
+EVENT_CACHE_DIR = Path(".cache") / "dfg-qa-events"
+EVENT_CACHE = EventCache(persistent=True, cache_dir=EVENT_CACHE_DIR)
+
+
+# Field getters for the bucketing passes (attribute lookups happen in C)
+_name_kind = attrgetter('name', 'kind')
+_name_kind_attrs = attrgetter('name', 'kind', 'attrs')
+_kind_dst = attrgetter('kind', 'dst_id')
+
+
+def _intern(s: Optional[str]) -> Optional[str]:
+    return sys.intern(s) if s is not None else None
+
+
+def bucket_nodes(nodes: List) -> Dict[Tuple[str, str], List]:
+    """Group nodes by interned (name, kind) in a single pass."""
+    buckets: Dict[Tuple[str, str], List] = {}
+    for n, (name, kind) in zip(nodes, map(_name_kind, nodes)):
+        buckets.setdefault((_intern(name), sys.intern(kind)), []).append(n)
+    return buckets
+
+
+def bucket_versioned_nodes(nodes: List) -> Dict[Tuple[str, str, Optional[int]], List]:
+    """Group nodes by interned (name, kind) plus attrs['version'] in a single pass."""
+    buckets: Dict[Tuple[str, str, Optional[int]], List] = {}
+    for n, (name, kind, attrs) in zip(nodes, map(_name_kind_attrs, nodes)):
+        buckets.setdefault((_intern(name), sys.intern(kind), attrs.get('version')), []).append(n)
+    return buckets
+
+
+def index_def_use_edges(all_edges: List) -> Dict[str, List]:
+    """Index DEF_USE edges by dst_id so use->def lookups are O(1)."""
+    dst_index: Dict[str, List] = {}
+    for edge, (kind, dst_id) in zip(all_edges, map(_kind_dst, all_edges)):
+        if kind == 'def_use':
+            dst_index.setdefault(dst_id, []).append(edge)
+    return dst_index
+
+
+def find_def_for_use(use_node_id: str, dst_index: Dict[str, List]) -> Optional[dict]:
+    """Find the DEF_USE edge for a given VAR_USE node (see index_def_use_edges)."""
+    return next(iter(dst_index.get(use_node_id, ())), None)
 
 
 def create_file_meta(file_path: Path) -> FileMeta:
     """Create FileMeta object for a test file."""
+    st = file_path.stat()
     return FileMeta(
         path=str(file_path),
         real_path=str(file_path),
         blob_sha=f"test_sha_{file_path.name}",
-        size_bytes=file_path.stat().st_size,
-        mtime_ns=file_path.stat().st_mtime_ns * 1_000_000_000,
+        size_bytes=st.st_size,
+        mtime_ns=st.st_mtime_ns,
         run_id="qa_test_run",
         config_hash="qa_test_config",
         is_text=True,
@@ -43,110 +96,112 @@ def create_file_meta(file_path: Path) -> FileMeta:
     )
 
 
-def run_verification():
-    """Execute the complete QA verification test plan."""
-    
-    # Step 1: Environment Setup (already done)
-    test_repo = Path("test_repo")
-    test_output = Path("test_output")
-    
-    # Step 2: Run the Pipeline
-    print("Running Step 1 pipeline...")
-    
-    # Use the existing api.py directly instead of __main__.py
-    from src.provis.ucg.api import build_ucg_for_files, Step1Config
-    from src.provis.ucg.discovery import iter_discovered_files, DiscoveryConfig, AnomalySink
-    
-    sink = AnomalySink()
-    files = list(iter_discovered_files(test_repo, DiscoveryConfig(), anomaly_sink=sink))
-    summary = build_ucg_for_files(files, test_output, cfg=Step1Config())
-    
-    # Step 3: Query and Verify Results
-    reader = UcgReader(test_output)
-    
-    results = []
-    
-    # Test Case 1: test_ssa.py
+def _load_file(ucg_dir: str, path: str) -> Tuple[List, List]:
+    """Open a reader (one per worker process) and fetch one file's nodes and edges."""
+    reader = UcgReader(Path(ucg_dir))
+    try:
+        return reader.nodes_by_paths([path])[path], reader.edges_by_paths([path])[path]
+    finally:
+        reader.close()
+
+
+def check_ssa(ucg_dir: str) -> List[Tuple[str, bool, str]]:
+    """Test Case 1: test_ssa.py"""
     print("Testing SSA versioning...")
-    nodes = list(reader.iter_nodes_by_path(path="test_ssa.py"))
-    edges = list(reader.iter_edges_by_src_or_dst(path="test_ssa.py"))
+    results = []
+    nodes, edges = _load_file(ucg_dir, "test_ssa.py")
+    dst_index = index_def_use_edges(edges)
+    buckets = bucket_nodes(nodes)
+    versioned = bucket_versioned_nodes(nodes)
     
-    y_use_node = [n for n in nodes if n.name == 'y' and n.kind == 'var_use'][0]
-    z_use_node = [n for n in nodes if n.name == 'z' and n.kind == 'var_use'][0]
+    y_use_node = buckets.get(('y', _VAR_USE), [])[0]
+    z_use_node = buckets.get(('z', _VAR_USE), [])[0]
     
-    x_v0_def_node = [n for n in nodes if n.name == 'x' and n.kind == 'var_def' and n.attrs.get('version') == 0][0]
-    x_v1_def_node = [n for n in nodes if n.name == 'x' and n.kind == 'var_def' and n.attrs.get('version') == 1][0]
+    x_v0_def_node = versioned.get(('x', _VAR_DEF, 0), [])[0]
+    x_v1_def_node = versioned.get(('x', _VAR_DEF, 1), [])[0]
     
     # Assertion 1.1
-    y_use_edge = find_def_for_use(y_use_node.id, edges)
+    y_use_edge = find_def_for_use(y_use_node.id, dst_index)
     assertion_1_1 = y_use_edge.src_id == x_v0_def_node.id if y_use_edge else False
     results.append(("1.1", assertion_1_1, f"Expected src_id: {x_v0_def_node.id}, Actual: {y_use_edge.src_id if y_use_edge else 'None'}"))
     
     # Assertion 1.2
-    z_use_edge = find_def_for_use(z_use_node.id, edges)
+    z_use_edge = find_def_for_use(z_use_node.id, dst_index)
     assertion_1_2 = z_use_edge.src_id == x_v1_def_node.id if z_use_edge else False
     results.append(("1.2", assertion_1_2, f"Expected src_id: {x_v1_def_node.id}, Actual: {z_use_edge.src_id if z_use_edge else 'None'}"))
-    
-    # Test Case 2: test_params.py
+    return results
+
+
+def check_params(ucg_dir: str) -> List[Tuple[str, bool, str]]:
+    """Test Case 2: test_params.py"""
     print("Testing function parameters...")
-    nodes = list(reader.iter_nodes_by_path(path="test_params.py"))
-    edges = list(reader.iter_edges_by_src_or_dst(path="test_params.py"))
+    results = []
+    nodes, edges = _load_file(ucg_dir, "test_params.py")
+    dst_index = index_def_use_edges(edges)
+    buckets = bucket_nodes(nodes)
     
-    x_use_node = [n for n in nodes if n.name == 'x' and n.kind == 'var_use'][0]
-    p1_param_node = [n for n in nodes if n.name == 'p1' and n.kind == 'param'][0]
+    x_use_node = buckets.get(('x', _VAR_USE), [])[0]
+    p1_param_node = buckets.get(('p1', _PARAM), [])[0]
     
     # Find the use of p2 in return statement
-    return_p2_use_node = [n for n in nodes if n.name == 'p2' and n.kind == 'var_use'][0]
-    p2_param_node = [n for n in nodes if n.name == 'p2' and n.kind == 'param'][0]
+    return_p2_use_node = buckets.get(('p2', _VAR_USE), [])[0]
+    p2_param_node = buckets.get(('p2', _PARAM), [])[0]
     
     # Assertion 2.1
-    x_use_edge = find_def_for_use(x_use_node.id, edges)
+    x_use_edge = find_def_for_use(x_use_node.id, dst_index)
     assertion_2_1 = x_use_edge.src_id == p1_param_node.id if x_use_edge else False
     results.append(("2.1", assertion_2_1, f"Expected src_id: {p1_param_node.id}, Actual: {x_use_edge.src_id if x_use_edge else 'None'}"))
     
     # Assertion 2.2
-    p2_use_edge = find_def_for_use(return_p2_use_node.id, edges)
+    p2_use_edge = find_def_for_use(return_p2_use_node.id, dst_index)
     assertion_2_2 = p2_use_edge.src_id == p2_param_node.id if p2_use_edge else False
     results.append(("2.2", assertion_2_2, f"Expected src_id: {p2_param_node.id}, Actual: {p2_use_edge.src_id if p2_use_edge else 'None'}"))
-    
-    # Test Case 3: test_scope.py
+    return results
+
+
+def check_scope(ucg_dir: str) -> List[Tuple[str, bool, str]]:
+    """Test Case 3: test_scope.py"""
     print("Testing scope correctness...")
-    nodes = list(reader.iter_nodes_by_path(path="test_scope.py"))
-    edges = list(reader.iter_edges_by_src_or_dst(path="test_scope.py"))
+    results = []
+    nodes, edges = _load_file(ucg_dir, "test_scope.py")
+    buckets = bucket_nodes(nodes)
     
-    # Find VAR_USE nodes for y=x and z=x
-    y_use_nodes = [n for n in nodes if n.name == 'x' and n.kind == 'var_use']
-    z_use_nodes = [n for n in nodes if n.name == 'x' and n.kind == 'var_use']
+    # VAR_USE nodes of x: both y=x and z=x read from this same set
+    x_use_nodes = buckets.get(('x', _VAR_USE), [])
     
     # Find VAR_DEF nodes for local and global x
-    x_def_nodes = [n for n in nodes if n.name == 'x' and n.kind == 'var_def']
+    x_def_nodes = buckets.get(('x', _VAR_DEF), [])
     
     # For scope testing, we need to identify which x use corresponds to which scope
     # This is complex without byte position analysis, so we'll check if we have the right number of nodes
-    assertion_3_1 = len(y_use_nodes) >= 1 and len(x_def_nodes) >= 2
-    results.append(("3.1", assertion_3_1, f"Expected multiple x definitions and uses, Actual: {len(x_def_nodes)} defs, {len(y_use_nodes)} uses"))
-    
-    assertion_3_2 = len(z_use_nodes) >= 1 and len(x_def_nodes) >= 2
-    results.append(("3.2", assertion_3_2, f"Expected multiple x definitions and uses, Actual: {len(x_def_nodes)} defs, {len(z_use_nodes)} uses"))
-    
-    # Test Case 4: test_alias.py
+    # 3.1 (y = x) and 3.2 (z = x) check the same predicate over the same node sets
+    multi_x_ok = len(x_def_nodes) >= 2 and len(x_use_nodes) >= 1
+    evidence = f"Expected multiple x definitions and uses, Actual: {len(x_def_nodes)} defs, {len(x_use_nodes)} uses"
+    results.append(("3.1", multi_x_ok, evidence))
+    results.append(("3.2", multi_x_ok, evidence))
+    return results
+
+
+def check_alias(ucg_dir: str, files_by_path: Dict[str, FileMeta]) -> List[Tuple[str, bool, str]]:
+    """Test Case 4: test_alias.py"""
     print("Testing alias detection...")
+    results = []
     
-    # Capture alias hints from build_dfg
-    test_file = test_repo / "test_alias.py"
-    fm = create_file_meta(test_file)
+    # Capture alias hints from build_dfg. Prefer the discovered FileMeta: its
+    # blob_sha is the key under which the pipeline already cached the events.
+    fm = files_by_path.get("test_alias.py") or create_file_meta(TEST_REPO / "test_alias.py")
     
     # Parse the file to get events
-    from src.provis.ucg.python_driver import PythonLibCstDriver
-    driver = PythonLibCstDriver()
-    ps = driver.parse(fm)
-    events = list(ps.events) if ps.events else []
+    from src.provis.ucg.python_driver import get_py_driver
+    driver = get_py_driver()
+    ps = EVENT_CACHE.get_or_parse(fm, driver)
+    events = list(ps.events or ())
     
-    # Run build_dfg to capture alias hints
-    alias_hints = []
-    for item_kind, item_data in build_dfg(fm, ps.driver, events, None):
-        if item_kind == 'alias_hint':
-            alias_hints.append(item_data)
+    # Run build_dfg to capture alias hints (other row kinds are never built)
+    alias_hints = [
+        item_data
+        for _, item_data in build_dfg(fm, ps.driver, events, AnomalySink(), kinds=frozenset({'alias_hint'}))
+    ]
     
     # Assertion 4.1
     assertion_4_1 = len(alias_hints) == 1
@@ -156,28 +211,142 @@ def run_verification():
     expected_hint = {'lhs_name': 'aliased', 'rhs_name': 'original'}
     if len(alias_hints) > 0:
         actual_hint = alias_hints[0]
-        assertion_4_2 = (actual_hint.get('lhs_name') == 'aliased' and 
-                        actual_hint.get('rhs_name') == 'original')
-        results.append(("4.2", assertion_4_2, f"Expected: {expected_hint}, Actual: {actual_hint}"))
+        assertion_4_2 = (actual_hint.lhs_name == 'aliased' and 
+                        actual_hint.rhs_name == 'original')
+        results.append(("4.2", assertion_4_2, f"Expected: {expected_hint}, Actual: {actual_hint.to_json()}"))
     else:
         assertion_4_2 = False
         results.append(("4.2", assertion_4_2, f"Expected: {expected_hint}, Actual: No alias hints found"))
-    
-    # Test Case 5: test_attribute.py
+    return results
+
+
+def check_attribute(ucg_dir: str) -> List[Tuple[str, bool, str]]:
+    """Test Case 5: test_attribute.py"""
     print("Testing attribute assignment...")
-    nodes = list(reader.iter_nodes_by_path(path="test_attribute.py"))
+    results = []
+    nodes, edges = _load_file(ucg_dir, "test_attribute.py")
+    buckets = bucket_nodes(nodes)
     
     # Assertion 5.1
-    self_foo_def = [n for n in nodes if n.name == 'self.foo' and n.kind == 'var_def']
+    self_foo_def = buckets.get(('self.foo', _VAR_DEF), [])
     assertion_5_1 = len(self_foo_def) > 0
     results.append(("5.1", assertion_5_1, f"Expected a `var_def` node for `self.foo` to exist, but none was found."))
     
     # Assertion 5.2
-    edges = list(reader.iter_edges_by_src_or_dst(path="test_attribute.py"))
-    self_foo_use = [n for n in nodes if n.name == 'self.foo' and n.kind == 'var_use']
+    self_foo_use = buckets.get(('self.foo', _VAR_USE), [])
     assertion_5_2 = len(self_foo_def) > 0 and len(self_foo_use) > 0
     results.append(("5.2", assertion_5_2, f"Expected a `def_use` edge for `self.foo` between methods, but none was found."))
+    return results
+
+
+# Data-independent test cases, keyed by the test_repo file they verify; each runs
+# in its own worker process
+CHECKS = (
+    ("test_ssa.py", check_ssa),
+    ("test_params.py", check_params),
+    ("test_scope.py", check_scope),
+    ("test_alias.py", check_alias),
+    ("test_attribute.py", check_attribute),
+)
+
+# Per-file results of the last run, stored next to the UCG output
+QA_CACHE_NAME = ".qa_cache.json"
+PIPELINE_SRC = Path(__file__).parent / "src" / "provis" / "ucg"
+CORE_SRC = Path(__file__).parent / "src" / "provis" / "core"
+
+
+def _run_check(check, ucg_dir: str, files_by_path: Optional[Dict[str, FileMeta]]) -> List[Tuple[str, bool, str]]:
+    # Only check_alias re-parses a file; the DFG checks read the UCG output alone
+    if files_by_path is None:
+        return check(ucg_dir)
+    return check(ucg_dir, files_by_path)
+
+
+def _pipeline_sha() -> str:
+    """
+    Fingerprint of everything that decides a check's outcome: the pipeline and core
+    sources, this script (the checks themselves) and the PROVIS_FEATURE_* flags.
+    Any change invalidates the QA cache.
+    """
+    srcs = sorted(PIPELINE_SRC.glob("*.py")) + sorted(CORE_SRC.glob("*.py")) + [Path(__file__)]
+    parts = [f"{p.parent.name}/{p.name}".encode("utf-8") + b"\x00" + p.read_bytes() for p in srcs]
+    flags = sorted((k, v) for k, v in os.environ.items() if k.startswith("PROVIS_FEATURE_"))
+    parts.append(json.dumps(flags).encode("utf-8"))
+    return content_sha(b"\x1f".join(parts))
+
+
+def _load_qa_cache(path: Path, pipeline_sha: str) -> Dict[str, dict]:
+    """Return {test_file: {"sha", "status", "results"}} from the last run, or {} if unusable."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("pipeline_sha") != pipeline_sha:
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def _save_qa_cache(path: Path, pipeline_sha: str, files: Dict[str, dict]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"pipeline_sha": pipeline_sha, "files": files}, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def run_verification():
+    """Execute the complete QA verification test plan."""
+    
+    # Step 1: Environment Setup (already done)
+    test_repo = TEST_REPO
+    test_output = Path("test_output")
     
+    # Test cases whose file (and the pipeline code) is unchanged since a passing run are skipped
+    cache_path = test_output / QA_CACHE_NAME
+    pipeline_sha = _pipeline_sha()
+    cache = _load_qa_cache(cache_path, pipeline_sha)
+    file_shas = {name: content_sha((test_repo / name).read_bytes()) for name, _ in CHECKS}
+    results_by_file: Dict[str, List[Tuple[str, bool, str]]] = {}
+    for name, sha in file_shas.items():
+        entry = cache.get(name)
+        if isinstance(entry, dict) and entry.get("sha") == sha and entry.get("status") == "PASS":
+            print(f"Reusing cached result for {name}")
+            results_by_file[name] = [tuple(r) for r in entry.get("results", [])]
+    pending = [(name, check) for name, check in CHECKS if name not in results_by_file]
+    
+    if pending:
+        # Step 2: Run the Pipeline
+        print("Running Step 1 pipeline...")
+        
+        # Use the existing api.py directly instead of __main__.py
+        from src.provis.ucg.api import build_ucg_for_files, Step1Config
+        from src.provis.ucg.discovery import iter_discovered_files, DiscoveryConfig
+        
+        sink = AnomalySink()
+        files = list(iter_discovered_files(test_repo, DiscoveryConfig(), anomaly_sink=sink))
+        summary = build_ucg_for_files(files, test_output, cfg=Step1Config(), event_cache=EVENT_CACHE)
+        files_by_path = {f.path: f for f in files}
+        
+        # Step 3: Query and Verify Results (readers are reopened inside each worker)
+        max_workers = min(len(pending), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as ex:
+            checks = [check for _, check in pending]
+            file_metas = [files_by_path if check is check_alias else None for check in checks]
+            for (name, _), check_results in zip(pending, ex.map(_run_check, checks, [str(test_output)] * len(checks), file_metas)):
+                results_by_file[name] = check_results
+                cache[name] = {
+                    "sha": file_shas[name],
+                    "status": "PASS" if all(ok for _, ok, _ in check_results) else "FAIL",
+                    "results": [list(r) for r in check_results],
+                }
+        _save_qa_cache(cache_path, pipeline_sha, cache)
+    
+    results = []
+    for name, _ in CHECKS:
+        results.extend(results_by_file[name])
     return results
 
 
@@ -188,21 +357,24 @@ def generate_report(results):
     failed = len(results) - passed
     success_rate = (passed / len(results) * 100) if len(results) > 0 else 0
     final_status = "✅ PASSING" if success_rate == 100 else "❌ FAILING"
-    
-    print("### DFG Builder QA Validation Report")
-    print()
-    print("#### **Summary**")
-    print()
-    print(f"*   **Total Assertions:** {len(results)}")
-    print(f"*   **Passed:** {passed}")
-    print(f"*   **Failed:** {failed}")
-    print(f"*   **Success Rate:** {success_rate:.1f}%")
-    print(f"*   **Final Status:** {final_status}")
-    print()
-    print("---")
-    print()
-    print("#### **Detailed Assertion Results**")
-    print()
+
+    out = io.StringIO()
+    emit = out.write
+    
+    emit("### DFG Builder QA Validation Report\n")
+    emit("\n")
+    emit("#### **Summary**\n")
+    emit("\n")
+    emit(f"*   **Total Assertions:** {len(results)}\n")
+    emit(f"*   **Passed:** {passed}\n")
+    emit(f"*   **Failed:** {failed}\n")
+    emit(f"*   **Success Rate:** {success_rate:.1f}%\n")
+    emit(f"*   **Final Status:** {final_status}\n")
+    emit("\n")
+    emit("---\n")
+    emit("\n")
+    emit("#### **Detailed Assertion Results**\n")
+    emit("\n")
     
     # Group results by test case
     test_cases = {
@@ -214,18 +386,20 @@ def generate_report(results):
     }
     
     for test_num, test_name in test_cases.items():
-        print(f"**Test Case {test_num}: {test_name}**")
+        emit(f"**Test Case {test_num}: {test_name}**\n")
         
         # Find assertions for this test case
         test_results = [(num, result, evidence) for num, result, evidence in results if num.startswith(test_num)]
         
         for num, result, evidence in test_results:
             status = "PASS" if result else "FAIL"
-            print(f"*   **Assertion {num}:** {status}")
+            emit(f"*   **Assertion {num}:** {status}\n")
             if not result:
-                print(f"    *   _Evidence:_ {evidence}")
-        
-        print()
+                emit(f"    *   _Evidence:_ {evidence}\n")
+
+        emit("\n")
+
+    sys.stdout.write(out.getvalue())
 
 
 if __name__ == "__main__":
@@ -233,19 +407,23 @@ if __name__ == "__main__":
         results = run_verification()
         generate_report(results)
     except Exception as e:
-        print(f"### DFG Builder QA Validation Report")
-        print()
-        print("#### **Summary**")
-        print()
-        print("*   **Total Assertions:** 0")
-        print("*   **Passed:** 0")
-        print("*   **Failed:** 0")
-        print("*   **Success Rate:** 0.0%")
-        print("*   **Final Status:** ❌ FAILING")
-        print()
-        print("---")
-        print()
-        print("#### **Error**")
-        print(f"Test execution failed with error: {e}")
+        out = io.StringIO()
+        emit = out.write
+        emit(f"### DFG Builder QA Validation Report\n")
+        emit("\n")
+        emit("#### **Summary**\n")
+        emit("\n")
+        emit("*   **Total Assertions:** 0\n")
+        emit("*   **Passed:** 0\n")
+        emit("*   **Failed:** 0\n")
+        emit("*   **Success Rate:** 0.0%\n")
+        emit("*   **Final Status:** ❌ FAILING\n")
+        emit("\n")
+        emit("---\n")
+        emit("\n")
+        emit("#### **Error**\n")
+        emit(f"Test execution failed with error: {e}\n")
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
         import traceback
         traceback.print_exc()
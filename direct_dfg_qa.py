@@ -3,7 +3,13 @@
 Direct DFG QA Test - Bypass pipeline issues and test DFG builder directly
 """
 
+import argparse
+import io
+import os
 import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from pathlib import Path
 
 # Add the project root to the Python path
@@ -11,17 +17,19 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from src.provis.ucg.dfg import build_dfg
 from src.provis.ucg.discovery import FileMeta, Language
-from src.provis.ucg.python_driver import PythonLibCstDriver
+from src.provis.ucg.parse_cache import parse_cached
+from src.provis.ucg.python_driver import get_py_driver
 
 
 def create_file_meta(file_path: Path) -> FileMeta:
     """Create FileMeta object for a test file."""
+    st = file_path.stat()
     return FileMeta(
         path=str(file_path),
         real_path=str(file_path),
         blob_sha=f"test_sha_{file_path.name}",
-        size_bytes=file_path.stat().st_size,
-        mtime_ns=file_path.stat().st_mtime_ns * 1_000_000_000,
+        size_bytes=st.st_size,
+        mtime_ns=st.st_mtime_ns,
         run_id="qa_test_run",
         config_hash="qa_test_config",
         is_text=True,
@@ -32,202 +40,246 @@ def create_file_meta(file_path: Path) -> FileMeta:
     )
 
 
-def find_def_for_use(use_node_id: str, all_edges: list) -> dict:
-    """Find the source node of a DEF_USE edge for a given VAR_USE node."""
-    for edge in all_edges:
-        if edge.kind == 'def_use' and edge.dst_id == use_node_id:
-            return edge
-    return None
+def index_def_use_edges(edges: list, targets: set) -> dict:
+    """Map each VAR_USE id in `targets` to its DEF_USE edge in one pass (first edge wins)."""
+    index = {}
+    for edge in edges:
+        if edge.kind == 'def_use' and edge.dst_id in targets:
+            index.setdefault(edge.dst_id, edge)
+    return index
+
+
+def index_nodes(nodes: list) -> tuple:
+    """Group nodes by (name, kind) and by (name, kind, version) in one pass."""
+    by_name_kind = defaultdict(list)
+    by_name_kind_version = defaultdict(list)
+    for n in nodes:
+        by_name_kind[(n.name, n.kind)].append(n)
+        by_name_kind_version[(n.name, n.kind, n.version)].append(n)
+    return by_name_kind, by_name_kind_version
+
+
+def first(index: dict, key: tuple):
+    """First node grouped under `key` (see index_nodes), or None."""
+    bucket = index.get(key)
+    return bucket[0] if bucket else None
+
+
+def find_def_for_use(use_node_id: str, def_use_index: dict) -> dict:
+    """Find the DEF_USE edge for a given VAR_USE node (see index_def_use_edges)."""
+    return def_use_index.get(use_node_id)
 
 
-def test_file(filename: str, test_name: str):
-    """Test a single file and return results."""
+def test_file(filename: str, test_name: str, verbose: bool = False):
+    """Test a single file and return results. Per-node/edge detail is printed only when verbose."""
     test_file = Path("test_repo") / filename
     fm = create_file_meta(test_file)
     
-    # Parse the file
-    driver = PythonLibCstDriver()
-    ps = driver.parse(fm)
-    events = list(ps.events) if ps.events else []
+    # Parse the file (the on-disk event cache reuses unchanged files across runs)
+    ps = parse_cached(get_py_driver(), fm)
+    driver_info, events = ps.driver, list(ps.events or ())
     
     # Run DFG builder
     nodes = []
     edges = []
     alias_hints = []
-    
-    for item_kind, item_data in build_dfg(fm, ps.driver, events, None):
-        if item_kind == 'dfg_node':
-            nodes.append(item_data)
-        elif item_kind == 'dfg_edge':
-            edges.append(item_data)
-        elif item_kind == 'alias_hint':
-            alias_hints.append(item_data)
-    
-    print(f"\n=== {test_name} ===")
-    print(f"Nodes: {len(nodes)}")
-    print(f"Edges: {len(edges)}")
-    print(f"Alias Hints: {len(alias_hints)}")
-    
-    # Print detailed results
-    for node in nodes:
-        print(f"  {node.kind}: {node.name} (version={node.version}) - {node.id}")
-    
-    for edge in edges:
-        print(f"  {edge.kind}: {edge.src_id} -> {edge.dst_id}")
-    
-    for hint in alias_hints:
-        print(f"  alias_hint: {hint}")
-    
-    return nodes, edges, alias_hints
+    # Dispatch on item kind with one dict lookup per item (build_dfg yields only these kinds)
+    append = {'dfg_node': nodes.append, 'dfg_edge': edges.append, 'alias_hint': alias_hints.append}
+    
+    for item_kind, item_data in build_dfg(fm, driver_info, events, None):
+        append[item_kind](item_data)
+    
+    out = [
+        f"\n=== {test_name} ===",
+        f"Nodes: {len(nodes)}",
+        f"Edges: {len(edges)}",
+        f"Alias Hints: {len(alias_hints)}",
+    ]
+    
+    # Detailed results
+    if verbose:
+        out.extend(f"  {node.kind}: {node.name} (version={node.version}) - {node.id}" for node in nodes)
+        out.extend(f"  {edge.kind}: {edge.src_id} -> {edge.dst_id}" for edge in edges)
+        out.extend(f"  alias_hint: {hint}" for hint in alias_hints)
+    sys.stdout.write("\n".join(out) + "\n")
+    
+    return (nodes, edges, alias_hints) + index_nodes(nodes)
+
+
+# (file, title) for each test case, in report order
+TEST_CASES = (
+    ("test_ssa.py", "Test Case 1: SSA Versioning"),
+    ("test_params.py", "Test Case 2: Function Parameters"),
+    ("test_scope.py", "Test Case 3: Scope Correctness"),
+    ("test_alias.py", "Test Case 4: Alias Detection"),
+    ("test_attribute.py", "Test Case 5: Attribute Assignment"),
+)
+
 
+def _test_file_captured(case: tuple, verbose: bool = False) -> tuple:
+    """Worker entry point: run test_file and hand its printed output back to the parent."""
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        result = test_file(*case, verbose=verbose)
+    return buf.getvalue(), result
 
-def run_all_tests():
+
+def run_all_tests(verbose: bool = False):
     """Run all test cases."""
     
-    # Test Case 1: SSA versioning
-    nodes1, edges1, hints1 = test_file("test_ssa.py", "Test Case 1: SSA Versioning")
-    
-    # Test Case 2: Function parameters  
-    nodes2, edges2, hints2 = test_file("test_params.py", "Test Case 2: Function Parameters")
-    
-    # Test Case 3: Scope correctness
-    nodes3, edges3, hints3 = test_file("test_scope.py", "Test Case 3: Scope Correctness")
-    
-    # Test Case 4: Alias detection
-    nodes4, edges4, hints4 = test_file("test_alias.py", "Test Case 4: Alias Detection")
-    
-    # Test Case 5: Attribute assignment
-    nodes5, edges5, hints5 = test_file("test_attribute.py", "Test Case 5: Attribute Assignment")
-    
-    # Generate report
-    results = []
+    # The five files are independent: parse and build their DFGs in parallel,
+    # then replay each worker's output in test-case order.
+    outputs = []
+    with ProcessPoolExecutor(max_workers=min(len(TEST_CASES), os.cpu_count() or 1)) as ex:
+        for out, result in ex.map(_test_file_captured, TEST_CASES, [verbose] * len(TEST_CASES)):
+            sys.stdout.write(out)
+            outputs.append(result)
+    (
+        (nodes1, edges1, hints1, nk1, nkv1),
+        (nodes2, edges2, hints2, nk2, nkv2),
+        (nodes3, edges3, hints3, nk3, nkv3),
+        (nodes4, edges4, hints4, nk4, nkv4),
+        (nodes5, edges5, hints5, nk5, nkv5),
+    ) = outputs
+    
+    # Generate report: assertions bucketed by test case number
+    results = defaultdict(list)
     
     # Test Case 1 assertions
-    y_use_node = [n for n in nodes1 if n.name == 'y' and n.kind == 'var_use']
-    z_use_node = [n for n in nodes1 if n.name == 'z' and n.kind == 'var_use']
-    x_v0_def_node = [n for n in nodes1 if n.name == 'x' and n.kind == 'var_def' and n.version == 0]
-    x_v1_def_node = [n for n in nodes1 if n.name == 'x' and n.kind == 'var_def' and n.version == 1]
+    y_use_node = first(nk1, ('y', 'var_use'))
+    z_use_node = first(nk1, ('z', 'var_use'))
+    x_v0_def_node = first(nkv1, ('x', 'var_def', 0))
+    x_v1_def_node = first(nkv1, ('x', 'var_def', 1))
+    # DEF_USE edges are only needed for the use nodes probed below: collect them in one pass
+    def_use1 = index_def_use_edges(edges1, {n.id for n in (y_use_node, z_use_node) if n is not None})
     
     # Assertion 1.1
-    if len(y_use_node) > 0 and len(x_v0_def_node) > 0:
-        y_use_edge = find_def_for_use(y_use_node[0].id, edges1)
-        assertion_1_1 = y_use_edge.src_id == x_v0_def_node[0].id if y_use_edge else False
-        results.append(("1.1", assertion_1_1, f"Expected src_id: {x_v0_def_node[0].id}, Actual: {y_use_edge.src_id if y_use_edge else 'None'}"))
+    if y_use_node is not None and x_v0_def_node is not None:
+        y_use_edge = find_def_for_use(y_use_node.id, def_use1)
+        assertion_1_1 = y_use_edge.src_id == x_v0_def_node.id if y_use_edge else False
+        results[1].append(("1.1", assertion_1_1, f"Expected src_id: {x_v0_def_node.id}, Actual: {y_use_edge.src_id if y_use_edge else 'None'}"))
     else:
-        results.append(("1.1", False, "Missing y_use_node or x_v0_def_node"))
+        results[1].append(("1.1", False, "Missing y_use_node or x_v0_def_node"))
     
     # Assertion 1.2
-    if len(z_use_node) > 0 and len(x_v1_def_node) > 0:
-        z_use_edge = find_def_for_use(z_use_node[0].id, edges1)
-        assertion_1_2 = z_use_edge.src_id == x_v1_def_node[0].id if z_use_edge else False
-        results.append(("1.2", assertion_1_2, f"Expected src_id: {x_v1_def_node[0].id}, Actual: {z_use_edge.src_id if z_use_edge else 'None'}"))
+    if z_use_node is not None and x_v1_def_node is not None:
+        z_use_edge = find_def_for_use(z_use_node.id, def_use1)
+        assertion_1_2 = z_use_edge.src_id == x_v1_def_node.id if z_use_edge else False
+        results[1].append(("1.2", assertion_1_2, f"Expected src_id: {x_v1_def_node.id}, Actual: {z_use_edge.src_id if z_use_edge else 'None'}"))
     else:
-        results.append(("1.2", False, "Missing z_use_node or x_v1_def_node"))
+        results[1].append(("1.2", False, "Missing z_use_node or x_v1_def_node"))
     
     # Test Case 2 assertions
-    x_use_node = [n for n in nodes2 if n.name == 'x' and n.kind == 'var_use']
-    p1_param_node = [n for n in nodes2 if n.name == 'p1' and n.kind == 'param']
-    return_p2_use_node = [n for n in nodes2 if n.name == 'p2' and n.kind == 'var_use']
-    p2_param_node = [n for n in nodes2 if n.name == 'p2' and n.kind == 'param']
+    x_use_node = first(nk2, ('x', 'var_use'))
+    p1_param_node = first(nk2, ('p1', 'param'))
+    return_p2_use_node = first(nk2, ('p2', 'var_use'))
+    p2_param_node = first(nk2, ('p2', 'param'))
+    def_use2 = index_def_use_edges(edges2, {n.id for n in (x_use_node, return_p2_use_node) if n is not None})
     
     # Assertion 2.1
-    if len(x_use_node) > 0 and len(p1_param_node) > 0:
-        x_use_edge = find_def_for_use(x_use_node[0].id, edges2)
-        assertion_2_1 = x_use_edge.src_id == p1_param_node[0].id if x_use_edge else False
-        results.append(("2.1", assertion_2_1, f"Expected src_id: {p1_param_node[0].id}, Actual: {x_use_edge.src_id if x_use_edge else 'None'}"))
+    if x_use_node is not None and p1_param_node is not None:
+        x_use_edge = find_def_for_use(x_use_node.id, def_use2)
+        assertion_2_1 = x_use_edge.src_id == p1_param_node.id if x_use_edge else False
+        results[2].append(("2.1", assertion_2_1, f"Expected src_id: {p1_param_node.id}, Actual: {x_use_edge.src_id if x_use_edge else 'None'}"))
     else:
-        results.append(("2.1", False, "Missing x_use_node or p1_param_node"))
+        results[2].append(("2.1", False, "Missing x_use_node or p1_param_node"))
     
     # Assertion 2.2
-    if len(return_p2_use_node) > 0 and len(p2_param_node) > 0:
-        p2_use_edge = find_def_for_use(return_p2_use_node[0].id, edges2)
-        assertion_2_2 = p2_use_edge.src_id == p2_param_node[0].id if p2_use_edge else False
-        results.append(("2.2", assertion_2_2, f"Expected src_id: {p2_param_node[0].id}, Actual: {p2_use_edge.src_id if p2_use_edge else 'None'}"))
+    if return_p2_use_node is not None and p2_param_node is not None:
+        p2_use_edge = find_def_for_use(return_p2_use_node.id, def_use2)
+        assertion_2_2 = p2_use_edge.src_id == p2_param_node.id if p2_use_edge else False
+        results[2].append(("2.2", assertion_2_2, f"Expected src_id: {p2_param_node.id}, Actual: {p2_use_edge.src_id if p2_use_edge else 'None'}"))
     else:
-        results.append(("2.2", False, "Missing return_p2_use_node or p2_param_node"))
+        results[2].append(("2.2", False, "Missing return_p2_use_node or p2_param_node"))
     
     # Test Case 3 assertions (scope - simplified)
-    x_def_nodes = [n for n in nodes3 if n.name == 'x' and n.kind == 'var_def']
-    x_use_nodes = [n for n in nodes3 if n.name == 'x' and n.kind == 'var_use']
+    x_def_nodes = nk3[('x', 'var_def')]
+    x_use_nodes = nk3[('x', 'var_use')]
     
     assertion_3_1 = len(x_def_nodes) >= 2 and len(x_use_nodes) >= 2
-    results.append(("3.1", assertion_3_1, f"Expected multiple x definitions and uses, Actual: {len(x_def_nodes)} defs, {len(x_use_nodes)} uses"))
+    results[3].append(("3.1", assertion_3_1, f"Expected multiple x definitions and uses, Actual: {len(x_def_nodes)} defs, {len(x_use_nodes)} uses"))
     
     assertion_3_2 = len(x_def_nodes) >= 2 and len(x_use_nodes) >= 2
-    results.append(("3.2", assertion_3_2, f"Expected multiple x definitions and uses, Actual: {len(x_def_nodes)} defs, {len(x_use_nodes)} uses"))
+    results[3].append(("3.2", assertion_3_2, f"Expected multiple x definitions and uses, Actual: {len(x_def_nodes)} defs, {len(x_use_nodes)} uses"))
     
     # Test Case 4 assertions
     assertion_4_1 = len(hints4) == 1
-    results.append(("4.1", assertion_4_1, f"Expected count: 1, Actual: {len(hints4)}"))
+    results[4].append(("4.1", assertion_4_1, f"Expected count: 1, Actual: {len(hints4)}"))
     
     expected_hint = {'lhs_name': 'aliased', 'rhs_name': 'original'}
     if len(hints4) > 0:
         actual_hint = hints4[0]
-        assertion_4_2 = (actual_hint.get('lhs_name') == 'aliased' and 
-                        actual_hint.get('rhs_name') == 'original')
-        results.append(("4.2", assertion_4_2, f"Expected: {expected_hint}, Actual: {actual_hint}"))
+        assertion_4_2 = (actual_hint.lhs_name == 'aliased' and 
+                        actual_hint.rhs_name == 'original')
+        results[4].append(("4.2", assertion_4_2, f"Expected: {expected_hint}, Actual: {actual_hint.to_json()}"))
     else:
-        results.append(("4.2", False, f"Expected: {expected_hint}, Actual: No alias hints found"))
+        results[4].append(("4.2", False, f"Expected: {expected_hint}, Actual: No alias hints found"))
     
     # Test Case 5 assertions
-    self_foo_def = [n for n in nodes5 if n.name == 'self.foo' and n.kind == 'var_def']
+    self_foo_def = nk5[('self.foo', 'var_def')]
     assertion_5_1 = len(self_foo_def) > 0
-    results.append(("5.1", assertion_5_1, f"Expected a `var_def` node for `self.foo` to exist, but none was found."))
+    results[5].append(("5.1", assertion_5_1, f"Expected a `var_def` node for `self.foo` to exist, but none was found."))
     
-    self_foo_use = [n for n in nodes5 if n.name == 'self.foo' and n.kind == 'var_use']
+    self_foo_use = nk5[('self.foo', 'var_use')]
     assertion_5_2 = len(self_foo_def) > 0 and len(self_foo_use) > 0
-    results.append(("5.2", assertion_5_2, f"Expected a `def_use` edge for `self.foo` between methods, but none was found."))
+    results[5].append(("5.2", assertion_5_2, f"Expected a `def_use` edge for `self.foo` between methods, but none was found."))
     
     return results
 
 
 def generate_final_report(results):
-    """Generate the final QA report in the exact format specified."""
+    """Generate the final QA report in the exact format specified.
+
+    `results` maps test case number -> [(assertion, passed, evidence), ...].
+    """
     
-    passed = sum(1 for _, result, _ in results if result)
-    failed = len(results) - passed
-    success_rate = (passed / len(results) * 100) if len(results) > 0 else 0
+    total = sum(len(bucket) for bucket in results.values())
+    passed = sum(1 for bucket in results.values() for _, result, _ in bucket if result)
+    failed = total - passed
+    success_rate = (passed / total * 100) if total > 0 else 0
     final_status = "✅ PASSING" if success_rate == 100 else "❌ FAILING"
     
-    print("\n### DFG Builder QA Validation Report")
-    print()
-    print("#### **Summary**")
-    print()
-    print(f"*   **Total Assertions:** {len(results)}")
-    print(f"*   **Passed:** {passed}")
-    print(f"*   **Failed:** {failed}")
-    print(f"*   **Success Rate:** {success_rate:.1f}%")
-    print(f"*   **Final Status:** {final_status}")
-    print()
-    print("---")
-    print()
-    print("#### **Detailed Assertion Results**")
-    print()
+    out = ["\n### DFG Builder QA Validation Report"]
+    out.append("")
+    out.append("#### **Summary**")
+    out.append("")
+    out.append(f"*   **Total Assertions:** {total}")
+    out.append(f"*   **Passed:** {passed}")
+    out.append(f"*   **Failed:** {failed}")
+    out.append(f"*   **Success Rate:** {success_rate:.1f}%")
+    out.append(f"*   **Final Status:** {final_status}")
+    out.append("")
+    out.append("---")
+    out.append("")
+    out.append("#### **Detailed Assertion Results**")
+    out.append("")
     
     # Group results by test case
     test_cases = {
-        "1": "SSA Versioning (`test_ssa.py`)",
-        "2": "Function Parameters (`test_params.py`)",
-        "3": "Scope Correctness (`test_scope.py`)",
-        "4": "Alias Detection (`test_alias.py`)",
-        "5": "Attribute Assignment (`test_attribute.py`)"
+        1: "SSA Versioning (`test_ssa.py`)",
+        2: "Function Parameters (`test_params.py`)",
+        3: "Scope Correctness (`test_scope.py`)",
+        4: "Alias Detection (`test_alias.py`)",
+        5: "Attribute Assignment (`test_attribute.py`)"
     }
     
     for test_num, test_name in test_cases.items():
-        print(f"**Test Case {test_num}: {test_name}**")
-        
-        # Find assertions for this test case
-        test_results = [(num, result, evidence) for num, result, evidence in results if num.startswith(test_num)]
+        out.append(f"**Test Case {test_num}: {test_name}**")
         
-        for num, result, evidence in test_results:
+        for num, result, evidence in results.get(test_num, ()):
             status = "PASS" if result else "FAIL"
-            print(f"*   **Assertion {num}:** {status}")
+            out.append(f"*   **Assertion {num}:** {status}")
             if not result:
-                print(f"    *   _Evidence:_ {evidence}")
+                out.append(f"    *   _Evidence:_ {evidence}")
         
-        print()
+        out.append("")
+    
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 if __name__ == "__main__":
-    results = run_all_tests()
+    parser = argparse.ArgumentParser(description="Run the DFG QA test cases directly against build_dfg.")
+    parser.add_argument("--verbose", action="store_true", help="print every DFG node, edge and alias hint")
+    args = parser.parse_args()
+    results = run_all_tests(verbose=args.verbose)
     generate_final_report(results)
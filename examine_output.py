@@ -10,101 +10,137 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
     import pyarrow.parquet as pq
-    import pandas as pd
-except ImportError:
-    print("Installing required packages...")
-    import subprocess
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "pyarrow", "pandas"])
-    import pyarrow.parquet as pq
-    import pandas as pd
+except ImportError as e:
+    raise SystemExit(f"examine_output.py requires pyarrow (install with: pip install -e '.[store]'): {e}")
 
 from provis.ucg.iterators import UcgReader
 
 
+# Parquet scan format that materializes `kind` as dictionary<int32, string>
+_KIND_DICT_FORMAT = ds.ParquetFileFormat(read_options=ds.ParquetReadOptions(dictionary_columns={"kind"}))
+
+
+def parquet_files(table_dir: Path) -> list:
+    """Sorted parquet files of a nodes/edges directory (empty if it does not exist)."""
+    return sorted(table_dir.glob("*.parquet")) if table_dir.exists() else []
+
+
+def head_rows(pf: Path, columns: list, n: int = 3) -> tuple:
+    """(row count, all column names, first `n` rows of `columns` as tuples) for one file.
+
+    The row count and schema come from the parquet footer; only the first batch of
+    the requested columns is decoded.
+    """
+    with pq.ParquetFile(pf) as f:
+        num_rows = f.metadata.num_rows
+        names = f.schema_arrow.names
+        if num_rows == 0:
+            return 0, names, []
+        batch = next(f.iter_batches(batch_size=n, columns=columns))
+    cols = [batch.column(c).to_pylist() for c in columns]
+    return num_rows, names, list(zip(*cols))
+
+
+def kind_counts(files: list) -> list:
+    """(kind, count) pairs over the given parquet files, most frequent first.
+
+    Only the `kind` column is scanned. It is decoded straight into a dictionary
+    array, so value_counts groups the integer indices, not the strings.
+    """
+    if not files:
+        return []
+    tbl = ds.dataset([str(pf) for pf in files], format=_KIND_DICT_FORMAT).to_table(columns=["kind"])
+    kinds = tbl.column("kind")
+    if not pa.types.is_dictionary(kinds.type):
+        kinds = kinds.dictionary_encode()
+    counts = pc.value_counts(kinds).to_pylist()
+    return sorted(((c["values"], c["counts"]) for c in counts), key=lambda kc: -kc[1])
+
+
 def examine_ucg_output(output_dir: str):
     """Examine the UCG output data."""
     output_path = Path(output_dir)
     
-    print(f"🔍 Examining UCG output in: {output_path}")
-    print("=" * 60)
+    # Lines are collected and written with one call (also if a read fails midway)
+    out = []
+    try:
+        out.append(f"🔍 Examining UCG output in: {output_path}")
+        out.append("=" * 60)
     
-    # Read the receipt
-    receipt_path = output_path / "run_receipt.json"
-    if receipt_path.exists():
-        import json
-        receipt = json.loads(receipt_path.read_text())
-        print(f"📊 Summary:")
-        print(f"  Nodes: {receipt['nodes_rows']:,}")
-        print(f"  Edges: {receipt['edges_rows']:,}")
-        print(f"  Anomalies: {receipt['anomaly_rows']}")
-        print(f"  Total size: {receipt['bytes_written']:,} bytes")
-        print()
+        # Read the receipt
+        receipt_path = output_path / "run_receipt.json"
+        if receipt_path.exists():
+            import json
+            receipt = json.loads(receipt_path.read_text())
+            out.append(f"📊 Summary:")
+            out.append(f"  Nodes: {receipt['nodes_rows']:,}")
+            out.append(f"  Edges: {receipt['edges_rows']:,}")
+            out.append(f"  Anomalies: {receipt['anomaly_rows']}")
+            out.append(f"  Total size: {receipt['bytes_written']:,} bytes")
+            out.append("")
     
-    # Examine nodes
-    nodes_dir = output_path / "nodes"
-    if nodes_dir.exists():
-        parquet_files = list(nodes_dir.glob("*.parquet"))
-        if parquet_files:
-            print(f"📁 Nodes ({len(parquet_files)} files):")
-            for pf in parquet_files:
-                df = pd.read_parquet(pf)
-                print(f"  {pf.name}: {len(df)} rows")
-                
-                if len(df) > 0:
-                    print(f"    Columns: {list(df.columns)}")
-                    print(f"    Sample rows:")
-                    for i, row in df.head(3).iterrows():
-                        print(f"      {i+1}. {row['kind']} '{row['name']}' in {row['path']}")
-                    if len(df) > 3:
-                        print(f"      ... and {len(df) - 3} more")
-            print()
+        # List each directory once; the per-file summaries and the kind counts share the lists
+        node_files = parquet_files(output_path / "nodes")
+        edge_files = parquet_files(output_path / "edges")
     
-    # Examine edges
-    edges_dir = output_path / "edges"
-    if edges_dir.exists():
-        parquet_files = list(edges_dir.glob("*.parquet"))
-        if parquet_files:
-            print(f"🔗 Edges ({len(parquet_files)} files):")
-            for pf in parquet_files:
-                df = pd.read_parquet(pf)
-                print(f"  {pf.name}: {len(df)} rows")
-                
-                if len(df) > 0:
-                    print(f"    Sample edges:")
-                    for i, row in df.head(3).iterrows():
-                        print(f"      {i+1}. {row['kind']}: {row['src_id'][:8]}... -> {row['dst_id'][:8]}...")
-                    if len(df) > 3:
-                        print(f"      ... and {len(df) - 3} more")
-            print()
+        # Examine nodes
+        if node_files:
+            out.append(f"📁 Nodes ({len(node_files)} files):")
+            for pf in node_files:
+                num_rows, columns, sample = head_rows(pf, ['kind', 'name', 'path'])
+                out.append(f"  {pf.name}: {num_rows} rows")
+            
+                if num_rows > 0:
+                    out.append(f"    Columns: {columns}")
+                    out.append(f"    Sample rows:")
+                    for i, (kind, name, path) in enumerate(sample, 1):
+                        out.append(f"      {i}. {kind} '{name}' in {path}")
+                    if num_rows > 3:
+                        out.append(f"      ... and {num_rows - 3} more")
+            out.append("")
     
-    # Use the UcgReader API for structured queries
-    print("🔍 Using UcgReader API:")
-    try:
-        reader = UcgReader(output_path)
+        # Examine edges
+        if edge_files:
+            out.append(f"🔗 Edges ({len(edge_files)} files):")
+            for pf in edge_files:
+                num_rows, _, sample = head_rows(pf, ['kind', 'src_id', 'dst_id'])
+                out.append(f"  {pf.name}: {num_rows} rows")
+            
+                if num_rows > 0:
+                    out.append(f"    Sample edges:")
+                    for i, (kind, src_id, dst_id) in enumerate(sample, 1):
+                        out.append(f"      {i}. {kind}: {src_id[:8]}... -> {dst_id[:8]}...")
+                    if num_rows > 3:
+                        out.append(f"      ... and {num_rows - 3} more")
+            out.append("")
+    
+        # Use the UcgReader API for structured queries
+        out.append("🔍 Using UcgReader API:")
+        try:
+            reader = UcgReader(output_path)
         
-        # Get all nodes by kind
-        print("  Node types:")
-        nodes_df = pd.read_parquet(output_path / "nodes" / "*.parquet")
-        if len(nodes_df) > 0:
-            kind_counts = nodes_df['kind'].value_counts()
-            for kind, count in kind_counts.items():
-                print(f"    {kind}: {count}")
+            # Get all nodes by kind
+            out.append("  Node types:")
+            for kind, count in kind_counts(node_files):
+                out.append(f"    {kind}: {count}")
         
-        # Get all edge types
-        print("  Edge types:")
-        edges_df = pd.read_parquet(output_path / "edges" / "*.parquet")
-        if len(edges_df) > 0:
-            kind_counts = edges_df['kind'].value_counts()
-            for kind, count in kind_counts.items():
-                print(f"    {kind}: {count}")
+            # Get all edge types
+            out.append("  Edge types:")
+            for kind, count in kind_counts(edge_files):
+                out.append(f"    {kind}: {count}")
         
-        reader.close()
+            reader.close()
         
-    except Exception as e:
-        print(f"  Error using UcgReader: {e}")
+        except Exception as e:
+            out.append(f"  Error using UcgReader: {e}")
     
-    print("\n✅ Output examination complete!")
+        out.append("\n✅ Output examination complete!")
+    finally:
+        sys.stdout.write("\n".join(out) + "\n")
 
 
 if __name__ == "__main__":
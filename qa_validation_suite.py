@@ -4,24 +4,151 @@ QA Validation Suite for DfgBuilder
 Comprehensive testing of the stateful, CST-aware algorithm against various code patterns.
 """
 
+import io
+import os
 import sys
-import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import redirect_stdout
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
 from pathlib import Path
 from tempfile import TemporaryDirectory
-import os
+import hashlib
+import json
+import shutil
+from dataclasses import asdict
+from functools import lru_cache
 
 # Add the project root to the Python path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.provis.ucg.api import build_ucg_for_files, Step1Config
+from src.provis.ucg.api import build_ucg_for_files, Step1Config, Step1Summary
 from src.provis.ucg.discovery import FileMeta, Language, iter_discovered_files
 
 
+# Pipeline outputs are kept here, keyed by input bytes + config + pipeline sources
+# (PROVIS_QA_CACHE_DIR can point it at tmpfs, e.g. /dev/shm/qa_cache)
+QA_CACHE_DIR = Path(os.environ.get("PROVIS_QA_CACHE_DIR") or ".qa_cache")
+PIPELINE_SRC = Path(__file__).parent / "src" / "provis" / "ucg"
+CORE_SRC = Path(__file__).parent / "src" / "provis" / "core"
+_SUMMARY_FILE = "summary.json"
+# Scratch inputs go to tmpfs where available
+_TMPFS = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+# Step 1 passes per test case: only what its assertions read. The DFG cases never look
+# at symbols; alias rows are emitted by the symbols pass from DFG alias hints, so the
+# alias case needs both.
+_DFG_ONLY = Step1Config(enable_cfg=False, enable_dfg=True, enable_symbols=False, enable_effects=False)
+_DFG_AND_SYMBOLS = Step1Config(enable_cfg=False, enable_dfg=True, enable_symbols=True, enable_effects=False)
+_PIPELINE_CONFIGS = {
+    "ssa_versioning": _DFG_ONLY,
+    "function_params": _DFG_ONLY,
+    "scope_correctness": _DFG_ONLY,
+    "alias_detection": _DFG_AND_SYMBOLS,
+    "attribute_assignment": _DFG_ONLY,
+}
+
+
+def _config_for(test_name: str) -> Step1Config:
+    """Pipeline config for a test case (DFG + symbols for unknown names)."""
+    return _PIPELINE_CONFIGS.get(test_name, _DFG_AND_SYMBOLS)
+
+
+@lru_cache(maxsize=None)
+def _pipeline_src_digest() -> bytes:
+    """Digest of the pipeline and core (feature flag) sources, read once per process."""
+    h = hashlib.blake2b(digest_size=20)
+    for src in sorted(PIPELINE_SRC.glob("*.py")) + sorted(CORE_SRC.glob("*.py")):
+        h.update(f"{src.parent.name}/{src.name}".encode("utf-8") + b"\x00" + src.read_bytes())
+    return h.digest()
+
+
+def _pipeline_cache_key(test_files, config: Step1Config) -> str:
+    """Content key for one pipeline run; any edit to inputs, config, flags or pipeline code misses."""
+    h = hashlib.blake2b(_pipeline_src_digest(), digest_size=20)
+    h.update(repr(config).encode("utf-8"))
+    # Feature flags (e.g. PROVIS_FEATURE_STEP1_PROVENANCE_V2) change the stored columns;
+    # read on every call since the environment can change within a process.
+    flags = sorted((k, v) for k, v in os.environ.items() if k.startswith("PROVIS_FEATURE_"))
+    h.update(repr(flags).encode("utf-8"))
+    for f in test_files:
+        h.update(b"\x1f" + f.name.encode("utf-8") + b"\x00" + f.read_bytes())
+    return h.hexdigest()
+
+
+# Columns the assertions and printouts actually read, per output table
+_DFG_NODE_COLS = ["id", "kind", "name", "version", "path", "prov_byte_start"]
+_DFG_EDGE_COLS = ["id", "kind", "src_id", "dst_id", "path"]
+_SYMBOL_COLS = ["id", "scope_id", "name", "kind", "path"]
+_ALIAS_COLS = ["id", "alias_kind", "alias_name", "target_symbol_id", "path"]
+_TABLE_COLS = (
+    ("dfg_nodes", _DFG_NODE_COLS),
+    ("dfg_edges", _DFG_EDGE_COLS),
+    ("symbols", _SYMBOL_COLS),
+    ("aliases", _ALIAS_COLS),
+)
+
+# Shards are opened memory-mapped: no read() copy, repeated scans served from the page cache
+_MMAP_FS = pafs.LocalFileSystem(use_mmap=True)
+
+# `path` has a handful of distinct values per run: keep it dictionary-encoded as stored,
+# so filtering by file matches each distinct path once and then compares integer codes.
+# `alias_name` likewise, so the alias checks compare inside Arrow's dictionary kernels.
+_PARQUET_FORMAT = ds.ParquetFileFormat(
+    read_options=ds.ParquetReadOptions(dictionary_columns={"path", "alias_name"})
+)
+
+
+def _scan(dataset: ds.Dataset, columns: list[str], path_substring: str | None) -> pa.Table:
+    """Project `columns`, keeping only rows whose `path` contains `path_substring` (if given)."""
+    tbl = dataset.to_table(columns=columns)
+    if not path_substring:
+        return tbl
+    masks = []
+    for chunk in tbl["path"].chunks:
+        hit_codes = pc.indices_nonzero(pc.match_substring(chunk.dictionary, path_substring))
+        masks.append(pc.is_in(chunk.indices, value_set=hit_codes))
+    return tbl.filter(pa.chunked_array(masks, type=pa.bool_()))
+
+
+def _index(tbl: pa.Table, keys: list[str]) -> dict:
+    """Row positions per distinct `keys` tuple, built in one pass over the columns."""
+    index: dict = {}
+    for i, key in enumerate(zip(*(tbl.column(k).to_pylist() for k in keys))):
+        index.setdefault(key, []).append(i)
+    return index
+
+
+def _take(tbl: pa.Table, index: dict, key: tuple) -> pa.Table:
+    """Rows of `tbl` under `key` in an `_index` result (empty table on a miss)."""
+    return tbl.take(index.get(key, []))
+
+
+def _first_in_byte_range(tbl: pa.Table, lo: int | None = None, hi: int | None = None) -> dict | None:
+    """First row whose prov_byte_start lies in [lo, hi] (either bound optional), via one vectorized mask."""
+    start = tbl['prov_byte_start']
+    mask = None
+    if lo is not None:
+        mask = pc.greater_equal(start, lo)
+    if hi is not None:
+        upper = pc.less_equal(start, hi)
+        mask = upper if mask is None else pc.and_(mask, upper)
+    hits = tbl.filter(mask) if mask is not None else tbl
+    return hits.slice(0, 1).to_pylist()[0] if len(hits) else None
+
+
 class QAValidator:
     """QA Validator for DfgBuilder testing."""
     
     def __init__(self):
-        self.test_results = []
+        # Logged assertions as parallel columns: test, assertion, result, details
+        self._r_test: list[str] = []
+        self._r_assert: list[str] = []
+        self._r_result: list[str] = []
+        self._r_details: list[str] = []
         self.output_dir = None
         
     def create_test_file(self, test_dir: Path, filename: str, code: str) -> Path:
@@ -32,12 +159,13 @@ class QAValidator:
     
     def create_file_meta(self, file_path: Path) -> FileMeta:
         """Create FileMeta object for a test file."""
+        st = os.stat(file_path)
         return FileMeta(
             path=str(file_path),
             real_path=str(file_path),
             blob_sha=f"test_sha_{file_path.name}",
-            size_bytes=file_path.stat().st_size,
-            mtime_ns=file_path.stat().st_mtime_ns * 1_000_000_000,
+            size_bytes=st.st_size,
+            mtime_ns=st.st_mtime_ns,
             run_id="qa_test_run",
             config_hash="qa_test_config",
             is_text=True,
@@ -52,255 +180,232 @@ class QAValidator:
         print(f"\n🧪 Running {test_name}")
         print("=" * 50)
         
-        # Create FileMeta objects
-        files = [self.create_file_meta(f) for f in test_files]
-        
-        # Create output directory
-        self.output_dir = Path(f"qa_output_{test_name}")
-        self.output_dir.mkdir(exist_ok=True)
-        
-        # Run pipeline
-        config = Step1Config(
-            enable_cfg=False,
-            enable_dfg=True,
-            enable_symbols=True,
-            enable_effects=False
+        config = _config_for(test_name)
+        summary = self._build_cached(
+            _pipeline_cache_key(test_files, config),
+            lambda out: build_ucg_for_files([self.create_file_meta(f) for f in test_files], out, cfg=config),
         )
-        
-        summary = build_ucg_for_files(files, self.output_dir, cfg=config)
-        
+        self._print_summary(summary)
+        return summary
+    
+    def _build_cached(self, key: str, build) -> Step1Summary:
+        """Point output_dir at the run for `key`, calling build(output_dir) only if it is not cached."""
+        # Reuse the output of an identical earlier run; summary.json is written last,
+        # so its presence marks a complete run.
+        self.output_dir = QA_CACHE_DIR / key
+        summary_path = self.output_dir / _SUMMARY_FILE
+        if summary_path.exists():
+            summary = Step1Summary(**json.loads(summary_path.read_text()))
+            print(f"♻️  Reusing cached pipeline output: {self.output_dir}")
+        else:
+            # Drop leftovers of an interrupted run; the store publishes output_dir itself
+            # (pre-creating it would only leave an empty `.bak` behind)
+            shutil.rmtree(self.output_dir, ignore_errors=True)
+            
+            # Run pipeline
+            summary = build(self.output_dir)
+            summary_path.write_text(json.dumps(asdict(summary)))
+        return summary
+    
+    def _print_summary(self, summary: Step1Summary) -> None:
         print(f"📊 Pipeline Results:")
         print(f"  Files processed: {summary.files_parsed}/{summary.files_total}")
         print(f"  DFG nodes: {summary.dfg_nodes_rows}")
         print(f"  DFG edges: {summary.dfg_edges_rows}")
         print(f"  Symbols: {summary.symbols_rows}")
         print(f"  Aliases: {summary.aliases_rows}")
-        
-        return summary
     
-    def load_parquet_data(self) -> dict:
-        """Load all parquet files from the output directory."""
-        data = {}
+    def load_parquet_data(self, path_substring: str | None = None) -> dict:
+        """Load the output tables as Arrow tables (only the columns the tests use).
+        
+        With `path_substring`, only rows whose `path` contains it are returned.
+        """
+        # Every shard of a table is read in one call; tables without shards are left out.
+        # The tables are independent and pyarrow decodes without the GIL, so read them
+        # on a small thread pool.
+        jobs = []
+        for table, columns in _TABLE_COLS:
+            dataset = self._open_dataset(self.output_dir / table)
+            if dataset is not None:
+                jobs.append((table, dataset, columns))
         
-        # Load DFG nodes
-        dfg_nodes_dir = self.output_dir / "dfg_nodes"
-        if dfg_nodes_dir.exists():
-            dfg_nodes_files = list(dfg_nodes_dir.glob("*.parquet"))
-            if dfg_nodes_files:
-                data['dfg_nodes'] = pd.read_parquet(dfg_nodes_files[0])
-        
-        # Load DFG edges
-        dfg_edges_dir = self.output_dir / "dfg_edges"
-        if dfg_edges_dir.exists():
-            dfg_edges_files = list(dfg_edges_dir.glob("*.parquet"))
-            if dfg_edges_files:
-                data['dfg_edges'] = pd.read_parquet(dfg_edges_files[0])
-        
-        # Load symbols
-        symbols_dir = self.output_dir / "symbols"
-        if symbols_dir.exists():
-            symbols_files = list(symbols_dir.glob("*.parquet"))
-            if symbols_files:
-                data['symbols'] = pd.read_parquet(symbols_files[0])
-        
-        # Load aliases
-        aliases_dir = self.output_dir / "aliases"
-        if aliases_dir.exists():
-            aliases_files = list(aliases_dir.glob("*.parquet"))
-            if aliases_files:
-                data['aliases'] = pd.read_parquet(aliases_files[0])
+        data = {}
+        if not jobs:
+            return data
+        with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+            futures = [(table, pool.submit(_scan, dataset, columns, path_substring)) for table, dataset, columns in jobs]
+            for table, fut in futures:
+                data[table] = fut.result()
         
         return data
     
+    def _open_dataset(self, table_dir: Path) -> ds.Dataset | None:
+        """Dataset over a table's shards (None if it has none)."""
+        files = [str(f) for f in sorted(table_dir.glob("*.parquet"))]
+        if not files:
+            return None
+        return ds.dataset(files, format=_PARQUET_FORMAT, filesystem=_MMAP_FS)
+    
     def log_result(self, test_name: str, assertion: str, result: str, details: str = ""):
         """Log a test result."""
-        self.test_results.append({
-            'test': test_name,
-            'assertion': assertion,
-            'result': result,
-            'details': details
-        })
+        self._r_test.append(test_name)
+        self._r_assert.append(assertion)
+        self._r_result.append(result)
+        self._r_details.append(details)
         print(f"  {result} {assertion}")
         if details:
             print(f"    Details: {details}")
     
-    def test_case_1_ssa_versioning(self):
+    def test_case_1_ssa_versioning(self, temp_path: Path):
         """Test Case 1: Simple Assignment & SSA Versioning"""
-        with TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            # Create test file
-            code = """
+        # Create test file
+        code = """
 def ssa_test():
     x = 10      # Definition 1 (version 0)
     y = x       # Use 1 (version 0)
     x = 20      # Definition 2 (version 1)
     z = x       # Use 2 (version 1)
 """
-            test_file = self.create_test_file(temp_path, "test_ssa.py", code)
-            
-            # Run pipeline
-            self.run_pipeline([test_file], "ssa_versioning")
-            
-            # Load data
-            data = self.load_parquet_data()
-            
-            if 'dfg_nodes' not in data or 'dfg_edges' not in data:
-                self.log_result("SSA Versioning", "Data loading", "FAIL", "Missing DFG data")
-                return
-            
-            dfg_nodes = data['dfg_nodes']
-            dfg_edges = data['dfg_edges']
-            
-            # Filter for our test file
-            test_nodes = dfg_nodes[dfg_nodes['path'].str.contains('test_ssa')]
-            test_edges = dfg_edges[dfg_edges['path'].str.contains('test_ssa')]
-            
-            print(f"\n📋 DFG Nodes in test_ssa.py:")
-            for _, row in test_nodes.iterrows():
-                print(f"  {row['kind']}: {row['name']} (version={row.get('version', 'N/A')}) - {row['id']}")
-            
-            # Assertion 1: y VAR_DEF should connect to x VAR_DEF version 0
-            y_def = test_nodes[(test_nodes['name'] == 'y') & (test_nodes['kind'] == 'var_def')]
-            if len(y_def) > 0:
-                y_use = test_nodes[(test_nodes['name'] == 'x') & (test_nodes['kind'] == 'var_use') & (test_nodes.get('version', 0) == 0)]
-                if len(y_use) > 0:
-                    def_use_edge = test_edges[
-                        (test_edges['kind'] == 'def_use') &
-                        (test_edges['dst_id'] == y_use.iloc[0]['id'])
-                    ]
-                    if len(def_use_edge) > 0:
-                        src_id = def_use_edge.iloc[0]['src_id']
-                        x_def_v0 = test_nodes[
-                            (test_nodes['name'] == 'x') & 
-                            (test_nodes['kind'] == 'var_def') & 
-                            (test_nodes['version'] == 0)
-                        ]
-                        if len(x_def_v0) > 0 and src_id == x_def_v0.iloc[0]['id']:
-                            self.log_result("SSA Versioning", "y connects to x version 0", "PASS")
-                        else:
-                            self.log_result("SSA Versioning", "y connects to x version 0", "FAIL", 
-                                          f"Expected src_id {x_def_v0.iloc[0]['id'] if len(x_def_v0) > 0 else 'N/A'}, got {src_id}")
+        test_file = self.create_test_file(temp_path, "test_ssa.py", code)
+        
+        # Run pipeline
+        self.run_pipeline([test_file], "ssa_versioning")
+        
+        # Load data
+        data = self.load_parquet_data(path_substring='test_ssa')
+        
+        if 'dfg_nodes' not in data or 'dfg_edges' not in data:
+            self.log_result("SSA Versioning", "Data loading", "FAIL", "Missing DFG data")
+            return
+        
+        test_nodes = data['dfg_nodes']
+        test_edges = data['dfg_edges']
+        
+        # Index rows once; every lookup below is a dict probe instead of a full mask
+        nodes_by_key = _index(test_nodes, ['name', 'kind', 'version'])
+        nodes_by_name_kind = _index(test_nodes, ['name', 'kind'])
+        edges_by_dst = _index(test_edges, ['kind', 'dst_id'])
+        
+        print(f"\n📋 DFG Nodes in test_ssa.py:")
+        for row in test_nodes.to_pylist():
+            print(f"  {row['kind']}: {row['name']} (version={row.get('version', 'N/A')}) - {row['id']}")
+        
+        # Assertion 1: y VAR_DEF should connect to x VAR_DEF version 0
+        y_def = _take(test_nodes, nodes_by_name_kind, ('y', 'var_def'))
+        if len(y_def) > 0:
+            y_use = _take(test_nodes, nodes_by_key, ('x', 'var_use', 0))
+            if len(y_use) > 0:
+                def_use_edge = _take(test_edges, edges_by_dst, ('def_use', y_use['id'][0].as_py()))
+                if len(def_use_edge) > 0:
+                    src_id = def_use_edge['src_id'][0].as_py()
+                    x_def_v0 = _take(test_nodes, nodes_by_key, ('x', 'var_def', 0))
+                    if len(x_def_v0) > 0 and src_id == x_def_v0['id'][0].as_py():
+                        self.log_result("SSA Versioning", "y connects to x version 0", "PASS")
                     else:
-                        self.log_result("SSA Versioning", "y connects to x version 0", "FAIL", "No DEF_USE edge found")
+                        self.log_result("SSA Versioning", "y connects to x version 0", "FAIL", 
+                                      f"Expected src_id {x_def_v0['id'][0].as_py() if len(x_def_v0) > 0 else 'N/A'}, got {src_id}")
                 else:
-                    self.log_result("SSA Versioning", "y connects to x version 0", "FAIL", "No x VAR_USE version 0 found")
+                    self.log_result("SSA Versioning", "y connects to x version 0", "FAIL", "No DEF_USE edge found")
             else:
-                self.log_result("SSA Versioning", "y connects to x version 0", "FAIL", "No y VAR_DEF found")
-            
-            # Assertion 2: z VAR_DEF should connect to x VAR_DEF version 1
-            z_def = test_nodes[(test_nodes['name'] == 'z') & (test_nodes['kind'] == 'var_def')]
-            if len(z_def) > 0:
-                z_use = test_nodes[(test_nodes['name'] == 'x') & (test_nodes['kind'] == 'var_use') & (test_nodes.get('version', 0) == 1)]
-                if len(z_use) > 0:
-                    def_use_edge = test_edges[
-                        (test_edges['kind'] == 'def_use') &
-                        (test_edges['dst_id'] == z_use.iloc[0]['id'])
-                    ]
-                    if len(def_use_edge) > 0:
-                        src_id = def_use_edge.iloc[0]['src_id']
-                        x_def_v1 = test_nodes[
-                            (test_nodes['name'] == 'x') & 
-                            (test_nodes['kind'] == 'var_def') & 
-                            (test_nodes['version'] == 1)
-                        ]
-                        if len(x_def_v1) > 0 and src_id == x_def_v1.iloc[0]['id']:
-                            self.log_result("SSA Versioning", "z connects to x version 1", "PASS")
-                        else:
-                            self.log_result("SSA Versioning", "z connects to x version 1", "FAIL", 
-                                          f"Expected src_id {x_def_v1.iloc[0]['id'] if len(x_def_v1) > 0 else 'N/A'}, got {src_id}")
+                self.log_result("SSA Versioning", "y connects to x version 0", "FAIL", "No x VAR_USE version 0 found")
+        else:
+            self.log_result("SSA Versioning", "y connects to x version 0", "FAIL", "No y VAR_DEF found")
+        
+        # Assertion 2: z VAR_DEF should connect to x VAR_DEF version 1
+        z_def = _take(test_nodes, nodes_by_name_kind, ('z', 'var_def'))
+        if len(z_def) > 0:
+            z_use = _take(test_nodes, nodes_by_key, ('x', 'var_use', 1))
+            if len(z_use) > 0:
+                def_use_edge = _take(test_edges, edges_by_dst, ('def_use', z_use['id'][0].as_py()))
+                if len(def_use_edge) > 0:
+                    src_id = def_use_edge['src_id'][0].as_py()
+                    x_def_v1 = _take(test_nodes, nodes_by_key, ('x', 'var_def', 1))
+                    if len(x_def_v1) > 0 and src_id == x_def_v1['id'][0].as_py():
+                        self.log_result("SSA Versioning", "z connects to x version 1", "PASS")
                     else:
-                        self.log_result("SSA Versioning", "z connects to x version 1", "FAIL", "No DEF_USE edge found")
+                        self.log_result("SSA Versioning", "z connects to x version 1", "FAIL", 
+                                      f"Expected src_id {x_def_v1['id'][0].as_py() if len(x_def_v1) > 0 else 'N/A'}, got {src_id}")
                 else:
-                    self.log_result("SSA Versioning", "z connects to x version 1", "FAIL", "No x VAR_USE version 1 found")
+                    self.log_result("SSA Versioning", "z connects to x version 1", "FAIL", "No DEF_USE edge found")
             else:
-                self.log_result("SSA Versioning", "z connects to x version 1", "FAIL", "No z VAR_DEF found")
+                self.log_result("SSA Versioning", "z connects to x version 1", "FAIL", "No x VAR_USE version 1 found")
+        else:
+            self.log_result("SSA Versioning", "z connects to x version 1", "FAIL", "No z VAR_DEF found")
     
-    def test_case_2_function_params(self):
+    def test_case_2_function_params(self, temp_path: Path):
         """Test Case 2: Function Parameter Usage"""
-        with TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            # Create test file
-            code = """
+        # Create test file
+        code = """
 def param_test(p1, p2):
     x = p1
     return p2
 """
-            test_file = self.create_test_file(temp_path, "test_params.py", code)
-            
-            # Run pipeline
-            self.run_pipeline([test_file], "function_params")
-            
-            # Load data
-            data = self.load_parquet_data()
-            
-            if 'dfg_nodes' not in data or 'dfg_edges' not in data:
-                self.log_result("Function Params", "Data loading", "FAIL", "Missing DFG data")
-                return
-            
-            dfg_nodes = data['dfg_nodes']
-            dfg_edges = data['dfg_edges']
-            
-            # Filter for our test file
-            test_nodes = dfg_nodes[dfg_nodes['path'].str.contains('test_params')]
-            test_edges = dfg_edges[dfg_edges['path'].str.contains('test_params')]
-            
-            print(f"\n📋 DFG Nodes in test_params.py:")
-            for _, row in test_nodes.iterrows():
-                print(f"  {row['kind']}: {row['name']} (version={row.get('version', 'N/A')}) - {row['id']}")
-            
-            # Assertion 1: x VAR_DEF should connect to p1 PARAM
-            x_def = test_nodes[(test_nodes['name'] == 'x') & (test_nodes['kind'] == 'var_def')]
-            if len(x_def) > 0:
-                x_use = test_nodes[(test_nodes['name'] == 'p1') & (test_nodes['kind'] == 'var_use')]
-                if len(x_use) > 0:
-                    def_use_edge = test_edges[
-                        (test_edges['kind'] == 'def_use') &
-                        (test_edges['dst_id'] == x_use.iloc[0]['id'])
-                    ]
-                    if len(def_use_edge) > 0:
-                        src_id = def_use_edge.iloc[0]['src_id']
-                        p1_param = test_nodes[(test_nodes['name'] == 'p1') & (test_nodes['kind'] == 'param')]
-                        if len(p1_param) > 0 and src_id == p1_param.iloc[0]['id']:
-                            self.log_result("Function Params", "x connects to p1 param", "PASS")
-                        else:
-                            self.log_result("Function Params", "x connects to p1 param", "FAIL", 
-                                          f"Expected p1 param src_id, got {src_id}")
+        test_file = self.create_test_file(temp_path, "test_params.py", code)
+        
+        # Run pipeline
+        self.run_pipeline([test_file], "function_params")
+        
+        # Load data
+        data = self.load_parquet_data(path_substring='test_params')
+        
+        if 'dfg_nodes' not in data or 'dfg_edges' not in data:
+            self.log_result("Function Params", "Data loading", "FAIL", "Missing DFG data")
+            return
+        
+        test_nodes = data['dfg_nodes']
+        test_edges = data['dfg_edges']
+        
+        # Index rows once; every lookup below is a dict probe instead of a full mask
+        nodes_by_key = _index(test_nodes, ['name', 'kind', 'version'])
+        nodes_by_name_kind = _index(test_nodes, ['name', 'kind'])
+        edges_by_dst = _index(test_edges, ['kind', 'dst_id'])
+        
+        print(f"\n📋 DFG Nodes in test_params.py:")
+        for row in test_nodes.to_pylist():
+            print(f"  {row['kind']}: {row['name']} (version={row.get('version', 'N/A')}) - {row['id']}")
+        
+        # Assertion 1: x VAR_DEF should connect to p1 PARAM
+        x_def = _take(test_nodes, nodes_by_name_kind, ('x', 'var_def'))
+        if len(x_def) > 0:
+            x_use = _take(test_nodes, nodes_by_name_kind, ('p1', 'var_use'))
+            if len(x_use) > 0:
+                def_use_edge = _take(test_edges, edges_by_dst, ('def_use', x_use['id'][0].as_py()))
+                if len(def_use_edge) > 0:
+                    src_id = def_use_edge['src_id'][0].as_py()
+                    p1_param = _take(test_nodes, nodes_by_name_kind, ('p1', 'param'))
+                    if len(p1_param) > 0 and src_id == p1_param['id'][0].as_py():
+                        self.log_result("Function Params", "x connects to p1 param", "PASS")
                     else:
-                        self.log_result("Function Params", "x connects to p1 param", "FAIL", "No DEF_USE edge found")
+                        self.log_result("Function Params", "x connects to p1 param", "FAIL", 
+                                      f"Expected p1 param src_id, got {src_id}")
                 else:
-                    self.log_result("Function Params", "x connects to p1 param", "FAIL", "No p1 VAR_USE found")
+                    self.log_result("Function Params", "x connects to p1 param", "FAIL", "No DEF_USE edge found")
             else:
-                self.log_result("Function Params", "x connects to p1 param", "FAIL", "No x VAR_DEF found")
-            
-            # Assertion 2: return p2 should connect to p2 PARAM
-            p2_use = test_nodes[(test_nodes['name'] == 'p2') & (test_nodes['kind'] == 'var_use')]
-            if len(p2_use) > 0:
-                def_use_edge = test_edges[
-                    (test_edges['kind'] == 'def_use') &
-                    (test_edges['dst_id'] == p2_use.iloc[0]['id'])
-                ]
-                if len(def_use_edge) > 0:
-                    src_id = def_use_edge.iloc[0]['src_id']
-                    p2_param = test_nodes[(test_nodes['name'] == 'p2') & (test_nodes['kind'] == 'param')]
-                    if len(p2_param) > 0 and src_id == p2_param.iloc[0]['id']:
-                        self.log_result("Function Params", "return p2 connects to p2 param", "PASS")
-                    else:
-                        self.log_result("Function Params", "return p2 connects to p2 param", "FAIL", 
-                                      f"Expected p2 param src_id, got {src_id}")
+                self.log_result("Function Params", "x connects to p1 param", "FAIL", "No p1 VAR_USE found")
+        else:
+            self.log_result("Function Params", "x connects to p1 param", "FAIL", "No x VAR_DEF found")
+        
+        # Assertion 2: return p2 should connect to p2 PARAM
+        p2_use = _take(test_nodes, nodes_by_name_kind, ('p2', 'var_use'))
+        if len(p2_use) > 0:
+            def_use_edge = _take(test_edges, edges_by_dst, ('def_use', p2_use['id'][0].as_py()))
+            if len(def_use_edge) > 0:
+                src_id = def_use_edge['src_id'][0].as_py()
+                p2_param = _take(test_nodes, nodes_by_name_kind, ('p2', 'param'))
+                if len(p2_param) > 0 and src_id == p2_param['id'][0].as_py():
+                    self.log_result("Function Params", "return p2 connects to p2 param", "PASS")
                 else:
-                    self.log_result("Function Params", "return p2 connects to p2 param", "FAIL", "No DEF_USE edge found")
+                    self.log_result("Function Params", "return p2 connects to p2 param", "FAIL", 
+                                  f"Expected p2 param src_id, got {src_id}")
             else:
-                self.log_result("Function Params", "return p2 connects to p2 param", "FAIL", "No p2 VAR_USE found")
+                self.log_result("Function Params", "return p2 connects to p2 param", "FAIL", "No DEF_USE edge found")
+        else:
+            self.log_result("Function Params", "return p2 connects to p2 param", "FAIL", "No p2 VAR_USE found")
     
-    def test_case_3_scope_correctness(self):
+    def test_case_3_scope_correctness(self, temp_path: Path):
         """Test Case 3: Scope Correctness"""
-        with TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            # Create test file
-            code = """
+        # Create test file
+        code = """
 x = "global"  # Global scope var
 
 def scope_test():
@@ -309,126 +414,96 @@ def scope_test():
 
 z = x             # Use of global x
 """
-            test_file = self.create_test_file(temp_path, "test_scope.py", code)
-            
-            # Run pipeline
-            self.run_pipeline([test_file], "scope_correctness")
-            
-            # Load data
-            data = self.load_parquet_data()
-            
-            if 'dfg_nodes' not in data or 'dfg_edges' not in data:
-                self.log_result("Scope Correctness", "Data loading", "FAIL", "Missing DFG data")
-                return
-            
-            dfg_nodes = data['dfg_nodes']
-            dfg_edges = data['dfg_edges']
-            
-            # Filter for our test file
-            test_nodes = dfg_nodes[dfg_nodes['path'].str.contains('test_scope')]
-            test_edges = dfg_edges[dfg_edges['path'].str.contains('test_scope')]
-            
-            print(f"\n📋 DFG Nodes in test_scope.py:")
-            for _, row in test_nodes.iterrows():
-                print(f"  {row['kind']}: {row['name']} (version={row.get('version', 'N/A')}) - {row['id']}")
-            
-            # Assertion 1: y = x (inside function) should connect to local x
-            y_def = test_nodes[(test_nodes['name'] == 'y') & (test_nodes['kind'] == 'var_def')]
-            if len(y_def) > 0:
-                # Find the x VAR_USE that corresponds to y = x
-                x_uses = test_nodes[(test_nodes['name'] == 'x') & (test_nodes['kind'] == 'var_use')]
-                if len(x_uses) >= 2:  # Should have at least 2 uses (one local, one global)
-                    # Find the one that's in the function scope
-                    local_x_use = None
-                    for _, x_use in x_uses.iterrows():
-                        # Check if this use is in the function scope by looking at the byte range
-                        # The local use should be around line 4 (y = x)
-                        if 40 <= x_use['prov_byte_start'] <= 60:  # Approximate range for local use
-                            local_x_use = x_use
-                            break
-                    
-                    if local_x_use is not None:
-                        def_use_edge = test_edges[
-                            (test_edges['kind'] == 'def_use') &
-                            (test_edges['dst_id'] == local_x_use['id'])
-                        ]
-                        if len(def_use_edge) > 0:
-                            src_id = def_use_edge.iloc[0]['src_id']
-                            # Find the local x VAR_DEF (should be around line 3)
-                            local_x_defs = test_nodes[
-                                (test_nodes['name'] == 'x') & 
-                                (test_nodes['kind'] == 'var_def')
-                            ]
-                            # The local x def should be around line 3
-                            local_x_def = None
-                            for _, x_def in local_x_defs.iterrows():
-                                if 20 <= x_def['prov_byte_start'] <= 40:  # Approximate range for local def
-                                    local_x_def = x_def
-                                    break
-                            
-                            if local_x_def is not None and src_id == local_x_def['id']:
-                                self.log_result("Scope Correctness", "local y=x connects to local x", "PASS")
-                            else:
-                                self.log_result("Scope Correctness", "local y=x connects to local x", "FAIL", 
-                                              f"Expected local x def, got {src_id}")
-                        else:
-                            self.log_result("Scope Correctness", "local y=x connects to local x", "FAIL", "No DEF_USE edge found")
-                    else:
-                        self.log_result("Scope Correctness", "local y=x connects to local x", "FAIL", "Could not identify local x use")
-                else:
-                    self.log_result("Scope Correctness", "local y=x connects to local x", "FAIL", "Insufficient x VAR_USE nodes")
-            else:
-                self.log_result("Scope Correctness", "local y=x connects to local x", "FAIL", "No y VAR_DEF found")
-            
-            # Assertion 2: z = x (global) should connect to global x
-            z_def = test_nodes[(test_nodes['name'] == 'z') & (test_nodes['kind'] == 'var_def')]
-            if len(z_def) > 0:
-                # Find the global x VAR_USE
-                x_uses = test_nodes[(test_nodes['name'] == 'x') & (test_nodes['kind'] == 'var_use')]
-                global_x_use = None
-                for _, x_use in x_uses.iterrows():
-                    # The global use should be around line 6 (z = x)
-                    if x_use['prov_byte_start'] >= 70:  # Approximate range for global use
-                        global_x_use = x_use
-                        break
+        test_file = self.create_test_file(temp_path, "test_scope.py", code)
+        
+        # Run pipeline
+        self.run_pipeline([test_file], "scope_correctness")
+        
+        # Load data
+        data = self.load_parquet_data(path_substring='test_scope')
+        
+        if 'dfg_nodes' not in data or 'dfg_edges' not in data:
+            self.log_result("Scope Correctness", "Data loading", "FAIL", "Missing DFG data")
+            return
+        
+        test_nodes = data['dfg_nodes']
+        test_edges = data['dfg_edges']
+        
+        # Index rows once; every lookup below is a dict probe instead of a full mask
+        nodes_by_key = _index(test_nodes, ['name', 'kind', 'version'])
+        nodes_by_name_kind = _index(test_nodes, ['name', 'kind'])
+        edges_by_dst = _index(test_edges, ['kind', 'dst_id'])
+        
+        print(f"\n📋 DFG Nodes in test_scope.py:")
+        for row in test_nodes.to_pylist():
+            print(f"  {row['kind']}: {row['name']} (version={row.get('version', 'N/A')}) - {row['id']}")
+        
+        # Assertion 1: y = x (inside function) should connect to local x
+        y_def = _take(test_nodes, nodes_by_name_kind, ('y', 'var_def'))
+        if len(y_def) > 0:
+            # Find the x VAR_USE that corresponds to y = x
+            x_uses = _take(test_nodes, nodes_by_name_kind, ('x', 'var_use'))
+            if len(x_uses) >= 2:  # Should have at least 2 uses (one local, one global)
+                # Find the one that's in the function scope
+                # Check if this use is in the function scope by looking at the byte range
+                # The local use should be around line 4 (y = x)
+                local_x_use = _first_in_byte_range(x_uses, 40, 60)  # Approximate range for local use
                 
-                if global_x_use is not None:
-                    def_use_edge = test_edges[
-                        (test_edges['kind'] == 'def_use') &
-                        (test_edges['dst_id'] == global_x_use['id'])
-                    ]
+                if local_x_use is not None:
+                    def_use_edge = _take(test_edges, edges_by_dst, ('def_use', local_x_use['id']))
                     if len(def_use_edge) > 0:
-                        src_id = def_use_edge.iloc[0]['src_id']
-                        # Find the global x VAR_DEF (should be around line 1)
-                        global_x_defs = test_nodes[
-                            (test_nodes['name'] == 'x') & 
-                            (test_nodes['kind'] == 'var_def')
-                        ]
-                        global_x_def = None
-                        for _, x_def in global_x_defs.iterrows():
-                            if x_def['prov_byte_start'] <= 20:  # Approximate range for global def
-                                global_x_def = x_def
-                                break
+                        src_id = def_use_edge['src_id'][0].as_py()
+                        # Find the local x VAR_DEF (should be around line 3)
+                        local_x_defs = _take(test_nodes, nodes_by_name_kind, ('x', 'var_def'))
+                        # The local x def should be around line 3
+                        local_x_def = _first_in_byte_range(local_x_defs, 20, 40)  # Approximate range for local def
                         
-                        if global_x_def is not None and src_id == global_x_def['id']:
-                            self.log_result("Scope Correctness", "global z=x connects to global x", "PASS")
+                        if local_x_def is not None and src_id == local_x_def['id']:
+                            self.log_result("Scope Correctness", "local y=x connects to local x", "PASS")
                         else:
-                            self.log_result("Scope Correctness", "global z=x connects to global x", "FAIL", 
-                                          f"Expected global x def, got {src_id}")
+                            self.log_result("Scope Correctness", "local y=x connects to local x", "FAIL", 
+                                          f"Expected local x def, got {src_id}")
+                    else:
+                        self.log_result("Scope Correctness", "local y=x connects to local x", "FAIL", "No DEF_USE edge found")
+                else:
+                    self.log_result("Scope Correctness", "local y=x connects to local x", "FAIL", "Could not identify local x use")
+            else:
+                self.log_result("Scope Correctness", "local y=x connects to local x", "FAIL", "Insufficient x VAR_USE nodes")
+        else:
+            self.log_result("Scope Correctness", "local y=x connects to local x", "FAIL", "No y VAR_DEF found")
+        
+        # Assertion 2: z = x (global) should connect to global x
+        z_def = _take(test_nodes, nodes_by_name_kind, ('z', 'var_def'))
+        if len(z_def) > 0:
+            # Find the global x VAR_USE
+            x_uses = _take(test_nodes, nodes_by_name_kind, ('x', 'var_use'))
+            # The global use should be around line 6 (z = x)
+            global_x_use = _first_in_byte_range(x_uses, lo=70)  # Approximate range for global use
+            
+            if global_x_use is not None:
+                def_use_edge = _take(test_edges, edges_by_dst, ('def_use', global_x_use['id']))
+                if len(def_use_edge) > 0:
+                    src_id = def_use_edge['src_id'][0].as_py()
+                    # Find the global x VAR_DEF (should be around line 1)
+                    global_x_defs = _take(test_nodes, nodes_by_name_kind, ('x', 'var_def'))
+                    global_x_def = _first_in_byte_range(global_x_defs, hi=20)  # Approximate range for global def
+                    
+                    if global_x_def is not None and src_id == global_x_def['id']:
+                        self.log_result("Scope Correctness", "global z=x connects to global x", "PASS")
                     else:
-                        self.log_result("Scope Correctness", "global z=x connects to global x", "FAIL", "No DEF_USE edge found")
+                        self.log_result("Scope Correctness", "global z=x connects to global x", "FAIL", 
+                                      f"Expected global x def, got {src_id}")
                 else:
-                    self.log_result("Scope Correctness", "global z=x connects to global x", "FAIL", "Could not identify global x use")
+                    self.log_result("Scope Correctness", "global z=x connects to global x", "FAIL", "No DEF_USE edge found")
             else:
-                self.log_result("Scope Correctness", "global z=x connects to global x", "FAIL", "No z VAR_DEF found")
+                self.log_result("Scope Correctness", "global z=x connects to global x", "FAIL", "Could not identify global x use")
+        else:
+            self.log_result("Scope Correctness", "global z=x connects to global x", "FAIL", "No z VAR_DEF found")
     
-    def test_case_4_alias_detection(self):
+    def test_case_4_alias_detection(self, temp_path: Path):
         """Test Case 4: Simple Alias Detection (alias_hint)"""
-        with TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            # Create test file
-            code = """
+        # Create test file
+        code = """
 def alias_test():
     original = get_data()
     aliased = original  # This is a direct alias
@@ -436,59 +511,57 @@ def alias_test():
     # This is NOT a direct alias
     processed = aliased.process()
 """
-            test_file = self.create_test_file(temp_path, "test_alias.py", code)
-            
-            # Run pipeline
-            summary = self.run_pipeline([test_file], "alias_detection")
-            
-            # Load data
-            data = self.load_parquet_data()
-            
-            if 'aliases' not in data:
-                self.log_result("Alias Detection", "Data loading", "FAIL", "Missing aliases data")
-                return
-            
-            aliases = data['aliases']
-            
-            print(f"\n📋 Aliases in test_alias.py:")
-            for _, row in aliases.iterrows():
-                print(f"  {row['alias_kind']}: {row['alias_name']} -> {row['target_symbol_id']}")
-            
-            # Assertion 1: Exactly one alias_hint should be generated
-            alias_count = len(aliases)
-            if alias_count == 1:
-                self.log_result("Alias Detection", "Exactly one alias generated", "PASS")
-            else:
-                self.log_result("Alias Detection", "Exactly one alias generated", "FAIL", 
-                              f"Expected 1 alias, got {alias_count}")
-            
-            # Assertion 2: The alias should be for aliased -> original
-            if alias_count > 0:
-                alias = aliases.iloc[0]
-                if alias['alias_name'] == 'aliased':
-                    self.log_result("Alias Detection", "alias is aliased -> original", "PASS")
-                else:
-                    self.log_result("Alias Detection", "alias is aliased -> original", "FAIL", 
-                                  f"Expected alias_name='aliased', got '{alias['alias_name']}'")
-            else:
-                self.log_result("Alias Detection", "alias is aliased -> original", "FAIL", "No aliases found")
-            
-            # Assertion 3: No alias should be generated for processed = aliased.process()
-            # This is already covered by assertion 1 (exactly one alias), but let's be explicit
-            processed_aliases = aliases[aliases['alias_name'] == 'processed']
-            if len(processed_aliases) == 0:
-                self.log_result("Alias Detection", "No alias for processed = aliased.process()", "PASS")
+        test_file = self.create_test_file(temp_path, "test_alias.py", code)
+        
+        # Run pipeline
+        summary = self.run_pipeline([test_file], "alias_detection")
+        
+        # Load data
+        data = self.load_parquet_data()
+        
+        if 'aliases' not in data:
+            self.log_result("Alias Detection", "Data loading", "FAIL", "Missing aliases data")
+            return
+        
+        aliases = data['aliases']
+        alias_names = aliases['alias_name']
+        
+        print(f"\n📋 Aliases in test_alias.py:")
+        for row in aliases.to_pylist():
+            print(f"  {row['alias_kind']}: {row['alias_name']} -> {row['target_symbol_id']}")
+        
+        # Assertion 1: Exactly one alias_hint should be generated
+        alias_count = len(aliases)
+        if alias_count == 1:
+            self.log_result("Alias Detection", "Exactly one alias generated", "PASS")
+        else:
+            self.log_result("Alias Detection", "Exactly one alias generated", "FAIL", 
+                          f"Expected 1 alias, got {alias_count}")
+        
+        # Assertion 2: The alias should be for aliased -> original
+        if alias_count > 0:
+            alias_name = alias_names[0].as_py()
+            if alias_name == 'aliased':
+                self.log_result("Alias Detection", "alias is aliased -> original", "PASS")
             else:
-                self.log_result("Alias Detection", "No alias for processed = aliased.process()", "FAIL", 
-                              f"Found {len(processed_aliases)} aliases for 'processed'")
+                self.log_result("Alias Detection", "alias is aliased -> original", "FAIL", 
+                              f"Expected alias_name='aliased', got '{alias_name}'")
+        else:
+            self.log_result("Alias Detection", "alias is aliased -> original", "FAIL", "No aliases found")
+        
+        # Assertion 3: No alias should be generated for processed = aliased.process()
+        # This is already covered by assertion 1 (exactly one alias), but let's be explicit
+        processed_aliases = pc.filter(aliases, pc.equal(alias_names, 'processed'))
+        if len(processed_aliases) == 0:
+            self.log_result("Alias Detection", "No alias for processed = aliased.process()", "PASS")
+        else:
+            self.log_result("Alias Detection", "No alias for processed = aliased.process()", "FAIL", 
+                          f"Found {len(processed_aliases)} aliases for 'processed'")
     
-    def test_case_5_attribute_assignment(self):
+    def test_case_5_attribute_assignment(self, temp_path: Path):
         """Test Case 5: Attribute Assignment (Stretch Goal)"""
-        with TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            # Create test file
-            code = """
+        # Create test file
+        code = """
 class MyClass:
     def __init__(self):
         self.foo = 100
@@ -496,73 +569,71 @@ class MyClass:
     def get_foo(self):
         return self.foo
 """
-            test_file = self.create_test_file(temp_path, "test_attribute.py", code)
-            
-            # Run pipeline
-            self.run_pipeline([test_file], "attribute_assignment")
-            
-            # Load data
-            data = self.load_parquet_data()
-            
-            if 'dfg_nodes' not in data or 'dfg_edges' not in data:
-                self.log_result("Attribute Assignment", "Data loading", "FAIL", "Missing DFG data")
-                return
-            
-            dfg_nodes = data['dfg_nodes']
-            dfg_edges = data['dfg_edges']
-            
-            # Filter for our test file
-            test_nodes = dfg_nodes[dfg_nodes['path'].str.contains('test_attribute')]
-            test_edges = dfg_edges[dfg_edges['path'].str.contains('test_attribute')]
-            
-            print(f"\n📋 DFG Nodes in test_attribute.py:")
-            for _, row in test_nodes.iterrows():
-                print(f"  {row['kind']}: {row['name']} (version={row.get('version', 'N/A')}) - {row['id']}")
-            
-            # Assertion 1: VAR_DEF for self.foo in __init__
-            self_foo_defs = test_nodes[
-                (test_nodes['name'] == 'self.foo') & 
-                (test_nodes['kind'] == 'var_def')
-            ]
-            if len(self_foo_defs) > 0:
-                self.log_result("Attribute Assignment", "VAR_DEF for self.foo in __init__", "PASS")
-            else:
-                self.log_result("Attribute Assignment", "VAR_DEF for self.foo in __init__", "FAIL", "No self.foo VAR_DEF found")
-            
-            # Assertion 2: DEF_USE edge from __init__ self.foo to get_foo self.foo
-            self_foo_uses = test_nodes[
-                (test_nodes['name'] == 'self.foo') & 
-                (test_nodes['kind'] == 'var_use')
-            ]
-            if len(self_foo_uses) > 0 and len(self_foo_defs) > 0:
-                # Find DEF_USE edge
-                def_use_edges = test_edges[
-                    (test_edges['kind'] == 'def_use') &
-                    (test_edges['src_id'] == self_foo_defs.iloc[0]['id']) &
-                    (test_edges['dst_id'] == self_foo_uses.iloc[0]['id'])
-                ]
-                if len(def_use_edges) > 0:
-                    self.log_result("Attribute Assignment", "DEF_USE edge from __init__ to get_foo", "PASS")
-                else:
-                    self.log_result("Attribute Assignment", "DEF_USE edge from __init__ to get_foo", "FAIL", "No DEF_USE edge found")
+        test_file = self.create_test_file(temp_path, "test_attribute.py", code)
+        
+        # Run pipeline
+        self.run_pipeline([test_file], "attribute_assignment")
+        
+        # Load data
+        data = self.load_parquet_data(path_substring='test_attribute')
+        
+        if 'dfg_nodes' not in data or 'dfg_edges' not in data:
+            self.log_result("Attribute Assignment", "Data loading", "FAIL", "Missing DFG data")
+            return
+        
+        test_nodes = data['dfg_nodes']
+        test_edges = data['dfg_edges']
+        
+        # Index rows once; every lookup below is a dict probe instead of a full mask
+        nodes_by_key = _index(test_nodes, ['name', 'kind', 'version'])
+        nodes_by_name_kind = _index(test_nodes, ['name', 'kind'])
+        edges_by_dst = _index(test_edges, ['kind', 'dst_id'])
+        
+        print(f"\n📋 DFG Nodes in test_attribute.py:")
+        for row in test_nodes.to_pylist():
+            print(f"  {row['kind']}: {row['name']} (version={row.get('version', 'N/A')}) - {row['id']}")
+        
+        # Assertion 1: VAR_DEF for self.foo in __init__
+        self_foo_defs = _take(test_nodes, nodes_by_name_kind, ('self.foo', 'var_def'))
+        if len(self_foo_defs) > 0:
+            self.log_result("Attribute Assignment", "VAR_DEF for self.foo in __init__", "PASS")
+        else:
+            self.log_result("Attribute Assignment", "VAR_DEF for self.foo in __init__", "FAIL", "No self.foo VAR_DEF found")
+        
+        # Assertion 2: DEF_USE edge from __init__ self.foo to get_foo self.foo
+        self_foo_uses = _take(test_nodes, nodes_by_name_kind, ('self.foo', 'var_use'))
+        if len(self_foo_uses) > 0 and len(self_foo_defs) > 0:
+            # Find DEF_USE edge
+            def_use_edges = _take(test_edges, edges_by_dst, ('def_use', self_foo_uses['id'][0].as_py()))
+            def_use_edges = def_use_edges.filter(pc.equal(def_use_edges['src_id'], self_foo_defs['id'][0]))
+            if len(def_use_edges) > 0:
+                self.log_result("Attribute Assignment", "DEF_USE edge from __init__ to get_foo", "PASS")
             else:
-                self.log_result("Attribute Assignment", "DEF_USE edge from __init__ to get_foo", "FAIL", 
-                              f"Missing nodes: defs={len(self_foo_defs)}, uses={len(self_foo_uses)}")
+                self.log_result("Attribute Assignment", "DEF_USE edge from __init__ to get_foo", "FAIL", "No DEF_USE edge found")
+        else:
+            self.log_result("Attribute Assignment", "DEF_USE edge from __init__ to get_foo", "FAIL", 
+                          f"Missing nodes: defs={len(self_foo_defs)}, uses={len(self_foo_uses)}")
     
     def run_all_tests(self):
         """Run all test cases."""
         print("🔍 QA Validation Suite for DfgBuilder")
         print("=" * 60)
         
-        # Run all test cases
-        self.test_case_1_ssa_versioning()
-        self.test_case_2_function_params()
-        self.test_case_3_scope_correctness()
-        self.test_case_4_alias_detection()
-        self.test_case_5_attribute_assignment()
+        # The test cases are independent (own input file, pipeline run and output dir):
+        # run them in parallel, then replay each worker's output in test-case order.
+        # All inputs go into one shared temp dir; each case writes a distinct file name.
+        with TemporaryDirectory(prefix="qa_input_", dir=_TMPFS) as temp_dir, \
+                ProcessPoolExecutor(max_workers=min(len(TEST_CASES), os.cpu_count() or 1)) as ex:
+            temp_paths = [Path(temp_dir)] * len(TEST_CASES)
+            for out, (tests, assertions, results, details) in ex.map(_run_case_captured, TEST_CASES, temp_paths):
+                sys.stdout.write(out)
+                self._r_test.extend(tests)
+                self._r_assert.extend(assertions)
+                self._r_result.extend(results)
+                self._r_details.extend(details)
         
         # Generate final report
-        self.generate_final_report()
+        return self.generate_final_report()
     
     def generate_final_report(self):
         """Generate the final QA report."""
@@ -570,8 +641,8 @@ class MyClass:
         print("=" * 60)
         
         # Count results
-        total_tests = len(self.test_results)
-        passed_tests = len([r for r in self.test_results if r['result'] == 'PASS'])
+        total_tests = len(self._r_result)
+        passed_tests = sum(1 for r in self._r_result if r == 'PASS')
         failed_tests = total_tests - passed_tests
         success_rate = (passed_tests / total_tests * 100) if total_tests > 0 else 0
         
@@ -583,13 +654,13 @@ class MyClass:
         
         print(f"\n📋 Detailed Results:")
         current_test = None
-        for result in self.test_results:
-            if result['test'] != current_test:
-                current_test = result['test']
+        for test, assertion, result, details in zip(self._r_test, self._r_assert, self._r_result, self._r_details):
+            if test != current_test:
+                current_test = test
                 print(f"\n  🧪 {current_test}:")
-            print(f"    {result['result']} {result['assertion']}")
-            if result['details']:
-                print(f"      Details: {result['details']}")
+            print(f"    {result} {assertion}")
+            if details:
+                print(f"      Details: {details}")
         
         # Status
         if success_rate == 100:
@@ -604,17 +675,29 @@ class MyClass:
         return success_rate >= 80
 
 
+# QAValidator methods run by run_all_tests, in report order
+TEST_CASES = (
+    "test_case_1_ssa_versioning",
+    "test_case_2_function_params",
+    "test_case_3_scope_correctness",
+    "test_case_4_alias_detection",
+    "test_case_5_attribute_assignment",
+)
+
+
+def _run_case_captured(case: str, temp_path: Path) -> tuple:
+    """Worker entry point: run one test case and hand its output and logged results back to the parent."""
+    validator = QAValidator()
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        getattr(validator, case)(temp_path)
+    return buf.getvalue(), (validator._r_test, validator._r_assert, validator._r_result, validator._r_details)
+
+
 def main():
     """Main QA validation runner."""
     validator = QAValidator()
-    success = validator.run_all_tests()
-    
-    # Clean up output directories
-    for output_dir in Path(".").glob("qa_output_*"):
-        import shutil
-        shutil.rmtree(output_dir, ignore_errors=True)
-    
-    return success
+    return validator.run_all_tests()
 
 
 if __name__ == "__main__":
@@ -42,7 +42,7 @@ def test_dfg_builder():
     # Parse the file
     driver = PythonLibCstDriver()
     ps = driver.parse(fm)
-    events = list(ps.events) if ps.events else []
+    events = list(ps.events or ())
     
     print(f"Parsed {len(events)} events from {test_file.name}")
     
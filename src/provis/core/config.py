@@ -3,13 +3,14 @@
 from __future__ import annotations
 
 import os
+import sys
 from functools import lru_cache
 
 
 _TRUE_VALUES = {"1", "true", "yes", "on"}
 
 
-@lru_cache(maxsize=None)
+@lru_cache(maxsize=256)
 def feature_enabled(name: str, default: bool = False) -> bool:
     """Return True when the named feature flag is enabled via environment variable.
 
@@ -23,3 +24,14 @@ def feature_enabled(name: str, default: bool = False) -> bool:
     if raw is None:
         return default
     return raw.strip().lower() in _TRUE_VALUES
+
+
+def dump_feature_cache_info() -> None:
+    """Print feature_enabled's cache statistics to stderr when PROVIS_SHOW_LRU_CACHE_INFO is set.
+
+    Diagnostic only: shows whether the cache earns its keep and whether 256 entries
+    (far more than the known flags) is ever approached.
+    """
+
+    if os.getenv("PROVIS_SHOW_LRU_CACHE_INFO"):
+        print("feature_enabled:", feature_enabled.cache_info(), file=sys.stderr)
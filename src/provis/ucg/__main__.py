@@ -2,11 +2,14 @@
 from __future__ import annotations
 
 import json
+import os
 from dataclasses import asdict
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from ..core.config import dump_feature_cache_info
 from .discovery import iter_discovered_files, DiscoveryConfig, AnomalySink
+from .anomalies import AnomalySink as _CountingSink
 from .api import build_ucg_for_files, Step1Config, Step1Summary
 
 
@@ -24,10 +27,14 @@ def run_step1_on_path(
     - Runs discovery → step1 → finalize artifacts atomically in out_dir.
     - Returns a JSON-serializable dict with summary + receipt path.
     """
-    root = Path(root)
-    out_dir = Path(out_dir)
+    if not isinstance(root, Path):
+        root = Path(root)
+    if not isinstance(out_dir, Path):
+        out_dir = Path(out_dir)
     sink = AnomalySink()
-    files = list(iter_discovered_files(root, discovery or DiscoveryConfig(), anomaly_sink=sink))
+    # Discovery yields files in (path) order, so Step-1 consumes it as a stream and
+    # starts parsing as soon as the first file is found.
+    files = iter_discovered_files(root, discovery or DiscoveryConfig(), anomaly_sink=sink)
 
     # Step-1
     summary: Step1Summary = build_ucg_for_files(
@@ -35,23 +42,19 @@ def run_step1_on_path(
         out_dir,
         cfg=step1 or Step1Config(),
         run_metadata=run_meta or {},
+        presorted=True,
     )
+    dump_feature_cache_info()
 
     # Try to read receipt (if present)
-    receipt_path = out_dir / "run_receipt.json"
-    receipt: Dict[str, Any] = {}
-    if receipt_path.exists():
-        try:
-            receipt = json.loads(receipt_path.read_text(encoding="utf-8"))
-        except Exception:
-            receipt = {}
+    receipt_path = os.path.join(out_dir, _RECEIPT_NAME)
 
     return {
         "summary": _summary_to_dict(summary),
         "out_dir": str(out_dir),
-        "receipt_path": str(receipt_path),
-        "receipt": receipt,
-        "discovery_counters": sink.counters(),
+        "receipt_path": receipt_path,
+        "receipt": _load_receipt_file(receipt_path),
+        "discovery_counters": _discovery_counters(sink),
     }
 
 
@@ -59,17 +62,54 @@ def load_receipt(out_dir: Path) -> Dict[str, Any]:
     """
     Helper for your UI to re-read the receipt at any time.
     """
-    out_dir = Path(out_dir)
-    receipt_path = out_dir / "run_receipt.json"
-    if not receipt_path.exists():
+    return _load_receipt_file(os.path.join(out_dir, _RECEIPT_NAME))
+
+
+# ----------------------------- helpers ----------------------------------------
+
+_RECEIPT_NAME = "run_receipt.json"
+
+
+def _load_receipt_file(receipt_path: str) -> Dict[str, Any]:
+    data = _read_file_bytes(receipt_path)
+    if data is None:
         return {}
     try:
-        return json.loads(receipt_path.read_text(encoding="utf-8"))
+        # json.loads takes the raw bytes and detects UTF-8 itself; no str round-trip
+        return json.loads(data)
     except Exception:
         return {}
 
 
-# ----------------------------- helpers ----------------------------------------
+def _read_file_bytes(path: str) -> Optional[bytes]:
+    # open + fstat + read + close; None when the file is missing or unreadable.
+    # Path.read_bytes() adds seeks and a second stat, and polling UIs call this a lot.
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+    except OSError:
+        return None
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size)
+        while len(data) < size:  # short read: >2 GiB, or the file shrank under us
+            chunk = os.read(fd, size - len(data))
+            if not chunk:
+                break
+            data += chunk
+        return data
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
+
+def _discovery_counters(sink: AnomalySink) -> Dict[str, int]:
+    # discovery.AnomalySink only collects; tally it with the pipeline's sink so both
+    # report the same counter keys.
+    tally = _CountingSink()
+    tally.emit_many(sink.items())
+    return tally.counters()
+
 
 def _summary_to_dict(s: Step1Summary) -> Dict[str, Any]:
     # dataclass → dict (explicit to avoid surprises if dataclass changes)
@@ -1,11 +1,14 @@
 # src/provis/ucg/anomalies.py
 from __future__ import annotations
 
+import dataclasses
 import enum
+import sys
 import threading
 import time
-from dataclasses import dataclass, field
-from typing import Dict, Iterable, List, Optional, Tuple
+from bisect import bisect_right
+from collections import Counter, deque
+from typing import Callable, Deque, Dict, Iterable, List, NamedTuple, Optional, Tuple
 
 
 class Severity(str, enum.Enum):
@@ -36,10 +39,49 @@ class AnomalyKind(str, enum.Enum):
     UNKNOWN = "UNKNOWN"
 
 
-@dataclass(frozen=True)
-class Anomaly:
+# Interned counter keys per enum member, so emit() does a dict probe instead of
+# formatting two strings. Members of other kind/severity enums (discovery's) are
+# added on first sight. Keys use the member name: it equals the value for these
+# str enums and stays readable for discovery's auto() ints.
+_KIND_KEYS: Dict[enum.Enum, str] = {k: sys.intern(f"kind:{k.name}") for k in AnomalyKind}
+_SEV_KEYS: Dict[enum.Enum, str] = {s: sys.intern(f"sev:{s.name}") for s in Severity}
+
+
+def _kind_key(kind: enum.Enum) -> str:
+    key = _KIND_KEYS.get(kind)
+    if key is None:
+        key = _KIND_KEYS[kind] = sys.intern(f"kind:{kind.name}")
+    return key
+
+
+def _sev_key(severity: enum.Enum) -> str:
+    key = _SEV_KEYS.get(severity)
+    if key is None:
+        key = _SEV_KEYS[severity] = sys.intern(f"sev:{severity.name}")
+    return key
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _stamped(anomaly, now_ms: int):
+    """`anomaly` with ts_ms=now_ms if it has none (this Anomaly or discovery's dataclass)."""
+    if anomaly.ts_ms is not None:
+        return anomaly
+    replace = getattr(anomaly, "_replace", None)
+    if replace is not None:
+        return replace(ts_ms=now_ms)
+    return dataclasses.replace(anomaly, ts_ms=now_ms)
+
+
+class Anomaly(NamedTuple):
     """
     Immutable record. Persisted by UcgStore via its Arrow mapping.
+
+    A NamedTuple rather than a frozen dataclass: construction is one tuple allocation
+    with no object.__setattr__ calls. ts_ms is not stamped here: AnomalySink stamps
+    records without one when they are emitted (one clock read per emit/emit_many).
     """
     path: str
     blob_sha: str
@@ -47,21 +89,23 @@ class Anomaly:
     severity: Severity
     detail: str = ""
     span: Optional[Tuple[int, int]] = None  # (byte_start, byte_end)
-    ts_ms: int = field(default_factory=lambda: int(time.time() * 1000))
+    ts_ms: Optional[int] = None
 
     def to_dict(self) -> Dict:
-        s0, s1 = (None, None)
-        if self.span and len(self.span) == 2:
-            s0, s1 = int(self.span[0]), int(self.span[1])
+        span = self.span
+        if span and len(span) == 2:
+            span_start, span_end = int(span[0] or 0), int(span[1] or 0)
+        else:
+            span_start = span_end = 0
         return {
             "path": self.path,
             "blob_sha": self.blob_sha,
             "kind": self.kind.value,
             "severity": self.severity.value,
             "detail": self.detail,
-            "span_start": int(s0 or 0),
-            "span_end": int(s1 or 0),
-            "ts_ms": int(self.ts_ms),
+            "span_start": span_start,
+            "span_end": span_end,
+            "ts_ms": self.ts_ms if self.ts_ms is not None else _now_ms(),
         }
 
 
@@ -70,46 +114,95 @@ class AnomalySink:
     Thread-safe anomaly collector + lightweight observability.
 
     - emit(): add an anomaly, update counters
+    - emit_many(): add a batch of anomalies (one clock read stamps every record without ts_ms)
     - drain(): atomically return & clear buffered anomalies
     - counters(): snapshot of counters (for receipts/metrics)
     - observe_duration(): record timing histograms (file parse times, etc.)
+
+    The emit path takes no lock: the buffer is a deque (append/extend/popleft are
+    atomic) and each thread counts into its own Counter, merged on read.
+
+    With `max_buffered` and `on_full` set, the buffer never holds more than about
+    `max_buffered` anomalies: the emit that reaches the bound drains the buffer and
+    hands the batch to `on_full` (e.g. a store's append_anomalies) on the emitting thread.
     """
 
-    __slots__ = ("_lock", "_buffer", "_counts", "_timers")
+    __slots__ = ("_lock", "_buffer", "_local", "_thread_counts", "_timers", "_spill_at", "_on_full")
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        max_buffered: Optional[int] = None,
+        on_full: Optional[Callable[[List[Anomaly]], None]] = None,
+    ) -> None:
         self._lock = threading.Lock()
-        self._buffer: List[Anomaly] = []
-        # Counters: by kind/severity; flat totals; by path optional aggregation
-        self._counts: Dict[str, int] = {
-            "total": 0,
-        }
+        self._buffer: Deque[Anomaly] = deque()
+        self._spill_at = max(1, max_buffered) if max_buffered and on_full is not None else 0
+        self._on_full = on_full
+        # Counters: by kind/severity; flat totals. One Counter per emitting thread,
+        # registered in _thread_counts (under the lock) on that thread's first emit.
+        self._local = threading.local()
+        self._thread_counts: List[Counter[str]] = []
         # Timers: name -> bucket -> count
         self._timers: Dict[str, Dict[str, int]] = {}
 
     # ----------------------------- public API ---------------------------------
 
     def emit(self, anomaly: Anomaly) -> None:
-        with self._lock:
-            self._buffer.append(anomaly)
-            self._counts["total"] = self._counts.get("total", 0) + 1
-            self._counts[f"kind:{anomaly.kind.value}"] = self._counts.get(f"kind:{anomaly.kind.value}", 0) + 1
-            self._counts[f"sev:{anomaly.severity.value}"] = self._counts.get(f"sev:{anomaly.severity.value}", 0) + 1
+        anomaly = _stamped(anomaly, _now_ms())
+        self._buffer.append(anomaly)
+        counts = self._counts()
+        counts["total"] += 1
+        counts[_kind_key(anomaly.kind)] += 1
+        counts[_sev_key(anomaly.severity)] += 1
+        if self._spill_at and len(self._buffer) >= self._spill_at:
+            self._spill()
+
+    def emit_many(self, anomalies: Iterable[Anomaly]) -> None:
+        now_ms = _now_ms()
+        batch = [_stamped(a, now_ms) for a in anomalies]
+        if not batch:
+            return
+        self._buffer.extend(batch)
+        counts = self._counts()
+        for a in batch:
+            counts[_kind_key(a.kind)] += 1
+            counts[_sev_key(a.severity)] += 1
+        counts["total"] += len(batch)
+        if self._spill_at and len(self._buffer) >= self._spill_at:
+            self._spill()
 
     def extend(self, anomalies: Iterable[Anomaly]) -> None:
-        for a in anomalies:
-            self.emit(a)
+        self.emit_many(anomalies)
 
     def drain(self) -> List[Anomaly]:
+        # Pop what is buffered now; anomalies emitted meanwhile stay for the next drain.
+        # The lock only serializes concurrent drains; emitters never wait on it.
         with self._lock:
-            out = self._buffer
-            self._buffer = []
-            return out
+            buf = self._buffer
+            popleft = buf.popleft
+            return [popleft() for _ in range(len(buf))]
 
     def counters(self) -> Dict[str, int]:
+        merged: Counter[str] = Counter(total=0)
         with self._lock:
-            # shallow copy is enough (values are ints)
-            return dict(self._counts)
+            thread_counts = list(self._thread_counts)
+        for counts in thread_counts:
+            # dict.copy is atomic, so a concurrent emit cannot break the iteration
+            merged.update(dict.copy(counts))
+        return dict(merged)
+
+    def _spill(self) -> None:
+        batch = self.drain()
+        if batch:
+            self._on_full(batch)
+
+    def _counts(self) -> Counter[str]:
+        counts = getattr(self._local, "counts", None)
+        if counts is None:
+            counts = self._local.counts = Counter()
+            with self._lock:
+                self._thread_counts.append(counts)
+        return counts
 
     def observe_duration(self, name: str, key: str, seconds: float) -> None:
         """
@@ -131,33 +224,18 @@ class AnomalySink:
 
 # ----------------------------- helpers ----------------------------------------
 
+# Upper bounds (exclusive) of the duration buckets and their labels; the last label
+# catches everything at or above the final edge.
+_BUCKET_EDGES: Tuple[float, ...] = (1e-6, 1e-3, 1e-2, 5e-2, 1e-1, 5e-1, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+_BUCKET_LABELS: Tuple[str, ...] = (
+    "<1µs", "<1ms", "<10ms", "<50ms", "<100ms", "<500ms",
+    "<1s", "<2.5s", "<5s", "<10s", "<30s", "<60s", ">=60s",
+)
+
+
 def _duration_bucket(seconds: float) -> str:
     """
     Log-ish buckets from microseconds to minutes.
     """
-    s = max(0.0, float(seconds))
-    if s < 1e-6:
-        return "<1µs"
-    if s < 1e-3:
-        return "<1ms"
-    if s < 1e-2:
-        return "<10ms"
-    if s < 5e-2:
-        return "<50ms"
-    if s < 1e-1:
-        return "<100ms"
-    if s < 5e-1:
-        return "<500ms"
-    if s < 1.0:
-        return "<1s"
-    if s < 2.5:
-        return "<2.5s"
-    if s < 5.0:
-        return "<5s"
-    if s < 10.0:
-        return "<10s"
-    if s < 30.0:
-        return "<30s"
-    if s < 60.0:
-        return "<60s"
-    return ">=60s"
+    # bisect_right: a value equal to an edge falls in the next bucket up (edges are exclusive)
+    return _BUCKET_LABELS[bisect_right(_BUCKET_EDGES, max(0.0, float(seconds)))]
@@ -1,28 +1,37 @@
 # src/provis/ucg/api.py
 from __future__ import annotations
 
+import os
+import queue
+import threading
 import time
-from dataclasses import dataclass
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import chain, islice
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from .discovery import (
     FileMeta,
     Language,
     Anomaly,
     AnomalyKind,
-    AnomalySink,
     Severity,
 )
+from .anomalies import AnomalySink
 from .normalize import normalize_parse_stream, NodeRow, NodeKind
 from .provenance import ProvenanceV2
 from .cfg import build_cfg
 from .dfg import build_dfg
 from .effects import build_effects
 from .ucg_store import UcgStore
-from .python_driver import PythonLibCstDriver as PythonDriver
-from .ts_driver import TSTreeSitterDriver as TsDriver
+from .python_driver import get_py_driver
+from .ts_driver import get_ts_driver
 from .parser_registry import CstEvent, DriverInfo
+from .parse_cache import EventCache
 
 
 @dataclass(frozen=True)
@@ -36,12 +45,16 @@ class Step1Config:
     enable_dfg: bool = True
     enable_symbols: bool = True
     enable_effects: bool = True
-    flush_every_n_files: int = 50
+    flush_bytes: int = 64 * 1024 * 1024   # flush the store after this many bytes of source are processed
+    workers: Optional[int] = None         # parse/analysis processes; None = os.cpu_count(), 1 = sequential
+    parallel_min_files: int = 8           # below this many files, run in-process (pool start-up dominates)
+    parallel_chunk_files: int = 32        # files per worker task; workers * 2 tasks are kept in flight
     node_edge_batch: int = 4096
     cfg_batch: int = 4096
     dfg_batch: int = 4096
     sym_batch: int = 4096
     eff_batch: int = 4096
+    max_buffered_anomalies: int = 4096    # anomalies held before they are handed to the store
 
 
 @dataclass(frozen=True)
@@ -93,34 +106,248 @@ def _coerce_provenance(row: object) -> ProvenanceV2:
     )
 
 
+# get_py_driver / get_ts_driver already build one driver per process (lru_cache);
+# this only caches the per-language dispatch so each file costs one dict lookup.
+_DRIVERS: Dict[Language, object] = {}
+
+
 def _select_driver(lang: Language):
-    if lang == Language.PY:
-        return PythonDriver()
-    if lang in (Language.JS, Language.TS, Language.JSX, Language.TSX):
-        return TsDriver(lang)
-    return None
+    driver = _DRIVERS.get(lang)
+    if driver is None:
+        if lang == Language.PY:
+            driver = get_py_driver()
+        elif lang in (Language.JS, Language.TS, Language.JSX, Language.TSX):
+            driver = get_ts_driver(lang)
+        else:
+            return None
+        _DRIVERS[lang] = driver
+    return driver
 
 
-def _parse_file(file: FileMeta):
+def _parse_file(file: FileMeta, event_cache: Optional[EventCache] = None):
     driver = _select_driver(file.lang)
     if driver is None:
         return None, f"no-driver:{file.lang}"
     try:
+        if event_cache is not None:
+            return event_cache.get_or_parse(file, driver), None
         ps = driver.parse(file)
         return ps, None
     except Exception as e:
         return None, f"parse-exception:{type(e).__name__}:{e}"
 
 
+@dataclass(slots=True)
+class _FileResult:
+    """Everything one file contributes to the run (rows per store table + anomalies)."""
+    parsed: bool = False
+    source_bytes: int = 0
+    node_edge: List[Tuple[str, object]] = field(default_factory=list)
+    cfg: List[Tuple[str, object]] = field(default_factory=list)
+    dfg: List[Tuple[str, object]] = field(default_factory=list)
+    symbols: List[Tuple[str, object]] = field(default_factory=list)
+    effects: List[Tuple[str, object]] = field(default_factory=list)
+    anomalies: List[Anomaly] = field(default_factory=list)
+
+
+def _process_file(fm: FileMeta, cfg: Step1Config, event_cache: Optional[EventCache] = None) -> _FileResult:
+    """
+    Parse one file and run the enabled passes over its events. Pure with respect to
+    the store, so it can run in a worker process; the caller writes the result.
+    """
+    res = _FileResult()
+
+    # Binary files are filtered out by build_ucg_for_files before they get here.
+    if fm.size_bytes is not None and fm.size_bytes > cfg.max_file_bytes:
+        res.anomalies.append(Anomaly(path=fm.path, blob_sha=fm.blob_sha, kind=AnomalyKind.MEMORY_LIMIT, severity=Severity.ERROR, detail=f"file-too-large:{fm.size_bytes}"))
+        return res
+
+    ps, perr = _parse_file(fm, event_cache)
+    if ps is None or not ps.ok:
+        res.anomalies.append(Anomaly(path=fm.path, blob_sha=fm.blob_sha, kind=AnomalyKind.PARSE_FAILED, severity=Severity.ERROR, detail=f"{perr or ps.error} path={fm.path} lang={fm.lang}"))
+        return res
+
+    res.parsed = True
+    res.source_bytes = fm.size_bytes or 0
+
+    driver_info: Optional[DriverInfo] = getattr(ps, "driver", None)
+    try:
+        event_list: List[CstEvent] = list(ps.events) if ps.events is not None else []
+    except Exception as e:
+        res.anomalies.append(Anomaly(path=fm.path, blob_sha=fm.blob_sha, kind=AnomalyKind.UNKNOWN, severity=Severity.ERROR, detail=f"event-materialization-exception:{type(e).__name__}:{e}"))
+        return res
+
+    if not event_list:
+        return res
+
+    try:
+        from .symbols import build_symbols
+    except ImportError:
+        build_symbols = None
+
+    # Anomalies raised by the passes themselves; stage failures are collected after them
+    sink = AnomalySink()
+    file_anomalies: List[Anomaly] = []
+
+    def run(stage: str, out: list, make_rows: Callable[[], Iterable]) -> None:
+        _run_stage(stage, out, make_rows, fm, file_anomalies)
+
+    run("normalize", res.node_edge, lambda: _node_edge_rows(normalize_parse_stream(fm, driver_info, event_list, sink)))
+    if cfg.enable_cfg:
+        run("cfg", res.cfg, lambda: build_cfg(fm, driver_info, event_list, sink))
+    alias_hints: list = []
+    if cfg.enable_dfg:
+        run("dfg", res.dfg, lambda: _split_alias_hints(build_dfg(fm, driver_info, event_list, sink), alias_hints))
+    if cfg.enable_symbols and build_symbols is not None:
+        run("symbols", res.symbols, lambda: build_symbols(fm, driver_info, event_list, sink, alias_hints=alias_hints))
+    if cfg.enable_effects:
+        run("effects", res.effects, lambda: build_effects(fm, driver_info, event_list, sink))
+
+    # Through the sink so stage failures are stamped here, at processing time
+    sink.emit_many(file_anomalies)
+    res.anomalies = sink.drain()
+    return res
+
+
+def _run_stage(stage: str, out: list, make_rows: Callable[[], Iterable], fm: FileMeta, file_anomalies: List[Anomaly]) -> None:
+    """
+    Drain one pass into `out`. A pass that raises keeps the rows it produced before
+    failing and leaves a `<stage>-exception` anomaly; later passes still run.
+    """
+    try:
+        out.extend(make_rows())  # list.extend drains the generator in C
+    except Exception as e:
+        file_anomalies.append(Anomaly(path=fm.path, blob_sha=fm.blob_sha, kind=AnomalyKind.UNKNOWN, severity=Severity.ERROR, detail=f"{stage}-exception:{type(e).__name__}:{e}"))
+
+
+def _node_edge_rows(items: Iterable[Tuple[str, object]]) -> Iterator[Tuple[str, object]]:
+    return (item for item in items if item[0] in ("node", "edge"))
+
+
+def _split_alias_hints(items: Iterable[Tuple[str, object]], alias_hints: list) -> Iterator[Tuple[str, object]]:
+    # DFG alias hints feed the symbols pass instead of the store
+    for item_kind, item_data in items:
+        if item_kind == "alias_hint":
+            alias_hints.append(item_data)
+        else:
+            yield (item_kind, item_data)
+
+
+def _process_chunk(chunk: List[FileMeta], cfg: Step1Config) -> List[_FileResult]:
+    return [_process_file(fm, cfg) for fm in chunk]
+
+
+def _map_bounded(executor: ProcessPoolExecutor, files: Iterator[FileMeta], cfg: Step1Config, window: int) -> Iterator[_FileResult]:
+    # Executor.map submits the whole input up front; keep at most `window` chunks in
+    # flight instead so a streamed file list is never materialised.
+    pending: deque[Future] = deque()
+    size = max(1, cfg.parallel_chunk_files)
+    while True:
+        chunk = list(islice(files, size))
+        if chunk:
+            pending.append(executor.submit(_process_chunk, chunk, cfg))
+        if pending and (len(pending) >= window or not chunk):
+            yield from pending.popleft().result()
+        elif not chunk:
+            return
+
+
+_FILE_ORDER = attrgetter("path", "blob_sha")
+
+# Store batches queued for the writer thread before the producer blocks.
+_WRITER_QUEUE_BATCHES = 4
+
+
+def _sorted_files(files: Iterable[FileMeta]) -> List[FileMeta]:
+    # attrgetter builds the key tuples in C; blob_sha is a str for every discovered
+    # file, and a None only matters when two entries share a path.
+    files = list(files)
+    try:
+        return sorted(files, key=_FILE_ORDER)
+    except TypeError:
+        return sorted(files, key=lambda f: (f.path, f.blob_sha or ""))
+
+
+class _StoreWriter:
+    """
+    Runs bound UcgStore appends/flushes on one background thread, so Arrow conversion and
+    Parquet encoding overlap with the parse/analysis loop. submit() hands over
+    ownership of its batch; the bounded queue applies back-pressure when the store
+    falls behind. The first store error stops further writes and is re-raised by
+    submit() or raise_if_failed().
+    """
+
+    def __init__(self, max_pending: int = _WRITER_QUEUE_BATCHES) -> None:
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="ucg-store-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, op: Callable, batch: Optional[list] = None) -> None:
+        self.raise_if_failed()
+        self._queue.put((op, batch))
+
+    def join(self) -> None:
+        self._queue.put((None, None))
+        self._thread.join()
+
+    def raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def _run(self) -> None:
+        while True:
+            op, batch = self._queue.get()
+            if op is None:
+                return
+            if self._error is not None:
+                continue  # keep draining so submit() never blocks on a dead writer
+            try:
+                if batch is None:
+                    op()
+                else:
+                    op(batch)
+            except BaseException as e:
+                self._error = e
+
+
+def _in_order(files: Iterable[FileMeta]) -> Iterator[FileMeta]:
+    prev: Optional[Tuple[str, str]] = None
+    for fm in files:
+        key = (fm.path, fm.blob_sha or "")
+        if prev is not None and key < prev:
+            raise ValueError(f"files are not sorted: {fm.path!r} after {prev[0]!r}")
+        prev = key
+        yield fm
+
+
 def build_ucg_for_files(
     files: Iterable[FileMeta],
     out_dir: Path,
     *,
     cfg: Optional[Step1Config] = None,
     run_metadata: Optional[Dict] = None,
+    event_cache: Optional[EventCache] = None,
+    presorted: bool = False,
 ) -> Step1Summary:
+    """
+    Run Step 1 over `files` and publish the UCG under `out_dir`.
+
+    Files are parsed and analysed in `cfg.workers` processes when there are at least
+    `cfg.parallel_min_files` of them; the store is written from this process only, in
+    sorted file order, so the output does not depend on the worker count.
+
+    Pass an EventCache to keep each file's parsed events around after the run, so
+    later passes over the same files (QA checks, debug tooling) reuse the parse.
+    The cache lives in this process, so passing one runs the files sequentially.
+
+    With `presorted=True`, `files` must already be ordered by (path, blob_sha), as
+    iter_discovered_files yields them; it is then consumed as a stream, so parsing
+    starts with the first file and the file list is never held in memory.
+    A ValueError is raised if an out-of-order file turns up.
+    """
     cfg = cfg or Step1Config()
-    start = time.time()
+    start_ns = time.perf_counter_ns()
 
     store = UcgStore(
         out_dir,
@@ -128,17 +355,28 @@ def build_ucg_for_files(
         roll_rows=cfg.roll_rows,
         max_bytes=cfg.max_store_bytes,
     )
-    sink = AnomalySink()
-
     files_total = 0
     files_parsed = 0
 
-    try:
-        from .symbols import build_symbols
-    except ImportError:
-        build_symbols = None
+    if presorted:
+        files_iter: Iterator[FileMeta] = _in_order(files)
+    else:
+        files_iter = iter(_sorted_files(files))
+
+    # Binary files never reach the passes (or a worker): count them per extension here
+    # and report one anomaly per extension after the run. Discovery already records
+    # each one individually.
+    binary_skips: Dict[str, int] = {}
+
+    def text_files(it: Iterator[FileMeta]) -> Iterator[FileMeta]:
+        for fm in it:
+            if fm.is_text:
+                yield fm
+            else:
+                ext = os.path.splitext(fm.path)[1].lower()
+                binary_skips[ext] = binary_skips.get(ext, 0) + 1
 
-    files_sorted = sorted(list(files), key=lambda f: (f.path, f.blob_sha or ""))
+    files_iter = text_files(files_iter)
 
     node_edge_buf: List[Tuple[str, object]] = []
     cfg_buf: List[Tuple[str, object]] = []
@@ -147,130 +385,105 @@ def build_ucg_for_files(
     eff_buf: List[Tuple[str, object]] = []
 
     def flush_buffers(force: bool = False) -> None:
+        # Hand each full buffer to the writer and start a fresh list (no copy).
+        nonlocal node_edge_buf, cfg_buf, dfg_buf, sym_buf, eff_buf
         if force or len(node_edge_buf) >= cfg.node_edge_batch:
             if node_edge_buf:
-                store.append(node_edge_buf)
-                node_edge_buf.clear()
+                writer.submit(store.append, node_edge_buf)
+                node_edge_buf = []
         if force or len(cfg_buf) >= cfg.cfg_batch:
             if cfg_buf:
-                store.append_cfg(cfg_buf)
-                cfg_buf.clear()
+                writer.submit(store.append_cfg, cfg_buf)
+                cfg_buf = []
         if force or len(dfg_buf) >= cfg.dfg_batch:
             if dfg_buf:
-                store.append_dfg(dfg_buf)
-                dfg_buf.clear()
+                writer.submit(store.append_dfg, dfg_buf)
+                dfg_buf = []
         if force or len(sym_buf) >= cfg.sym_batch:
             if sym_buf:
-                store.append_symbols(sym_buf)
-                sym_buf.clear()
+                writer.submit(store.append_symbols, sym_buf)
+                sym_buf = []
         if force or len(eff_buf) >= cfg.eff_batch:
-            if eff_buf and hasattr(store, "append_effects"):
-                store.append_effects(eff_buf)
-                eff_buf.clear()
-
-    for i, fm in enumerate(files_sorted, start=1):
-        files_total += 1
-
-        if not fm.is_text:
-            sink.emit(Anomaly(path=fm.path, blob_sha=fm.blob_sha, kind=AnomalyKind.BINARY_FILE, severity=Severity.INFO, detail="binary-or-nontext"))
-            continue
-        if fm.size_bytes is not None and fm.size_bytes > cfg.max_file_bytes:
-            sink.emit(Anomaly(path=fm.path, blob_sha=fm.blob_sha, kind=AnomalyKind.MEMORY_LIMIT, severity=Severity.ERROR, detail=f"file-too-large:{fm.size_bytes}"))
-            continue
-
-        ps, perr = _parse_file(fm)
-        if ps is None or not ps.ok:
-            sink.emit(Anomaly(path=fm.path, blob_sha=fm.blob_sha, kind=AnomalyKind.PARSE_FAILED, severity=Severity.ERROR, detail=f"{perr or ps.error} path={fm.path} lang={fm.lang}"))
-            continue
-
-        files_parsed += 1
-
-        driver_info: Optional[DriverInfo] = getattr(ps, "driver", None)
-        try:
-            event_list: List[CstEvent] = list(ps.events) if ps.events is not None else []
-        except Exception as e:
-            sink.emit(Anomaly(path=fm.path, blob_sha=fm.blob_sha, kind=AnomalyKind.UNKNOWN, severity=Severity.ERROR, detail=f"event-materialization-exception:{type(e).__name__}:{e}"))
-            continue
-        
-        if not event_list:
-            continue
-
-        try:
-            for item in normalize_parse_stream(fm, driver_info, event_list, sink):
-                if item[0] in ("node", "edge"):
-                    node_edge_buf.append(item)
-            if len(node_edge_buf) >= cfg.node_edge_batch:
-                flush_buffers()
-        except Exception as e:
-            sink.emit(Anomaly(path=fm.path, blob_sha=fm.blob_sha, kind=AnomalyKind.UNKNOWN, severity=Severity.ERROR, detail=f"normalize-exception:{type(e).__name__}:{e}"))
-
-        if cfg.enable_cfg:
-            try:
-                for item in build_cfg(fm, driver_info, event_list, sink):
-                    cfg_buf.append(item)
-                if len(cfg_buf) >= cfg.cfg_batch:
-                    flush_buffers()
-            except Exception as e:
-                sink.emit(Anomaly(path=fm.path, blob_sha=fm.blob_sha, kind=AnomalyKind.UNKNOWN, severity=Severity.ERROR, detail=f"cfg-exception:{type(e).__name__}:{e}"))
-
-        alias_hints = []
-        if cfg.enable_dfg:
-            try:
-                for item_kind, item_data in build_dfg(fm, driver_info, event_list, sink):
-                    if item_kind == "alias_hint":
-                        alias_hints.append(item_data)
-                    else:
-                        dfg_buf.append((item_kind, item_data))
-                if len(dfg_buf) >= cfg.dfg_batch:
-                    flush_buffers()
-            except Exception as e:
-                sink.emit(Anomaly(path=fm.path, blob_sha=fm.blob_sha, kind=AnomalyKind.UNKNOWN, severity=Severity.ERROR, detail=f"dfg-exception:{type(e).__name__}:{e}"))
-
-        if cfg.enable_symbols and build_symbols is not None:
-            try:
-                for item in build_symbols(fm, driver_info, event_list, sink, alias_hints=alias_hints):
-                    sym_buf.append(item)
-                if len(sym_buf) >= cfg.sym_batch:
-                    flush_buffers()
-            except Exception as e:
-                sink.emit(Anomaly(path=fm.path, blob_sha=fm.blob_sha, kind=AnomalyKind.UNKNOWN, severity=Severity.ERROR, detail=f"symbols-exception:{type(e).__name__}:{e}"))
-
-        if cfg.enable_effects:
-            try:
-                for item in build_effects(fm, driver_info, event_list, sink):
-                    eff_buf.append(item)
-                if len(eff_buf) >= cfg.eff_batch:
-                    flush_buffers()
-            except Exception as e:
-                sink.emit(Anomaly(path=fm.path, blob_sha=fm.blob_sha, kind=AnomalyKind.UNKNOWN, severity=Severity.ERROR, detail=f"effects-exception:{type(e).__name__}:{e}"))
-
-        if (i % max(1, cfg.flush_every_n_files)) == 0:
-            flush_buffers(force=True)
-            store.flush()
-            if sink._buffer:
-                store.append_anomalies(sink.drain())
-
-    flush_buffers(force=True)
-    store.flush()
-    if sink._buffer:
-        store.append_anomalies(sink.drain())
+            if eff_buf:
+                writer.submit(store.append_effects, eff_buf)
+                eff_buf = []
+
+    workers = cfg.workers or os.cpu_count() or 1
+    executor: Optional[ProcessPoolExecutor] = None
+    parallel = event_cache is None and workers > 1
+    # Peek far enough into the stream to know whether the pool is worth starting.
+    head = list(islice(files_iter, max(1, cfg.parallel_min_files))) if parallel else []
+    files_iter = chain(head, files_iter)
+    if parallel and len(head) >= max(1, cfg.parallel_min_files):
+        executor = ProcessPoolExecutor(max_workers=workers)
+        # With fork, the first submit starts every worker. Do it before the writer
+        # thread exists: forking a process with live threads can deadlock a child on
+        # a lock held at fork time.
+        executor.submit(int).result()
+        results = _map_bounded(executor, files_iter, cfg, window=workers * 2)
+    else:
+        results = (_process_file(fm, cfg, event_cache) for fm in files_iter)
+
+    # From here on only the writer thread touches the store, until writer.join().
+    writer = _StoreWriter()
+    sink = AnomalySink(max_buffered=cfg.max_buffered_anomalies, on_full=partial(writer.submit, store.append_anomalies))
+
+    bytes_since_flush = 0
+    try:
+        for res in results:
+            files_total += 1
+            if res.parsed:
+                files_parsed += 1
+                bytes_since_flush += res.source_bytes
+
+            # Rows reach the store in batches of at least cfg.*_batch items
+            node_edge_buf.extend(res.node_edge)
+            cfg_buf.extend(res.cfg)
+            dfg_buf.extend(res.dfg)
+            sym_buf.extend(res.symbols)
+            eff_buf.extend(res.effects)
+            flush_buffers()
+
+            if res.anomalies:
+                sink.emit_many(res.anomalies)
+
+            # Flush by source volume rather than file count, so a few huge files
+            # cannot pile up in memory and many tiny ones do not roll tiny row groups.
+            if bytes_since_flush >= cfg.flush_bytes:
+                flush_buffers(force=True)
+                writer.submit(store.flush)
+                bytes_since_flush = 0
+
+        for ext, count in sorted(binary_skips.items()):
+            files_total += count
+            sink.emit(Anomaly(path=f"*{ext}", blob_sha=None, kind=AnomalyKind.BINARY_FILE, severity=Severity.INFO, detail=f"binary-or-nontext:{count}-files"))
+
+        flush_buffers(force=True)
+        writer.submit(store.append_anomalies, sink.drain())
+        writer.submit(store.flush)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        writer.join()
+    writer.raise_if_failed()
 
     store.finalize(receipt={"run_meta": run_metadata or {}, "step": "step1_ucg"})
 
-    wall_ms = int((time.time() - start) * 1000)
+    wall_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
 
+    c = store.counters
     summary = Step1Summary(
         files_total=files_total,
         files_parsed=files_parsed,
-        nodes_rows=getattr(store, "_node_rows_total", 0),
-        edges_rows=getattr(store, "_edge_rows_total", 0),
-        cfg_blocks_rows=getattr(store, "_cfg_block_rows_total", 0),
-        cfg_edges_rows=getattr(store, "_cfg_edge_rows_total", 0),
-        dfg_nodes_rows=getattr(store, "_dfg_node_rows_total", 0),
-        dfg_edges_rows=getattr(store, "_dfg_edge_rows_total", 0),
-        symbols_rows=getattr(store, "_symbol_rows_total", 0),
-        aliases_rows=getattr(store, "_alias_rows_total", 0),
-        effects_rows=getattr(store, "_effect_rows_total", 0),
+        nodes_rows=c.nodes,
+        edges_rows=c.edges,
+        cfg_blocks_rows=c.cfg_blocks,
+        cfg_edges_rows=c.cfg_edges,
+        dfg_nodes_rows=c.dfg_nodes,
+        dfg_edges_rows=c.dfg_edges,
+        symbols_rows=c.symbols,
+        aliases_rows=c.aliases,
+        effects_rows=c.effects,
         anomalies=sink.counters().get("total", 0),
         wall_ms=wall_ms,
     )
@@ -5,6 +5,7 @@ import hashlib
 import json
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from typing import Dict, Iterator, List, Optional, Tuple
 
 from .discovery import Anomaly, AnomalyKind, AnomalySink, FileMeta, Language, Severity
@@ -74,15 +75,27 @@ class CfgConfig:
 # ==============================================================================
 
 def _stable_id(*parts: str) -> str:
-    h = hashlib.blake2b(digest_size=20)
-    for p in parts:
-        h.update(b"\x1f")
-        h.update(p.encode("utf-8", "ignore"))
-    return h.hexdigest()
+    # Same bytes as updating with b"\x1f" + part for each part, in one encode + hash call
+    data = "\x1f" + "\x1f".join(parts) if parts else ""
+    return hashlib.blake2b(data.encode("utf-8", "ignore"), digest_size=20).hexdigest()
+
+
+# json.dumps() builds a new JSONEncoder whenever it gets non-default options; reuse one.
+_COMPACT_ENCODER = json.JSONEncoder(separators=(",", ":"), sort_keys=True)
+
+
+@lru_cache(maxsize=4096)
+def _compact_str_items(items: Tuple[Tuple[str, str], ...]) -> str:
+    return _COMPACT_ENCODER.encode(dict(items))
 
 
 def _compact(obj: dict) -> str:
-    return json.dumps(obj, separators=(",", ":"), sort_keys=True)
+    # attrs are mostly a few str->str pairs from a small vocabulary (node types, arm
+    # labels): serve those from the cache so repeats share one string. Only all-str
+    # values are cached, since ("k", 1) == ("k", True) would alias 1 and true.
+    if all(type(v) is str for v in obj.values()):
+        return _compact_str_items(tuple(obj.items()))
+    return _COMPACT_ENCODER.encode(obj)
 
 
 # ==============================================================================
@@ -90,39 +103,35 @@ def _compact(obj: dict) -> str:
 # ==============================================================================
 
 class _Adapter:
+    """libcst (Python) node types; `_JsAdapter` overrides them for tree-sitter JS/TS."""
+
+    function_nodes = frozenset({"FunctionDef", "AsyncFunctionDef", "Lambda"})
+    if_nodes = frozenset({"If"})
+    while_nodes = frozenset({"While"})
+    for_nodes = frozenset({"For"})
+    try_nodes = frozenset({"Try"})
+    return_nodes = frozenset({"Return"})
+    raise_nodes = frozenset({"Raise"})
+    break_nodes = frozenset({"Break"})
+    continue_nodes = frozenset({"Continue"})
+    switch_nodes = frozenset()  # N/A
+    catch_nodes = frozenset({"ExceptHandler"})  # appears as child types under Try in CST streams
+    finally_nodes = frozenset({"Finally"})
+
     def __init__(self, lang: Language) -> None:
         self.lang = lang
-        self._init_sets()
-
-    def _init_sets(self) -> None:
-        if self.lang == Language.PY:
-            # libcst types
-            self.function_nodes = {"FunctionDef", "AsyncFunctionDef", "Lambda"}
-            self.if_nodes = {"If"}
-            self.while_nodes = {"While"}
-            self.for_nodes = {"For"}
-            self.try_nodes = {"Try"}
-            self.return_nodes = {"Return"}
-            self.raise_nodes = {"Raise"}
-            self.break_nodes = {"Break"}
-            self.continue_nodes = {"Continue"}
-            self.switch_nodes = set()  # N/A
-            self.catch_nodes = {"ExceptHandler"}  # appears as child types under Try in CST streams
-            self.finally_nodes = {"Finally"}
-        else:
-            # Tree-sitter JS/TS
-            self.function_nodes = {"function_declaration", "function_expression", "method_definition", "arrow_function"}
-            self.if_nodes = {"if_statement", "conditional_expression"}  # ternary treated as predicate→body fallthrough
-            self.while_nodes = {"while_statement", "do_statement"}
-            self.for_nodes = {"for_statement", "for_in_statement", "for_of_statement"}
-            self.try_nodes = {"try_statement"}
-            self.return_nodes = {"return_statement"}
-            self.raise_nodes = {"throw_statement"}
-            self.break_nodes = {"break_statement"}
-            self.continue_nodes = {"continue_statement"}
-            self.switch_nodes = {"switch_statement"}
-            self.catch_nodes = {"catch_clause"}
-            self.finally_nodes = {"finally_clause"}
+        # node type -> construct kind; the walker does one dict lookup per event
+        # instead of a chain of is_* calls (the sets are disjoint per language).
+        self._kind_of: Dict[str, str] = {
+            t: kind
+            for kind, nodes in (
+                ("function", self.function_nodes), ("if", self.if_nodes), ("while", self.while_nodes),
+                ("for", self.for_nodes), ("try", self.try_nodes), ("return", self.return_nodes),
+                ("throw", self.raise_nodes), ("break", self.break_nodes), ("continue", self.continue_nodes),
+                ("switch", self.switch_nodes), ("catch", self.catch_nodes), ("finally", self.finally_nodes),
+            )
+            for t in nodes
+        }
 
     # classification
     def is_function(self, t: str) -> bool: return t in self.function_nodes
@@ -139,6 +148,27 @@ class _Adapter:
     def is_finally(self, t: str) -> bool: return t in self.finally_nodes
 
 
+class _JsAdapter(_Adapter):
+    # Tree-sitter JS/TS
+    function_nodes = frozenset({"function_declaration", "function_expression", "method_definition", "arrow_function"})
+    if_nodes = frozenset({"if_statement", "conditional_expression"})  # ternary treated as predicate→body fallthrough
+    while_nodes = frozenset({"while_statement", "do_statement"})
+    for_nodes = frozenset({"for_statement", "for_in_statement", "for_of_statement"})
+    try_nodes = frozenset({"try_statement"})
+    return_nodes = frozenset({"return_statement"})
+    raise_nodes = frozenset({"throw_statement"})
+    break_nodes = frozenset({"break_statement"})
+    continue_nodes = frozenset({"continue_statement"})
+    switch_nodes = frozenset({"switch_statement"})
+    catch_nodes = frozenset({"catch_clause"})
+    finally_nodes = frozenset({"finally_clause"})
+
+
+@lru_cache(maxsize=None)
+def _adapter_for(lang: Language) -> _Adapter:
+    return _Adapter(lang) if lang == Language.PY else _JsAdapter(lang)
+
+
 # ==============================================================================
 # Builder core
 # ==============================================================================
@@ -172,11 +202,12 @@ class CfgBuilder:
     # -------- public API
 
     def build(self, fm: FileMeta, info: Optional[DriverInfo], events: List[CstEvent], sink: AnomalySink) -> Iterator[Tuple[str, object]]:
-        adapter = _Adapter(fm.lang)
+        adapter = _adapter_for(fm.lang)
         if not events:
             return
 
         func_stack: List[_FuncState] = []
+        kind_of = adapter._kind_of.get
 
         def prov(ev: CstEvent) -> ProvenanceV2:
             return build_provenance_from_event(fm, info, ev)
@@ -215,8 +246,9 @@ class CfgBuilder:
             )
 
         for ev in events:
+            kind = kind_of(ev.type)
             # Open a function on ENTER
-            if ev.kind == CstEventKind.ENTER and adapter.is_function(ev.type):
+            if ev.kind == CstEventKind.ENTER and kind == "function":
                 # Function identity: start-based for stability
                 func_id = _stable_id(self.cfg.id_salt, "func", fm.path, fm.blob_sha, str(ev.byte_start))
                 # Create ENTRY and first BODY
@@ -261,7 +293,7 @@ class CfgBuilder:
 
             if ev.kind == CstEventKind.ENTER:
                 # Branching / loop / try predicates
-                if _is_predicate(adapter, ev.type):
+                if kind in _PREDICATE_KINDS:
                     b_pred = block_row(func, BlockKind.PREDICATE, ev, {"type": ev.type})
                     # connect current → predicate
                     if func.current_block_id != b_pred.id:
@@ -271,7 +303,7 @@ class CfgBuilder:
                     func.ctrl_stack.append((ev.type, b_pred.id))
                     func.had_precision = True
                 # Return/throw immediately ends current block and connects to EXIT
-                elif adapter.is_return(ev.type):
+                elif kind == "return":
                     b_body = block_row(func, BlockKind.BODY, ev, {"type": ev.type})
                     yield ("cfg_edge", edge_row(func, CfgEdgeKind.NEXT, func.current_block_id, b_body.id, ev, {}))
                     yield ("cfg_block", b_body)
@@ -281,7 +313,7 @@ class CfgBuilder:
                     yield ("cfg_edge", edge_row(func, CfgEdgeKind.RETURN, b_body.id, b_exit.id, ev, {}))
                     func.current_block_id = b_exit.id
                     func.had_precision = True
-                elif adapter.is_throw(ev.type):
+                elif kind == "throw":
                     b_body = block_row(func, BlockKind.BODY, ev, {"type": ev.type})
                     yield ("cfg_edge", edge_row(func, CfgEdgeKind.NEXT, func.current_block_id, b_body.id, ev, {}))
                     yield ("cfg_block", b_body)
@@ -297,7 +329,7 @@ class CfgBuilder:
 
             elif ev.kind == CstEventKind.EXIT:
                 # Close function
-                if adapter.is_function(ev.type):
+                if kind == "function":
                     # ensure EXIT exists
                     b_exit = BlockRow(
                         id=_stable_id(self.cfg.id_salt, "block", fm.path, fm.blob_sha, func.func_id, "exit"),
@@ -332,7 +364,7 @@ class CfgBuilder:
                     if _matches_close(adapter, top_type, ev.type):
                         func.ctrl_stack.pop()
                         # create two BODY blocks for true/false (or body/else) when applicable
-                        if _has_dual_outcomes(adapter, top_type):
+                        if kind_of(top_type) in _DUAL_OUTCOME_KINDS:
                             b_true = BlockRow(
                                 id=_stable_id(self.cfg.id_salt, "block", fm.path, fm.blob_sha, func.func_id, f"true@{pred_id}@{ev.byte_end}"),
                                 func_id=func.func_id, kind=BlockKind.BODY, index=func.next_index,
@@ -381,7 +413,7 @@ class CfgBuilder:
                             func.current_block_id = b_after.id
 
                 # Try/catch/finally coarse modeling
-                if self.cfg.enable_try_edges and (_is_try_related(adapter, ev.type)):
+                if self.cfg.enable_try_edges and kind in _TRY_KINDS:
                     # create a handler block and exception edges from current
                     b_handler = BlockRow(
                         id=_stable_id(self.cfg.id_salt, "block", fm.path, fm.blob_sha, func.func_id, f"handler@{ev.byte_end}"),
@@ -437,20 +469,15 @@ class CfgBuilder:
 # Helpers for adapter interplay
 # ==============================================================================
 
-def _is_predicate(adapter: _Adapter, t: str) -> bool:
-    return adapter.is_if(t) or adapter.is_while(t) or adapter.is_for(t) or adapter.is_switch(t)
-
-def _has_dual_outcomes(adapter: _Adapter, t: str) -> bool:
-    # if/switch → true/false or case/default; while/for → body & after (single predicate result + loop backedge)
-    return adapter.is_if(t) or adapter.is_switch(t)
+_PREDICATE_KINDS = frozenset({"if", "while", "for", "switch"})
+# if/switch → true/false or case/default; while/for → body & after (single predicate result + loop backedge)
+_DUAL_OUTCOME_KINDS = frozenset({"if", "switch"})
+_TRY_KINDS = frozenset({"try", "catch", "finally"})
 
 def _matches_close(adapter: _Adapter, open_t: str, close_t: str) -> bool:
     # We don’t get explicit "end_if"; we use EXIT of the same node type
     return open_t == close_t
 
-def _is_try_related(adapter: _Adapter, t: str) -> bool:
-    return adapter.is_try(t) or adapter.is_catch(t) or adapter.is_finally(t)
-
 
 # ==============================================================================
 # Public convenience
@@ -1,10 +1,14 @@
 # src/provis/ucg/dfg.py
 from __future__ import annotations
 
+import bisect
 import hashlib
 import json
+import mmap
+import re
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from typing import Dict, Iterator, List, Optional, Tuple
 
 from .discovery import Anomaly, AnomalyKind, AnomalySink, FileMeta, Language, Severity
@@ -26,7 +30,7 @@ class DfgEdgeKind(str, Enum):
     CONST_PART = "const_part"
     ARG_TO_PARAM = "arg_to_param"
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DfgNodeRow:
     id: str
     func_id: str
@@ -38,7 +42,7 @@ class DfgNodeRow:
     attrs_json: str
     prov: ProvenanceV2
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DfgEdgeRow:
     id: str
     func_id: str
@@ -50,6 +54,22 @@ class DfgEdgeRow:
     attrs_json: str
     prov: ProvenanceV2
 
+@dataclass(frozen=True, slots=True)
+class AliasHint:
+    """`lhs = rhs` name-to-name assignment seen by the DFG, consumed by build_symbols."""
+    lhs_name: str
+    rhs_name: str
+    scope_id: str
+    byte_start: int = 0
+    byte_end: int = 0
+
+    def to_json(self) -> str:
+        """Compact, key-sorted JSON for reports and cross-run diffing."""
+        return _compact({
+            "lhs_name": self.lhs_name, "rhs_name": self.rhs_name, "scope_id": self.scope_id,
+            "byte_start": self.byte_start, "byte_end": self.byte_end,
+        })
+
 # ==============================================================================
 # Config & State Management Classes
 # ==============================================================================
@@ -64,14 +84,33 @@ class DfgConfig:
     max_literal_span: int = 8192
 
 def _stable_id(*parts: str) -> str:
-    h = hashlib.blake2b(digest_size=20)
-    for p in parts:
-        h.update(b"\x1f")
-        h.update(p.encode("utf-8", "ignore"))
-    return h.hexdigest()
+    # Same bytes as updating with b"\x1f" + part for each part, in one encode + hash call
+    data = "\x1f" + "\x1f".join(parts) if parts else ""
+    return hashlib.blake2b(data.encode("utf-8", "ignore"), digest_size=20).hexdigest()
+
+# json.dumps() builds a new JSONEncoder whenever it gets non-default options; reuse one.
+_COMPACT_ENCODER = json.JSONEncoder(separators=(",", ":"), sort_keys=True)
+
+
+@lru_cache(maxsize=4096)
+def _compact_str_items(items: Tuple[Tuple[str, str], ...]) -> str:
+    return _COMPACT_ENCODER.encode(dict(items))
+
 
 def _compact(obj: dict) -> str:
-    return json.dumps(obj, separators=(",", ":"), sort_keys=True)
+    # attrs are mostly a few str->str pairs from a small vocabulary (node types, arm
+    # labels): serve those from the cache so repeats share one string. Only all-str
+    # values are cached, since ("k", 1) == ("k", True) would alias 1 and true.
+    if all(type(v) is str for v in obj.values()):
+        return _compact_str_items(tuple(obj.items()))
+    return _COMPACT_ENCODER.encode(obj)
+
+# '=' that can be an assignment (plain or the tail of an augmented operator), not part
+# of a comparison (==, !=, <=, >=) or a JS arrow (=>). A '<'/'>' before it is a
+# comparison only when single: '<<=', '>>=' and '>>>=' are augmented assignments.
+# Matches inside strings, keyword arguments or walrus expressions are candidates only;
+# the DFG walk skips any that lie inside a nested node of the assignment.
+_ASSIGN_OP_RE = re.compile(rb"(?:(?<![=!<>])|(?<=<<)|(?<=>>))=(?![=>])")
 
 @dataclass
 class _VariableState:
@@ -103,27 +142,18 @@ class Scope:
 # Language adapters
 # ==============================================================================
 class _Adapter:
+    """libcst (Python) node types; `_JsAdapter` overrides them for tree-sitter JS/TS."""
+
+    function_nodes = frozenset({"FunctionDef", "AsyncFunctionDef", "Lambda"})
+    param_list_nodes = frozenset({"Parameters", "LambdaParameters"})
+    assign_nodes = frozenset({"Assign", "AnnAssign", "AugAssign"})
+    assign_target_nodes = frozenset({"AssignTarget", "Name", "Attribute"})
+    identifier_tokens = frozenset({"Name", "Attribute"})
+    param_token_types = frozenset({"Name"})
+    assignment_operators = frozenset({"=", "+=", "-=", "*=", "/=", "%=", "**=", "//=", "|=", "&=", "^=", ">>=", "<<="})
+
     def __init__(self, lang: Language) -> None:
         self.lang = lang
-        self._init_sets()
-
-    def _init_sets(self) -> None:
-        if self.lang == Language.PY:
-            self.function_nodes = {"FunctionDef", "AsyncFunctionDef", "Lambda"}
-            self.param_list_nodes = {"Parameters", "LambdaParameters"}
-            self.assign_nodes = {"Assign", "AnnAssign", "AugAssign"}
-            self.assign_target_nodes = {"AssignTarget", "Name", "Attribute"}
-            self.identifier_tokens = {"Name", "Attribute"}
-            self.param_token_types = {"Name"}
-            self.assignment_operators = {"=", "+=", "-=", "*=", "/=", "%=", "**=", "//=", "|=", "&=", "^=", ">>=", "<<="}
-        else: # JS/TS
-            self.function_nodes = {"function_declaration", "function_expression", "method_definition", "arrow_function"}
-            self.param_list_nodes = {"formal_parameters"}
-            self.assign_nodes = {"variable_declarator", "assignment_expression"}
-            self.assign_target_nodes = {"identifier", "property_identifier", "shorthand_property_identifier", "array_pattern", "object_pattern"}
-            self.identifier_tokens = {"identifier", "property_identifier", "shorthand_property_identifier", "private_property_identifier"}
-            self.param_token_types = {"identifier"}
-            self.assignment_operators = {"=", "+=", "-=", "*=", "/=", "%=", "**=", "|=", "&=", "^=", ">>=", "<<="}
 
     def is_function(self, t: str) -> bool: return t in self.function_nodes
     def is_param_list(self, t: str) -> bool: return t in self.param_list_nodes
@@ -133,6 +163,21 @@ class _Adapter:
     def is_param_token(self, t: str) -> bool: return t in self.param_token_types
     def is_assignment_operator(self, text: str) -> bool: return text in self.assignment_operators
 
+
+class _JsAdapter(_Adapter):
+    function_nodes = frozenset({"function_declaration", "function_expression", "method_definition", "arrow_function"})
+    param_list_nodes = frozenset({"formal_parameters"})
+    assign_nodes = frozenset({"variable_declarator", "assignment_expression"})
+    assign_target_nodes = frozenset({"identifier", "property_identifier", "shorthand_property_identifier", "array_pattern", "object_pattern"})
+    identifier_tokens = frozenset({"identifier", "property_identifier", "shorthand_property_identifier", "private_property_identifier"})
+    param_token_types = frozenset({"identifier"})
+    assignment_operators = frozenset({"=", "+=", "-=", "*=", "/=", "%=", "**=", "|=", "&=", "^=", ">>=", "<<="})
+
+
+@lru_cache(maxsize=None)
+def _adapter_for(lang: Language) -> _Adapter:
+    return _Adapter(lang) if lang == Language.PY else _JsAdapter(lang)
+
 # ==============================================================================
 # DFG builder
 # ==============================================================================
@@ -140,16 +185,108 @@ class _Adapter:
 class DfgBuilder:
     """Robust, single-pass DFG builder using a stack-based CST walker to understand syntactic context."""
 
-    def __init__(self, fm: FileMeta, info: Optional[DriverInfo], events: List[CstEvent], sink: AnomalySink, cfg: DfgConfig):
+    def __init__(
+        self,
+        fm: FileMeta,
+        info: Optional[DriverInfo],
+        events: List[CstEvent],
+        sink: AnomalySink,
+        cfg: DfgConfig,
+        kinds: Optional[frozenset[str]] = None,
+        source: Optional[bytes] = None,
+    ):
         self.fm = fm
         self.info = info
         self.events = events
         self.sink = sink
         self.cfg = cfg
-        self.adapter = _Adapter(fm.lang)
+        self.adapter = _adapter_for(fm.lang)
         self.scope_stack: List[Scope] = []
         self.node_stack: List[CstEvent] = []
         self.current_assignment: Optional[dict] = None
+        # Output kinds the caller wants ("dfg_node", "dfg_edge", "alias_hint"); None = all.
+        # Scope/SSA state is always tracked, only row construction is skipped.
+        self._emit_nodes = kinds is None or "dfg_node" in kinds
+        self._emit_edges = kinds is None or "dfg_edge" in kinds
+        self._emit_alias_hints = kinds is None or "alias_hint" in kinds
+        self._has_assign_syntax: Optional[bool] = None
+        self._assign_offsets: Optional[List[int]] = None
+        # Source is mapped once and sliced per token instead of reopening the file.
+        self._source_mm: Optional[mmap.mmap] = None
+        # In-memory source (when given) or fallback for empty/unmappable files
+        self._source_raw: Optional[bytes] = source
+
+    def _source(self):
+        if self._source_mm is not None:
+            return self._source_mm
+        if self._source_raw is None:
+            try:
+                with open(self.fm.real_path, "rb") as f:
+                    try:
+                        self._source_mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                        return self._source_mm
+                    except (ValueError, OSError):
+                        self._source_raw = f.read()
+            except OSError:
+                self._source_raw = b""
+        return self._source_raw
+
+    def close(self) -> None:
+        """Release the source mapping (reopened lazily if tokens are read again)."""
+        if self._source_mm is not None:
+            self._source_mm.close()
+            self._source_mm = None
+
+    @property
+    def has_assignment_syntax(self) -> bool:
+        """
+        Cheap file-level gate: every assignment operator contains '=', so a file
+        without that byte cannot produce an operator token and the per-token
+        operator lookups can be skipped entirely.
+        """
+        if self._has_assign_syntax is None:
+            self._has_assign_syntax = self._source().find(b"=") != -1
+        return self._has_assign_syntax
+
+    @property
+    def assign_offsets(self) -> List[int]:
+        """Sorted byte offsets of every candidate assignment '=' in the file (one regex pass)."""
+        if self._assign_offsets is None:
+            if self.has_assignment_syntax:
+                self._assign_offsets = [m.start() for m in _ASSIGN_OP_RE.finditer(self._source())]
+            else:
+                self._assign_offsets = []
+        return self._assign_offsets
+
+    def _assign_operator_offset(self, ev: CstEvent) -> Optional[int]:
+        """Byte offset of the first candidate '=' inside ev's span, if any."""
+        return self._first_assign_offset(ev.byte_start, ev.byte_end)
+
+    def _first_assign_offset(self, start: int, end: int) -> Optional[int]:
+        offsets = self.assign_offsets
+        i = bisect.bisect_left(offsets, start)
+        if i < len(offsets) and offsets[i] < end:
+            return offsets[i]
+        return None
+
+    def _skip_nested_assign_offset(self, ev: CstEvent) -> None:
+        """
+        While the operator of the current assignment is pending, a candidate '=' inside
+        a nested node (string literal, keyword argument, walrus, annotation) is not the
+        operator: move on to the first candidate after that node. Operator nodes
+        ('<<=' in libcst, the '=' token in tree-sitter) keep it.
+        """
+        ca = self.current_assignment
+        if not ca or ca["operator_found"]:
+            return
+        op = ca["op_offset"]
+        if op is None or not (ev.byte_start <= op < ev.byte_end):
+            return
+        if ev.byte_end - ev.byte_start <= 4:
+            text = self._source()[ev.byte_start:ev.byte_end].decode("latin-1").strip()
+            if self.adapter.is_assignment_operator(text):
+                return
+        ca["op_offset"] = self._first_assign_offset(ev.byte_end, ca["end"])
 
     def build(self) -> Iterator[Tuple[str, object]]:
         if not self.events:
@@ -158,18 +295,22 @@ class DfgBuilder:
         root_scope_id = _stable_id(self.cfg.id_salt, "module", self.fm.path, self.fm.blob_sha or "")
         self.scope_stack.append(Scope(root_scope_id))
 
-        for i, ev in enumerate(self.events):
-            if ev.kind == CstEventKind.ENTER:
-                self.node_stack.append(ev)
-                yield from self._handle_enter_event(ev, i)
-            elif ev.kind == CstEventKind.TOKEN:
-                yield from self._handle_token_event(ev)
-            elif ev.kind == CstEventKind.EXIT:
-                if self.node_stack:
-                    yield from self._handle_exit_event(self.node_stack[-1])
-                    self.node_stack.pop()
+        try:
+            for i, ev in enumerate(self.events):
+                if ev.kind == CstEventKind.ENTER:
+                    self.node_stack.append(ev)
+                    yield from self._handle_enter_event(ev, i)
+                elif ev.kind == CstEventKind.TOKEN:
+                    yield from self._handle_token_event(ev)
+                elif ev.kind == CstEventKind.EXIT:
+                    if self.node_stack:
+                        yield from self._handle_exit_event(self.node_stack[-1])
+                        self.node_stack.pop()
+        finally:
+            self.close()
 
     def _handle_enter_event(self, ev: CstEvent, event_index: int) -> Iterator[Tuple[str, object]]:
+        self._skip_nested_assign_offset(ev)
         if self.adapter.is_function(ev.type):
             parent_scope = self.scope_stack[-1]
             func_name = self._find_name_in_node_span(event_index) or "<anonymous>"
@@ -180,20 +321,31 @@ class DfgBuilder:
             params = self._find_params_in_node_span(event_index)
             for param_name, param_event in params:
                 param_node_id = self._node_id(DfgNodeKind.PARAM, func_scope.scope_id, param_name, 0, param_event)
-                yield ("dfg_node", DfgNodeRow(
-                    id=param_node_id, func_id=func_scope.scope_id, kind=DfgNodeKind.PARAM, name=param_name, version=0,
-                    path=self.fm.path, lang=self.fm.lang, attrs_json=_compact({}),
-                    prov=build_provenance_from_event(self.fm, self.info, param_event)
-                ))
+                if self._emit_nodes:
+                    yield ("dfg_node", DfgNodeRow(
+                        id=param_node_id, func_id=func_scope.scope_id, kind=DfgNodeKind.PARAM, name=param_name, version=0,
+                        path=self.fm.path, lang=self.fm.lang, attrs_json=_compact({}),
+                        prov=build_provenance_from_event(self.fm, self.info, param_event)
+                    ))
                 func_scope.define_variable(param_name, param_node_id)
                 
         elif self.adapter.is_assign(ev.type):
-            self.current_assignment = {"operator_found": False, "lhs_vars": [], "rhs_vars": []}
+            self.current_assignment = {
+                "operator_found": False, "lhs_vars": [], "rhs_vars": [],
+                "op_offset": self._assign_operator_offset(ev), "end": ev.byte_end,
+            }
 
     def _handle_token_event(self, ev: CstEvent) -> Iterator[Tuple[str, object]]:
-        token_text = self._safe_token_text(ev)
         if self.current_assignment and not self.current_assignment["operator_found"]:
-            if token_text and self.adapter.is_assignment_operator(token_text):
+            op_offset = self.current_assignment["op_offset"]
+            if op_offset is not None:
+                # Tokens ending at or before the operator are LHS; the token spanning
+                # it is the operator itself (e.g. '+='), everything after is RHS.
+                if ev.byte_end > op_offset:
+                    self.current_assignment["operator_found"] = True
+                    if ev.byte_start <= op_offset:
+                        return
+            elif self._is_assignment_operator_token(ev):
                 self.current_assignment["operator_found"] = True
                 return
 
@@ -211,17 +363,19 @@ class DfgBuilder:
             var_state = current_scope.find_variable(name)
             if var_state and var_state.defining_node_id:
                 use_node_id = self._node_id(DfgNodeKind.VAR_USE, current_scope.scope_id, name, var_state.version, ev)
-                yield ("dfg_node", DfgNodeRow(
-                    id=use_node_id, func_id=current_scope.scope_id, kind=DfgNodeKind.VAR_USE, name=name, version=var_state.version,
-                    path=self.fm.path, lang=self.fm.lang, attrs_json=_compact({}), 
-                    prov=build_provenance_from_event(self.fm, self.info, ev)
-                ))
-                yield ("dfg_edge", DfgEdgeRow(
-                    id=self._edge_id(DfgEdgeKind.DEF_USE, current_scope.scope_id, var_state.defining_node_id, use_node_id, ev),
-                    func_id=current_scope.scope_id, kind=DfgEdgeKind.DEF_USE, src_id=var_state.defining_node_id, dst_id=use_node_id,
-                    path=self.fm.path, lang=self.fm.lang, attrs_json=_compact({"name": name, "version": var_state.version}),
-                    prov=build_provenance_from_event(self.fm, self.info, ev)
-                ))
+                if self._emit_nodes:
+                    yield ("dfg_node", DfgNodeRow(
+                        id=use_node_id, func_id=current_scope.scope_id, kind=DfgNodeKind.VAR_USE, name=name, version=var_state.version,
+                        path=self.fm.path, lang=self.fm.lang, attrs_json=_compact({}), 
+                        prov=build_provenance_from_event(self.fm, self.info, ev)
+                    ))
+                if self._emit_edges:
+                    yield ("dfg_edge", DfgEdgeRow(
+                        id=self._edge_id(DfgEdgeKind.DEF_USE, current_scope.scope_id, var_state.defining_node_id, use_node_id, ev),
+                        func_id=current_scope.scope_id, kind=DfgEdgeKind.DEF_USE, src_id=var_state.defining_node_id, dst_id=use_node_id,
+                        path=self.fm.path, lang=self.fm.lang, attrs_json=_compact({"name": name, "version": var_state.version}),
+                        prov=build_provenance_from_event(self.fm, self.info, ev)
+                    ))
 
     def _handle_exit_event(self, exited_node_event: CstEvent) -> Iterator[Tuple[str, object]]:
         if self.adapter.is_function(exited_node_event.type):
@@ -236,17 +390,19 @@ class DfgBuilder:
                     var_state = current_scope.find_variable(name)
                     if var_state and var_state.defining_node_id:
                         use_node_id = self._node_id(DfgNodeKind.VAR_USE, current_scope.scope_id, name, var_state.version, token_ev)
-                        yield ("dfg_node", DfgNodeRow(
-                            id=use_node_id, func_id=current_scope.scope_id, kind=DfgNodeKind.VAR_USE, name=name, version=var_state.version,
-                            path=self.fm.path, lang=self.fm.lang, attrs_json=_compact({}),
-                            prov=build_provenance_from_event(self.fm, self.info, token_ev)
-                        ))
-                        yield ("dfg_edge", DfgEdgeRow(
-                            id=self._edge_id(DfgEdgeKind.DEF_USE, current_scope.scope_id, var_state.defining_node_id, use_node_id, token_ev),
-                            func_id=current_scope.scope_id, kind=DfgEdgeKind.DEF_USE, src_id=var_state.defining_node_id, dst_id=use_node_id,
-                            path=self.fm.path, lang=self.fm.lang, attrs_json=_compact({}),
-                            prov=build_provenance_from_event(self.fm, self.info, token_ev)
-                        ))
+                        if self._emit_nodes:
+                            yield ("dfg_node", DfgNodeRow(
+                                id=use_node_id, func_id=current_scope.scope_id, kind=DfgNodeKind.VAR_USE, name=name, version=var_state.version,
+                                path=self.fm.path, lang=self.fm.lang, attrs_json=_compact({}),
+                                prov=build_provenance_from_event(self.fm, self.info, token_ev)
+                            ))
+                        if self._emit_edges:
+                            yield ("dfg_edge", DfgEdgeRow(
+                                id=self._edge_id(DfgEdgeKind.DEF_USE, current_scope.scope_id, var_state.defining_node_id, use_node_id, token_ev),
+                                func_id=current_scope.scope_id, kind=DfgEdgeKind.DEF_USE, src_id=var_state.defining_node_id, dst_id=use_node_id,
+                                path=self.fm.path, lang=self.fm.lang, attrs_json=_compact({}),
+                                prov=build_provenance_from_event(self.fm, self.info, token_ev)
+                            ))
                 
                 # Process LHS (defs) second
                 for name, token_ev in self.current_assignment["lhs_vars"]:
@@ -255,17 +411,19 @@ class DfgBuilder:
                     new_def_node_id = self._node_id(DfgNodeKind.VAR_DEF, current_scope.scope_id, name, var_state.version, token_ev)
                     var_state.defining_node_id = new_def_node_id
                     
-                    yield ("dfg_node", DfgNodeRow(
-                        id=new_def_node_id, func_id=current_scope.scope_id, kind=DfgNodeKind.VAR_DEF, name=name, version=var_state.version,
-                        path=self.fm.path, lang=self.fm.lang, attrs_json=_compact({}),
-                        prov=build_provenance_from_event(self.fm, self.info, token_ev)
-                    ))
+                    if self._emit_nodes:
+                        yield ("dfg_node", DfgNodeRow(
+                            id=new_def_node_id, func_id=current_scope.scope_id, kind=DfgNodeKind.VAR_DEF, name=name, version=var_state.version,
+                            path=self.fm.path, lang=self.fm.lang, attrs_json=_compact({}),
+                            prov=build_provenance_from_event(self.fm, self.info, token_ev)
+                        ))
                 
                 # Check for simple alias
                 if len(self.current_assignment["lhs_vars"]) == 1 and len(self.current_assignment["rhs_vars"]) == 1:
                     lhs_name, _ = self.current_assignment["lhs_vars"][0]
                     rhs_name, _ = self.current_assignment["rhs_vars"][0]
-                    yield ("alias_hint", {"lhs_name": lhs_name, "rhs_name": rhs_name, "scope_id": current_scope.scope_id})
+                    if self._emit_alias_hints:
+                        yield ("alias_hint", AliasHint(lhs_name=lhs_name, rhs_name=rhs_name, scope_id=current_scope.scope_id))
 
                 self.current_assignment = None
 
@@ -357,12 +515,16 @@ class DfgBuilder:
     def _edge_id(self, kind: DfgEdgeKind, func_id: str, src: str, dst: str, ev: CstEvent) -> str:
         return _stable_id(self.cfg.id_salt, "edge", self.fm.path, self.fm.blob_sha or "", func_id, kind.value, src, dst, str(ev.byte_start))
         
+    def _is_assignment_operator_token(self, ev: CstEvent) -> bool:
+        if not self.has_assignment_syntax:
+            return False
+        token_text = self._safe_token_text(ev)
+        return bool(token_text) and self.adapter.is_assignment_operator(token_text)
+
     def _safe_token_name(self, ev: CstEvent) -> Optional[str]:
         try:
             if ev.byte_end <= ev.byte_start or (ev.byte_end - ev.byte_start) > 1024: return None
-            with open(self.fm.real_path, "rb") as f:
-                f.seek(ev.byte_start)
-                token = f.read(ev.byte_end - ev.byte_start)
+            token = self._source()[ev.byte_start:ev.byte_end]
             text = token.decode(self.fm.encoding or "utf-8", errors="replace").strip()
             if not text or len(text) > 256: return None
             if not (text[0].isalpha() or text[0] == "_"): return None
@@ -375,9 +537,7 @@ class DfgBuilder:
     def _safe_token_text(self, ev: CstEvent) -> Optional[str]:
         try:
             if ev.byte_end <= ev.byte_start or (ev.byte_end - ev.byte_start) > 1024: return None
-            with open(self.fm.real_path, "rb") as f:
-                f.seek(ev.byte_start)
-                token = f.read(ev.byte_end - ev.byte_start)
+            token = self._source()[ev.byte_start:ev.byte_end]
             return token.decode(self.fm.encoding or "utf-8", errors="replace").strip()
         except Exception: return None
 
@@ -385,6 +545,20 @@ class DfgBuilder:
 # Public convenience
 # ==============================================================================
 
-def build_dfg(fm: FileMeta, info: Optional[DriverInfo], events: List[CstEvent], sink: AnomalySink, cfg: Optional[DfgConfig] = None) -> Iterator[Tuple[str, object]]:
-    builder = DfgBuilder(fm, info, events, sink, cfg or DfgConfig())
+def build_dfg(
+    fm: FileMeta,
+    info: Optional[DriverInfo],
+    events: List[CstEvent],
+    sink: AnomalySink,
+    cfg: Optional[DfgConfig] = None,
+    *,
+    kinds: Optional[frozenset[str]] = None,
+    source: Optional[bytes] = None,
+) -> Iterator[Tuple[str, object]]:
+    """
+    Yield ("dfg_node" | "dfg_edge" | "alias_hint", payload) items. Pass `kinds` to
+    restrict output; rows of other kinds are then never constructed. Pass `source`
+    to resolve token text from in-memory bytes instead of fm.real_path.
+    """
+    builder = DfgBuilder(fm, info, events, sink, cfg or DfgConfig(), kinds=kinds, source=source)
     yield from builder.build()
\ No newline at end of file
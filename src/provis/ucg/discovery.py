@@ -48,7 +48,7 @@ class Anomaly:
     severity: Severity
     detail: str
     span: Optional[Tuple[int, int]] = None  # optional byte range
-    ts_ms: int = field(default_factory=lambda: int(time.time() * 1000))
+    ts_ms: Optional[int] = None  # None: stamped when emitted into anomalies.AnomalySink
 
 
 class AnomalySink:
@@ -569,44 +569,68 @@ def _iter_paths_lex(root: Path, sink: AnomalySink, m: Metrics) -> Iterator[Path]
     """
     Deterministic lexicographic directory walk with symlink safety (we do not
     follow symlinked dirs in discovery; if you decide to, enforce within-root checks).
+
+    Files come out sorted by their root-relative POSIX path: each directory is
+    listed once with os.scandir, entries are ordered by name (directories as
+    "name/"), and subdirectories are walked in place rather than deferred, so
+    callers can consume the stream without re-sorting it.
     """
-    stack: list[Path] = [root]
+    stack: list[Iterator[os.DirEntry]] = []
+    entries = _scandir_lex(root, root, sink, m)
+    if entries is not None:
+        stack.append(iter(entries))
     while stack:
-        cur = stack.pop()
-        try:
-            entries = sorted(os.scandir(cur), key=lambda e: e.name)
-        except PermissionError:
-            rel = _posix_relpath(cur, root)
-            sink.emit(Anomaly(path=rel, blob_sha=None, kind=AnomalyKind.PERMISSION_DENIED, severity=Severity.WARN, detail="Dir read permission denied"))
-            m.inc("discovery_permission_denied_total")
+        entry = next(stack[-1], None)
+        if entry is None:
+            stack.pop()
             continue
-        except OSError as e:
-            rel = _posix_relpath(cur, root)
-            sink.emit(Anomaly(path=rel, blob_sha=None, kind=AnomalyKind.IO_ERROR, severity=Severity.WARN, detail=f"Dir read failed: {e}"))
-            m.inc("discovery_io_errors_total")
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+            is_file = entry.is_file(follow_symlinks=False)
+            is_symlink = entry.is_symlink()
+        except OSError:
             continue
 
-        for entry in entries:
-            try:
-                is_dir = entry.is_dir(follow_symlinks=False)
-                is_file = entry.is_file(follow_symlinks=False)
-                is_symlink = entry.is_symlink()
-            except OSError:
+        p = Path(entry.path)
+        if is_dir:
+            if is_symlink:
+                rel = _posix_relpath(p, root)
+                sink.emit(Anomaly(path=rel, blob_sha=None, kind=AnomalyKind.SYMLINK_OUT_OF_ROOT, severity=Severity.INFO, detail="Symlinked directory not followed"))
+                m.inc("discovery_symlink_dirs_not_followed_total")
                 continue
+            sub = _scandir_lex(p, root, sink, m)
+            if sub is not None:
+                stack.append(iter(sub))
+        elif is_file:
+            yield p
+        else:
+            # sockets, fifos, devices ignored
+            continue
 
-            p = Path(entry.path)
-            if is_dir:
-                if is_symlink:
-                    rel = _posix_relpath(p, root)
-                    sink.emit(Anomaly(path=rel, blob_sha=None, kind=AnomalyKind.SYMLINK_OUT_OF_ROOT, severity=Severity.INFO, detail="Symlinked directory not followed"))
-                    m.inc("discovery_symlink_dirs_not_followed_total")
-                    continue
-                stack.append(p)
-            elif is_file:
-                yield p
-            else:
-                # sockets, fifos, devices ignored
-                continue
+
+def _scandir_lex(cur: Path, root: Path, sink: AnomalySink, m: Metrics) -> Optional[list[os.DirEntry]]:
+    try:
+        with os.scandir(cur) as it:
+            return sorted(it, key=_lex_key)
+    except PermissionError:
+        rel = _posix_relpath(cur, root)
+        sink.emit(Anomaly(path=rel, blob_sha=None, kind=AnomalyKind.PERMISSION_DENIED, severity=Severity.WARN, detail="Dir read permission denied"))
+        m.inc("discovery_permission_denied_total")
+    except OSError as e:
+        rel = _posix_relpath(cur, root)
+        sink.emit(Anomaly(path=rel, blob_sha=None, kind=AnomalyKind.IO_ERROR, severity=Severity.WARN, detail=f"Dir read failed: {e}"))
+        m.inc("discovery_io_errors_total")
+    return None
+
+
+def _lex_key(entry: os.DirEntry) -> str:
+    # A directory sorts where its children's "name/..." paths will.
+    try:
+        if entry.is_dir(follow_symlinks=False):
+            return entry.name + "/"
+    except OSError:
+        pass
+    return entry.name
 
 
 def _posix_relpath(p: Path, root: Path) -> str:
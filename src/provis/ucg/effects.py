@@ -55,15 +55,17 @@ class EffectsConfig:
 
 
 def _stable_id(*parts: str) -> str:
-    h = hashlib.blake2b(digest_size=20)
-    for p in parts:
-        h.update(b"\x1f")
-        h.update(p.encode("utf-8", "ignore"))
-    return h.hexdigest()
+    # Same bytes as updating with b"\x1f" + part for each part, in one encode + hash call
+    data = "\x1f" + "\x1f".join(parts) if parts else ""
+    return hashlib.blake2b(data.encode("utf-8", "ignore"), digest_size=20).hexdigest()
+
+
+# json.dumps() builds a new JSONEncoder whenever it gets non-default options; reuse one.
+_COMPACT_ENCODER = json.JSONEncoder(separators=(",", ":"), sort_keys=True)
 
 
 def _compact(d: dict) -> str:
-    return json.dumps(d, separators=(",", ":"), sort_keys=True)
+    return _COMPACT_ENCODER.encode(d)
 
 
 # ==============================================================================
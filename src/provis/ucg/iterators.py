@@ -103,6 +103,22 @@ def _as_json(maybe: Optional[str]) -> Dict:
         return {}
 
 
+def _record_batches(result, batch_size: int):
+    """
+    Yield Arrow record batches from a DuckDB result. Current DuckDB returns a
+    pyarrow.RecordBatchReader (iterable); older builds exposed fetch_next_batch().
+    """
+    reader = result.fetch_record_batch(batch_size)
+    if hasattr(reader, "fetch_next_batch"):
+        while True:
+            batch = reader.fetch_next_batch()
+            if batch is None:
+                break
+            yield batch
+    else:
+        yield from reader
+
+
 def _node_row_to_record(r) -> NodeRecord:
     return NodeRecord(
         id=r.id,
@@ -191,18 +207,23 @@ class UcgReader:
         self,
         *,
         path: Optional[str] = None,
+        paths: Optional[Iterable[str]] = None,
         kinds: Optional[Iterable[str]] = None,
         langs: Optional[Iterable[str]] = None,
         batch_size: int = 50_000,
     ) -> Iterator[NodeRecord]:
         """
-        Stream nodes filtered by path/kind/lang in deterministic order (path, byte_start ASC).
+        Stream nodes filtered by path(s)/kind/lang in deterministic order (path, byte_start ASC).
         """
         where = []
         params = []
         if path:
             where.append("path = ?")
             params.append(path)
+        if paths:
+            ps = list(paths)
+            where.append(f"path IN ({','.join(['?']*len(ps))})")
+            params.extend(ps)
         if kinds:
             ks = list(kinds)
             where.append(f"kind IN ({','.join(['?']*len(ks))})")
@@ -230,10 +251,11 @@ class UcgReader:
         src_id: Optional[str] = None,
         dst_id: Optional[str] = None,
         path: Optional[str] = None,
+        paths: Optional[Iterable[str]] = None,
         batch_size: int = 50_000,
     ) -> Iterator[EdgeRecord]:
         """
-        Stream edges filtered by kind/src/dst/path in deterministic order (path, byte_start ASC).
+        Stream edges filtered by kind/src/dst/path(s) in deterministic order (path, byte_start ASC).
         """
         where = []
         params = []
@@ -250,6 +272,10 @@ class UcgReader:
         if path:
             where.append("path = ?")
             params.append(path)
+        if paths:
+            ps = list(paths)
+            where.append(f"path IN ({','.join(['?']*len(ps))})")
+            params.extend(ps)
         where_sql = ("WHERE " + " AND ".join(where)) if where else ""
         sql = f"""
             SELECT id, kind, src_id, dst_id, path, lang, attrs_json,
@@ -300,16 +326,51 @@ class UcgReader:
             {where_sql}
             ORDER BY path ASC, prov_byte_start ASC
         """
-        rel = self.con.execute(sql, params).fetch_record_batch(batch_size)
-        while True:
-            batch = rel.fetch_next_batch()
-            if batch is None:
-                break
-            tbl = batch.to_table()
-            for r in tbl.to_pylist():
+        for batch in _record_batches(self.con.execute(sql, params), batch_size):
+            for r in batch.to_pylist():
                 _row = type("Row", (), r)
                 yield _effect_row_to_record(_row)
 
+    # ---------------- batched multi-path scans ----------------
+
+    def nodes_by_paths(
+        self,
+        paths: Iterable[str],
+        *,
+        kinds: Optional[Iterable[str]] = None,
+        batch_size: int = 50_000,
+    ) -> Dict[str, List[NodeRecord]]:
+        """
+        One scan for several files, bucketed by path (each list in byte_start order).
+        Paths with no rows map to an empty list.
+        """
+        wanted = list(paths)
+        out: Dict[str, List[NodeRecord]] = {p: [] for p in wanted}
+        if not wanted:
+            return out
+        for n in self.iter_nodes_by_path(paths=wanted, kinds=kinds, batch_size=batch_size):
+            out[n.path].append(n)
+        return out
+
+    def edges_by_paths(
+        self,
+        paths: Iterable[str],
+        *,
+        kinds: Optional[Iterable[str]] = None,
+        batch_size: int = 50_000,
+    ) -> Dict[str, List[EdgeRecord]]:
+        """
+        One scan for several files, bucketed by path (each list in byte_start order).
+        Paths with no rows map to an empty list.
+        """
+        wanted = list(paths)
+        out: Dict[str, List[EdgeRecord]] = {p: [] for p in wanted}
+        if not wanted:
+            return out
+        for e in self.iter_edges_by_src_or_dst(paths=wanted, kinds=kinds, batch_size=batch_size):
+            out[e.path].append(e)
+        return out
+
     # -------------- higher-level convenience scans ----------------
 
     def iter_calls(self, *, path: Optional[str] = None, batch_size: int = 50_000) -> Iterator[CallRecord]:
@@ -431,26 +492,16 @@ class UcgReader:
     # ---------------- low-level streaming primitives ---------------------------
 
     def _stream_nodes(self, sql: str, params: List[object], batch_size: int) -> Iterator[NodeRecord]:
-        rel = self.con.execute(sql, params).fetch_record_batch(batch_size)
-        while True:
-            batch = rel.fetch_next_batch()
-            if batch is None:
-                break
-            tbl = batch.to_table()
-            for r in tbl.to_pylist():
+        for batch in _record_batches(self.con.execute(sql, params), batch_size):
+            for r in batch.to_pylist():
                 # duckdb returns dict rows in PyList; map keys directly
                 # Convert to a simple object with attribute access via dot (simulate row)
                 _row = type("Row", (), r)
                 yield _node_row_to_record(_row)
 
     def _stream_edges(self, sql: str, params: List[object], batch_size: int) -> Iterator[EdgeRecord]:
-        rel = self.con.execute(sql, params).fetch_record_batch(batch_size)
-        while True:
-            batch = rel.fetch_next_batch()
-            if batch is None:
-                break
-            tbl = batch.to_table()
-            for r in tbl.to_pylist():
+        for batch in _record_batches(self.con.execute(sql, params), batch_size):
+            for r in batch.to_pylist():
                 _row = type("Row", (), r)
                 yield _edge_row_to_record(_row)
 
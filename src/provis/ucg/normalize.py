@@ -110,15 +110,17 @@ class NormalizerConfig:
 # ==============================================================================
 
 def _stable_id(*parts: str) -> str:
-    h = hashlib.blake2b(digest_size=20)
-    for p in parts:
-        h.update(b"\x1f")
-        h.update(p.encode("utf-8", "ignore"))
-    return h.hexdigest()
+    # Same bytes as updating with b"\x1f" + part for each part, in one encode + hash call
+    data = "\x1f" + "\x1f".join(parts) if parts else ""
+    return hashlib.blake2b(data.encode("utf-8", "ignore"), digest_size=20).hexdigest()
+
+
+# json.dumps() builds a new JSONEncoder whenever it gets non-default options; reuse one.
+_COMPACT_ENCODER = json.JSONEncoder(separators=(",", ":"), sort_keys=True)
 
 
 def _compact(obj: dict) -> str:
-    return json.dumps(obj, separators=(",", ":"), sort_keys=True)
+    return _COMPACT_ENCODER.encode(obj)
 
 
 # ==============================================================================
@@ -263,7 +265,7 @@ class Normalizer:
     def normalize(self, fm: FileMeta, info: Optional[DriverInfo], events: List[CstEvent], sink: AnomalySink) -> Iterator[tuple[str, object]]:
         lang = fm.lang
 
-        adapter = _ADAPTERS.get(lang, _Adapter(lang))
+        adapter = _ADAPTERS.get(lang) or _Adapter(lang)
 
         # Always emit FILE node
         file_node = self._file_node(fm, info)
@@ -656,7 +658,7 @@ class Normalizer:
     # ---- internals ------------------------------------------------------------
 
     def _is_identifier_like(self, ev: CstEvent, lang: Language) -> bool:
-        adapter = _ADAPTERS.get(lang, _Adapter(lang))
+        adapter = _ADAPTERS.get(lang) or _Adapter(lang)
         return adapter.is_identifier_token(ev.type)
 
     def _token_is_identifier(self, ev: CstEvent, lang: Language) -> bool:
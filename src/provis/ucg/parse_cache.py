@@ -0,0 +1,244 @@
+# src/provis/ucg/parse_cache.py
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from .discovery import FileMeta
+from .parser_registry import CstEvent, DriverInfo, ParserDriver, ParseStream
+
+# Optional: BLAKE3 is SIMD-vectorized and considerably faster than BLAKE2b on
+# multi-KB inputs; fall back to hashlib when it is not installed.
+try:
+    import blake3 as _blake3  # type: ignore
+except Exception:  # pragma: no cover - depends on environment
+    _blake3 = None
+
+# ==============================================================================
+# Persistent CST event cache
+# ==============================================================================
+#
+# Materialized event lists are pickled under `.cache/ucg-events/<key>.pkl`.
+# Keys are content addressed: content_sha(source bytes) + driver grammar/version +
+# digest of the driver sources + interpreter version + cache schema. A changed
+# file, grammar, driver or Python build therefore simply misses; stale entries
+# are never consulted.
+
+CACHE_SCHEMA = "ucg-events-v1"
+DEFAULT_CACHE_DIR = Path(".cache") / "ucg-events"
+
+# Modules whose code determines the emitted event stream.
+_DRIVER_SOURCES = ("parser_registry.py", "python_driver.py", "ts_driver.py")
+
+# Inputs at least this large are hashed with BLAKE3's multithreaded mode.
+_BLAKE3_THREADED_MIN_BYTES = 1 << 20
+
+PathLike = Union[str, os.PathLike]
+
+
+def _cache_dir(cache_dir: Optional[PathLike]) -> Path:
+    if cache_dir is not None:
+        return Path(cache_dir)
+    env = os.environ.get("PROVIS_PARSE_CACHE_DIR")
+    return Path(env) if env else DEFAULT_CACHE_DIR
+
+
+def content_sha(raw: bytes) -> str:
+    """Content hash used for cache keying (independent of FileMeta.blob_sha)."""
+    if _blake3 is not None:
+        if len(raw) >= _BLAKE3_THREADED_MIN_BYTES:
+            return _blake3.blake3(raw, max_threads=_blake3.blake3.AUTO).hexdigest()
+        return _blake3.blake3(raw).hexdigest()
+    return hashlib.blake2b(raw, digest_size=20).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _driver_code_sha() -> str:
+    """Digest of the driver sources, so editing event emission invalidates entries."""
+    h = hashlib.blake2b(digest_size=20)
+    here = Path(__file__).resolve().parent
+    for name in _DRIVER_SOURCES:
+        h.update(name.encode("utf-8"))
+        h.update(b"\x00")
+        try:
+            h.update((here / name).read_bytes())
+        except OSError:
+            h.update(b"<missing>")
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def cache_key(source_sha: str, info: DriverInfo) -> str:
+    """Derive a cache key from the source hash, driver identity/code and Python version."""
+    h = hashlib.blake2b(digest_size=20)
+    for part in (
+        CACHE_SCHEMA,
+        source_sha,
+        info.language.value,
+        info.grammar_name,
+        info.grammar_sha,
+        info.version,
+        _driver_code_sha(),
+        "%d.%d.%d" % sys.version_info[:3],
+    ):
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def load(key: str, *, cache_dir: Optional[PathLike] = None) -> Optional[List[CstEvent]]:
+    """Return cached events for `key`, or None on miss / unreadable entry."""
+    path = _cache_dir(cache_dir) / f"{key}.pkl"
+    try:
+        with open(path, "rb") as fh:
+            events = pickle.load(fh)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Corrupt/truncated/incompatible entry: treat as a miss.
+        return None
+    return events if isinstance(events, list) else None
+
+
+def store(key: str, events: List[CstEvent], *, cache_dir: Optional[PathLike] = None) -> None:
+    """Persist `events` atomically (write to a temp file, then rename into place)."""
+    d = _cache_dir(cache_dir)
+    try:
+        d.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=f".{key}.", suffix=".tmp", dir=d)
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                pickle.dump(events, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, d / f"{key}.pkl")
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+    except OSError:
+        # The cache is best-effort; never fail a parse because it could not be written.
+        pass
+
+
+def parse_cached(
+    driver: ParserDriver,
+    fm: FileMeta,
+    *,
+    source: Optional[bytes] = None,
+    cache_dir: Optional[PathLike] = None,
+) -> ParseStream:
+    """
+    Drop-in replacement for `driver.parse(fm)` backed by the on-disk event cache.
+
+    On hit the driver is not invoked at all. On miss the event stream is materialized
+    once and persisted. The returned ParseStream iterates over the materialized list.
+    Pass `source` to parse in-memory bytes instead of reading fm.real_path.
+    """
+    start = time.perf_counter()
+    try:
+        info = driver.info()
+        if source is not None:
+            raw = source
+        else:
+            with open(fm.real_path, "rb") as fh:
+                raw = fh.read()
+    except Exception as e:
+        return ParseStream(
+            file=fm, driver=None, events=None,
+            elapsed_s=time.perf_counter() - start, ok=False, error=str(e),
+        )
+
+    key = cache_key(content_sha(raw), info)
+    events = load(key, cache_dir=cache_dir)
+    if events is None:
+        try:
+            if source is not None:
+                events = list(driver.parse_to_events(fm, source=source))
+            else:
+                events = list(driver.parse_to_events(fm))
+        except Exception as e:
+            return ParseStream(
+                file=fm, driver=info, events=None,
+                elapsed_s=time.perf_counter() - start, ok=False, error=str(e),
+            )
+        store(key, events, cache_dir=cache_dir)
+
+    return ParseStream(
+        file=fm, driver=info, events=iter(events),
+        elapsed_s=time.perf_counter() - start, ok=True,
+    )
+
+
+# ==============================================================================
+# In-process event cache (one parse shared by every consumer in a run)
+# ==============================================================================
+
+class EventCache:
+    """
+    Memoizes materialized event lists by (blob_sha, grammar_sha) for the lifetime
+    of one run, so the pipeline and any later passes over the same file (DFG,
+    symbols, QA checks) share a single parse. With `persistent=True` misses go
+    through the on-disk cache above instead of the driver directly.
+
+    Files without a blob_sha are parsed every time (no content identity to key on).
+    Not thread-safe; intended for the single-threaded pipeline and scripts.
+    """
+
+    def __init__(self, *, persistent: bool = False, cache_dir: Optional[PathLike] = None) -> None:
+        self._events: Dict[Tuple[str, str], List[CstEvent]] = {}
+        self._persistent = persistent
+        self._cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def get_or_parse(self, fm: FileMeta, driver: ParserDriver) -> ParseStream:
+        """Return a ParseStream over the cached events for `fm`, parsing on first use."""
+        start = time.perf_counter()
+        try:
+            info = driver.info()
+        except Exception as e:
+            return ParseStream(
+                file=fm, driver=None, events=None,
+                elapsed_s=time.perf_counter() - start, ok=False, error=str(e),
+            )
+
+        key = (fm.blob_sha, info.grammar_sha) if fm.blob_sha else None
+        events = self._events.get(key) if key is not None else None
+        if events is not None:
+            self.hits += 1
+            return ParseStream(
+                file=fm, driver=info, events=iter(events),
+                elapsed_s=time.perf_counter() - start, ok=True,
+            )
+
+        self.misses += 1
+        if self._persistent:
+            ps = parse_cached(driver, fm, cache_dir=self._cache_dir)
+        else:
+            ps = driver.parse(fm)  # type: ignore[attr-defined]
+        if not ps.ok or ps.events is None:
+            return ps
+        try:
+            events = list(ps.events)
+        except Exception as e:
+            return ParseStream(
+                file=fm, driver=info, events=None,
+                elapsed_s=time.perf_counter() - start, ok=False, error=str(e),
+            )
+        if key is not None:
+            self._events[key] = events
+        return ParseStream(
+            file=fm, driver=info, events=iter(events),
+            elapsed_s=time.perf_counter() - start, ok=True,
+        )
@@ -89,14 +89,16 @@ class ParserDriver:
 
     Implementations MUST be thread-safe for concurrent parse calls and:
       - Return a non-empty DriverInfo with grammar_sha/version populated.
-      - Implement parse_to_events(file) as a generator; on irrecoverable error,
+      - Implement parse_to_events(file, source=None) as a generator; on irrecoverable error,
         raise ParserError (or Exception) rather than yielding partial, misleading streams.
+      - When `source` is given, parse those bytes instead of reading file.real_path;
+        `file` still supplies path/encoding/lang metadata.
     """
 
     def info(self) -> DriverInfo:
         raise NotImplementedError
 
-    def parse_to_events(self, file: FileMeta) -> Iterator[CstEvent]:
+    def parse_to_events(self, file: FileMeta, source: Optional[bytes] = None) -> Iterator[CstEvent]:
         raise NotImplementedError
 
 
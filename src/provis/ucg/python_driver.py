@@ -4,6 +4,7 @@ import hashlib
 import time
 from bisect import bisect_right
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Iterator, List, Optional, Tuple
 
 from .discovery import FileMeta, Language
@@ -187,7 +188,7 @@ class PythonLibCstDriver(ParserDriver):
             elapsed = time.perf_counter() - start
             return ParseStream(file=file, driver=info, events=None, elapsed_s=elapsed, ok=False, error=str(e))
 
-    def parse_to_events(self, file: FileMeta) -> Iterator[CstEvent]:
+    def parse_to_events(self, file: FileMeta, source: Optional[bytes] = None) -> Iterator[CstEvent]:
         if _LIBCST_IMPORT_ERROR is not None:
             raise ParserError(
                 code="LIB_DEP_MISSING",
@@ -200,16 +201,19 @@ class PythonLibCstDriver(ParserDriver):
 
         enc = file.encoding or "utf-8"
 
-        # Read original bytes (entire file) — needed for byte-accurate mapping.
-        try:
-            with open(file.real_path, "rb") as fh:
-                raw = fh.read()
-        except FileNotFoundError as e:
-            raise ParserError(code="IO_ERROR", message="File not found", detail=str(e))
-        except PermissionError as e:
-            raise ParserError(code="PERMISSION_DENIED", message="Permission denied", detail=str(e))
-        except OSError as e:
-            raise ParserError(code="IO_ERROR", message="Read failed", detail=str(e))
+        # Original bytes (entire file) — needed for byte-accurate mapping.
+        if source is not None:
+            raw = bytes(source)
+        else:
+            try:
+                with open(file.real_path, "rb") as fh:
+                    raw = fh.read()
+            except FileNotFoundError as e:
+                raise ParserError(code="IO_ERROR", message="File not found", detail=str(e))
+            except PermissionError as e:
+                raise ParserError(code="PERMISSION_DENIED", message="Permission denied", detail=str(e))
+            except OSError as e:
+                raise ParserError(code="IO_ERROR", message="Read failed", detail=str(e))
 
         # Decode for libcst parsing
         try:
@@ -406,6 +410,20 @@ class PythonLibCstDriver(ParserDriver):
     def _libcst_version() -> str:
         try:
             import libcst
-            return getattr(libcst, "__version__", "unknown")
+            version = getattr(libcst, "__version__", None)
+            if version:
+                return version
+            # Older libcst releases do not export __version__; ask the installed dist.
+            from importlib.metadata import version as _dist_version
+            return _dist_version("libcst")
         except Exception:
-            return "unknown"
\ No newline at end of file
+            return "unknown"
+
+
+@lru_cache(maxsize=1)
+def get_py_driver() -> PythonLibCstDriver:
+    """
+    Shared, lazily constructed Python driver. The driver holds no per-parse state,
+    so one instance can serve every parse in the process.
+    """
+    return PythonLibCstDriver()
@@ -5,8 +5,10 @@ import hashlib
 import json
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from typing import Dict, Iterator, List, Optional, Tuple
 
+from .dfg import AliasHint
 from .discovery import Anomaly, AnomalyKind, AnomalySink, FileMeta, Language, Severity
 from .parser_registry import CstEvent, CstEventKind, DriverInfo
 from .provenance import ProvenanceV2, build_provenance_from_event
@@ -83,15 +85,17 @@ class SymbolsConfig:
 
 
 def _stable_id(*parts: str) -> str:
-    h = hashlib.blake2b(digest_size=20)
-    for p in parts:
-        h.update(b"\x1f")
-        h.update(p.encode("utf-8", "ignore"))
-    return h.hexdigest()
+    # Same bytes as updating with b"\x1f" + part for each part, in one encode + hash call
+    data = "\x1f" + "\x1f".join(parts) if parts else ""
+    return hashlib.blake2b(data.encode("utf-8", "ignore"), digest_size=20).hexdigest()
+
+
+# json.dumps() builds a new JSONEncoder whenever it gets non-default options; reuse one.
+_COMPACT_ENCODER = json.JSONEncoder(separators=(",", ":"), sort_keys=True)
 
 
 def _compact(obj: dict) -> str:
-    return json.dumps(obj, separators=(",", ":"), sort_keys=True)
+    return _COMPACT_ENCODER.encode(obj)
 
 
 def _module_name_from_path(path: str) -> str:
@@ -106,27 +110,18 @@ def _module_name_from_path(path: str) -> str:
 # ==============================================================================
 
 class _Adapter:
+    """libcst (Python) node types; `_JsAdapter` overrides them for tree-sitter JS/TS."""
+
+    function_nodes = frozenset({"FunctionDef", "AsyncFunctionDef", "Lambda"})
+    class_nodes = frozenset({"ClassDef"})
+    param_token = frozenset({"Name"})
+    assign_nodes = frozenset({"Assign", "AnnAssign", "AugAssign"})
+    import_nodes = frozenset({"Import", "ImportFrom"})
+    export_nodes = frozenset({"Expr"})
+    identifier_tokens = frozenset({"Name"})
+
     def __init__(self, lang: Language) -> None:
         self.lang = lang
-        self._init_sets()
-
-    def _init_sets(self) -> None:
-        if self.lang == Language.PY:
-            self.function_nodes = {"FunctionDef", "AsyncFunctionDef", "Lambda"}
-            self.class_nodes = {"ClassDef"}
-            self.param_token = {"Name"}
-            self.assign_nodes = {"Assign", "AnnAssign", "AugAssign"}
-            self.import_nodes = {"Import", "ImportFrom"}
-            self.export_nodes = {"Expr"}
-            self.identifier_tokens = {"Name"}
-        else: # JS/TS
-            self.function_nodes = {"function_declaration", "function_expression", "method_definition", "arrow_function"}
-            self.class_nodes = {"class_declaration"}
-            self.param_token = {"identifier"}
-            self.assign_nodes = {"variable_declarator", "assignment_expression"}
-            self.import_nodes = {"import_declaration"}
-            self.export_nodes = {"export_statement", "export_clause"}
-            self.identifier_tokens = {"identifier", "shorthand_property_identifier", "property_identifier"}
 
     def is_function(self, t: str) -> bool: return t in self.function_nodes
     def is_class(self, t: str) -> bool: return t in self.class_nodes
@@ -136,6 +131,21 @@ class _Adapter:
     def is_export(self, t: str) -> bool: return t in self.export_nodes
     def is_identifier(self, t: str) -> bool: return t in self.identifier_tokens
 
+
+class _JsAdapter(_Adapter):
+    function_nodes = frozenset({"function_declaration", "function_expression", "method_definition", "arrow_function"})
+    class_nodes = frozenset({"class_declaration"})
+    param_token = frozenset({"identifier"})
+    assign_nodes = frozenset({"variable_declarator", "assignment_expression"})
+    import_nodes = frozenset({"import_declaration"})
+    export_nodes = frozenset({"export_statement", "export_clause"})
+    identifier_tokens = frozenset({"identifier", "shorthand_property_identifier", "property_identifier"})
+
+
+@lru_cache(maxsize=None)
+def _adapter_for(lang: Language) -> _Adapter:
+    return _Adapter(lang) if lang == Language.PY else _JsAdapter(lang)
+
 # ==============================================================================
 # Builder state
 # ==============================================================================
@@ -162,6 +172,7 @@ class _BuildState:
     symbols_emitted: int = 0
     aliases_emitted: int = 0
     had_precise: bool = False
+    source: Optional[bytes] = None  # in-memory source; None = read fm.real_path
 
 # ==============================================================================
 # Public API
@@ -173,16 +184,18 @@ def build_symbols(
     events: List[CstEvent], 
     sink: AnomalySink, 
     cfg: Optional[SymbolsConfig] = None, 
-    alias_hints: Optional[List[Dict]] = None
+    alias_hints: Optional[List[AliasHint]] = None,
+    source: Optional[bytes] = None,
 ) -> Iterator[Tuple[str, object]]:
     """
     Builds symbol and alias tables from a CST event stream.
     Now accepts and processes alias_hints from the DFG builder.
+    `source` lets callers supply the file bytes instead of reading fm.real_path.
     """
     cfg = cfg or SymbolsConfig()
     alias_hints = alias_hints or []
-    ad = _Adapter(fm.lang)
-    st = _BuildState(adapter=ad, file=fm, driver=info, cfg=cfg)
+    ad = _adapter_for(fm.lang)
+    st = _BuildState(adapter=ad, file=fm, driver=info, cfg=cfg, source=source)
 
     if not events:
         return
@@ -241,7 +254,7 @@ def build_symbols(
 
         elif ev.kind == CstEventKind.TOKEN:
             if st.in_params and ad.is_param_token(ev.type):
-                pname = _safe_token_text(st.file, ev)
+                pname = _safe_token_text(st.file, ev, st.source)
                 if pname:
                     srow = _symbol_row(cfg, st, st.scope_stack[-1].id, pname, SymbolKind.PARAM, visibility=_visibility_from_name(pname), is_dynamic=False, ev=ev, extra={})
                     st.sym_index[(st.scope_stack[-1].id, pname)] = srow.id
@@ -253,7 +266,7 @@ def build_symbols(
                 continue
 
             if st.open_assign_bytes and ad.is_identifier(ev.type):
-                vname = _safe_token_text(st.file, ev)
+                vname = _safe_token_text(st.file, ev, st.source)
                 if vname:
                     srow = _symbol_row(cfg, st, st.scope_stack[-1].id, vname, SymbolKind.VARIABLE, visibility=_visibility_from_name(vname), is_dynamic=False, ev=ev, extra={"from_assign": True})
                     st.sym_index[(st.scope_stack[-1].id, vname)] = srow.id
@@ -312,9 +325,9 @@ def build_symbols(
     if alias_hints:
         for hint in alias_hints:
             try:
-                scope_id = hint.get("scope_id")
-                lhs_name = hint.get("lhs_name")
-                rhs_name = hint.get("rhs_name")
+                scope_id = hint.scope_id
+                lhs_name = hint.lhs_name
+                rhs_name = hint.rhs_name
 
                 if not (scope_id and lhs_name and rhs_name):
                     continue
@@ -326,8 +339,8 @@ def build_symbols(
                 if lhs_symbol_id and rhs_symbol_id:
                     synthetic_ev = CstEvent(
                         kind=CstEventKind.TOKEN, type='__alias_hint__',
-                        byte_start=hint.get('byte_start', 0),
-                        byte_end=hint.get('byte_end', 0),
+                        byte_start=hint.byte_start,
+                        byte_end=hint.byte_end,
                         line_start=1, line_end=1
                     )
                     
@@ -459,9 +472,7 @@ def _alias_root_id(st: _BuildState, sid: str) -> str:
 
 def _extract_function_name(st: _BuildState, ev: CstEvent) -> str:
     try:
-        with open(st.file.real_path, "rb") as f:
-            f.seek(ev.byte_start)
-            span_bytes = f.read(min(512, ev.byte_end - ev.byte_start))
+        span_bytes = _read_bytes(st.file, ev.byte_start, min(512, ev.byte_end - ev.byte_start), st.source)
         text = span_bytes.decode(st.file.encoding or "utf-8", errors="ignore")
         
         if st.file.lang == Language.PY:
@@ -481,14 +492,19 @@ def _extract_function_name(st: _BuildState, ev: CstEvent) -> str:
     return "<anonymous>"
 
 def _extract_name_token(st: _BuildState, ev: CstEvent) -> Optional[str]:
-    return _safe_token_text(st.file, ev)
+    return _safe_token_text(st.file, ev, st.source)
+
+def _read_bytes(fm: FileMeta, start: int, n: int, source: Optional[bytes] = None) -> bytes:
+    if source is not None:
+        return source[start:start + n]
+    with open(fm.real_path, "rb") as f:
+        f.seek(start)
+        return f.read(n)
 
-def _safe_token_text(fm: FileMeta, ev: CstEvent) -> Optional[str]:
+def _safe_token_text(fm: FileMeta, ev: CstEvent, source: Optional[bytes] = None) -> Optional[str]:
     try:
         if ev.byte_end <= ev.byte_start or (ev.byte_end - ev.byte_start) > 1024: return None
-        with open(fm.real_path, "rb") as f:
-            f.seek(ev.byte_start)
-            b = f.read(ev.byte_end - ev.byte_start)
+        b = _read_bytes(fm, ev.byte_start, ev.byte_end - ev.byte_start, source)
         txt = b.decode(fm.encoding or "utf-8", errors="replace").strip()
         if not txt or len(txt) > 256: return None
         if not (txt[0].isalpha() or txt[0] in "_$"): return None
@@ -519,19 +535,17 @@ def _yield_decl_and_push(st: _BuildState, cfg: SymbolsConfig, sink: AnomalySink,
 def _synthetic_ev() -> CstEvent:
     return CstEvent(kind=CstEventKind.EXIT, type="__synthetic__", byte_start=0, byte_end=0, line_start=1, line_end=1)
 
-def _read_span_text(fm: FileMeta, ev: CstEvent, max_bytes: int = 4096) -> str:
+def _read_span_text(fm: FileMeta, ev: CstEvent, max_bytes: int = 4096, source: Optional[bytes] = None) -> str:
     try:
         n = min(max_bytes, max(0, ev.byte_end - ev.byte_start))
         if n <= 0: return ""
-        with open(fm.real_path, "rb") as f:
-            f.seek(ev.byte_start)
-            b = f.read(n)
+        b = _read_bytes(fm, ev.byte_start, n, source)
         return b.decode(fm.encoding or "utf-8", errors="replace")
     except Exception:
         return ""
 
 def _parse_import_like(st: _BuildState, ev: CstEvent) -> Tuple[List[str], bool]:
-    txt = _read_span_text(st.file, ev)
+    txt = _read_span_text(st.file, ev, source=st.source)
     if not txt: return ([], False)
     s = txt.strip()
     is_type_only = ("import type" in s) or ("type {" in s or s.startswith("type "))
@@ -574,7 +588,7 @@ def _parse_import_like(st: _BuildState, ev: CstEvent) -> Tuple[List[str], bool]:
     return (out, is_type_only)
 
 def _parse_export_like(st: _BuildState, ev: CstEvent) -> List[str]:
-    txt = _read_span_text(st.file, ev)
+    txt = _read_span_text(st.file, ev, source=st.source)
     if not txt: return []
     s = txt.strip()
     names: List[str] = []
@@ -3,8 +3,10 @@ from __future__ import annotations
 
 import hashlib
 import importlib
+import threading
 import time
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Dict, Iterator, List, Optional, Tuple
 
 from .discovery import FileMeta, Language
@@ -150,6 +152,7 @@ class TSTreeSitterDriver(ParserDriver):
       - Partial/error trees are surfaced: events emitted for ERROR/MISSING nodes,
         and a typed ParserError("SYNTAX_ERRORS") is raised post-traversal if any occurred.
       - Lazy initialization so import/setup errors are consistently surfaced via info()/parse.
+      - Thread-safe: each thread parses with its own tree-sitter Parser (set up lazily).
     """
 
     # Extra guardrail beyond discovery's size checks
@@ -158,7 +161,8 @@ class TSTreeSitterDriver(ParserDriver):
     def __init__(self, lang: Language) -> None:
         self._lang = lang
         self._init_error: Optional[ParserError] = None
-        self._parser: Optional[TSParser] = None  # type: ignore[type-arg]
+        # tree-sitter Parsers are not safe to share between threads: one per thread
+        self._local = threading.local()
         self._info: Optional[DriverInfo] = None
 
         if _TS_IMPORT_ERROR is not None or TSParser is None:
@@ -192,7 +196,7 @@ class TSTreeSitterDriver(ParserDriver):
             elapsed = time.perf_counter() - start
             return ParseStream(file=file, driver=info, events=None, elapsed_s=elapsed, ok=False, error=str(e))
 
-    def parse_to_events(self, file: FileMeta) -> Iterator[CstEvent]:
+    def parse_to_events(self, file: FileMeta, source: Optional[bytes] = None) -> Iterator[CstEvent]:
         if self._init_error:
             raise self._init_error
         if self._parser is None or self._info is None:
@@ -209,15 +213,18 @@ class TSTreeSitterDriver(ParserDriver):
             raise ParserError(code="NOT_TEXT", message="File classified as binary by discovery")
 
         # Read raw bytes; Tree-sitter works directly on bytes.
-        try:
-            with open(file.real_path, "rb") as fh:
-                raw = fh.read()
-        except FileNotFoundError as e:
-            raise ParserError(code="IO_ERROR", message="File not found", detail=str(e))
-        except PermissionError as e:
-            raise ParserError(code="PERMISSION_DENIED", message="Permission denied", detail=str(e))
-        except OSError as e:
-            raise ParserError(code="IO_ERROR", message="Read failed", detail=str(e))
+        if source is not None:
+            raw = bytes(source)
+        else:
+            try:
+                with open(file.real_path, "rb") as fh:
+                    raw = fh.read()
+            except FileNotFoundError as e:
+                raise ParserError(code="IO_ERROR", message="File not found", detail=str(e))
+            except PermissionError as e:
+                raise ParserError(code="PERMISSION_DENIED", message="Permission denied", detail=str(e))
+            except OSError as e:
+                raise ParserError(code="IO_ERROR", message="Read failed", detail=str(e))
 
         lidx = _LineIndex.build(raw)
 
@@ -373,6 +380,14 @@ class TSTreeSitterDriver(ParserDriver):
 
     # ---- internals ------------------------------------------------------------
 
+    @property
+    def _parser(self) -> Optional[TSParser]:  # type: ignore[type-arg]
+        return getattr(self._local, "parser", None)
+
+    @_parser.setter
+    def _parser(self, parser: Optional[TSParser]) -> None:  # type: ignore[type-arg]
+        self._local.parser = parser
+
     def _setup_parser(self) -> None:
         """Lazy initialization of parser and driver info."""
         # Grammar selection with smart fallbacks
@@ -488,4 +503,13 @@ class TSTreeSitterDriver(ParserDriver):
                 lang_obj, gname, version = res
                 return lang_obj, gname + "+tsx", version
 
-        return None
\ No newline at end of file
+        return None
+
+
+@lru_cache(maxsize=8)
+def get_ts_driver(lang: Language) -> TSTreeSitterDriver:
+    """
+    Shared driver per language so grammar loading happens once per process. Safe for
+    concurrent parse calls: each calling thread gets its own tree-sitter Parser.
+    """
+    return TSTreeSitterDriver(lang)
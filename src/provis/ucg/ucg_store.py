@@ -5,8 +5,10 @@ import hashlib
 import json
 import shutil
 import time
+from array import array
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 # Parquet / Arrow
 try:
@@ -46,6 +48,21 @@ else:  # pragma: no cover - only exercised when pyarrow unavailable
     _PROV_CONFIDENCE_TYPE = None
 
 
+@dataclass(frozen=True)
+class UcgStoreCounters:
+    """Snapshot of the v1 row totals written so far (see UcgStore.counters)."""
+    nodes: int
+    edges: int
+    anomalies: int
+    cfg_blocks: int
+    cfg_edges: int
+    dfg_nodes: int
+    dfg_edges: int
+    symbols: int
+    aliases: int
+    effects: int
+
+
 class UcgStore:
     """
     Streaming Parquet store for UCG rows (nodes/edges/anomalies) with:
@@ -310,8 +327,11 @@ class UcgStore:
 
     def append_anomalies(self, anomalies: Iterable[Anomaly]) -> None:
         """Store anomalies alongside UCG data."""
+        # Sinks stamp ts_ms at emission; rows that never went through one share one
+        # clock read per batch.
+        now_ms = int(time.time() * 1000)
         for a in anomalies:
-            self._anomaly_buf.add(_anomaly_to_arrow_row(a))
+            self._anomaly_buf.add(_anomaly_to_arrow_row(a, now_ms))
             if self._anomaly_buf.should_roll():
                 self._flush_anomalies()
 
@@ -462,6 +482,21 @@ class UcgStore:
             self._flush_scopes_v2()
             self._flush_symbols_scopes_v2()
 
+    @property
+    def counters(self) -> UcgStoreCounters:
+        return UcgStoreCounters(
+            nodes=self._node_rows_total,
+            edges=self._edge_rows_total,
+            anomalies=self._anomaly_rows_total,
+            cfg_blocks=self._cfg_block_rows_total,
+            cfg_edges=self._cfg_edge_rows_total,
+            dfg_nodes=self._dfg_node_rows_total,
+            dfg_edges=self._dfg_edge_rows_total,
+            symbols=self._symbol_rows_total,
+            aliases=self._alias_rows_total,
+            effects=self._effect_rows_total,
+        )
+
     def finalize(self, *, receipt: Dict) -> None:
         """
         Flush buffers, write run_receipt.json + query hints, compute integrity hashes,
@@ -1667,13 +1702,13 @@ def _edge_to_arrow_row_v2(e: EdgeRow) -> Dict:
     return data
 
 
-def _anomaly_to_arrow_row(a: Anomaly) -> Dict:
+def _anomaly_to_arrow_row(a: Anomaly, now_ms: int) -> Dict:
     span_start, span_end = (None, None)
     if getattr(a, "span", None) and isinstance(a.span, (tuple, list)) and len(a.span) == 2:
         span_start, span_end = a.span
     ts_ms = getattr(a, "ts_ms", None)
     if ts_ms is None:
-        ts_ms = int(time.time() * 1000)
+        ts_ms = now_ms
     return dict(
         path=a.path,
         blob_sha=a.blob_sha,
@@ -1889,18 +1924,32 @@ def _effect_to_arrow_row_v2(r: EffectRow) -> Dict:
 
 # ============================== buffers =======================================
 
+# Columns filled from ProvenanceV2.base_columns(), which always yields ints (never
+# None), so they can live in array.array instead of lists of boxed ints.
+_PACKED_INT_COLUMNS = frozenset({"prov_byte_start", "prov_byte_end", "prov_line_start", "prov_line_end"})
+_PACKED_INT_TYPECODES = {pa.int64(): "q", pa.int32(): "i"} if _PA_IMPORT_ERROR is None else {}
+
+
 class _AdaptiveRowBuffer:
     """
     Row buffer → Arrow Table with adaptive rollover based on row count or
     estimated memory usage (string-heavy columns can balloon).
     """
 
-    __slots__ = ("_schema", "_roll_rows", "_cols", "_count", "_max_bytes", "_last_check")
+    __slots__ = ("_schema", "_roll_rows", "_cols", "_appenders", "_count", "_max_bytes", "_last_check")
 
     def __init__(self, schema: pa.Schema, roll_rows: int, max_memory_mb: int) -> None:
         self._schema = schema
         self._roll_rows = int(roll_rows)
-        self._cols: Dict[str, List] = {f.name: [] for f in schema}
+        # One list per column (struct-of-arrays); to_table() turns each into one pa.array.
+        # Provenance offsets are packed machine ints rather than boxed Python ints.
+        self._cols: Dict[str, List] = {}
+        for f in schema:
+            code = _PACKED_INT_TYPECODES.get(f.type) if f.name in _PACKED_INT_COLUMNS else None
+            self._cols[f.name] = array(code) if code else []  # type: ignore[assignment]
+        # (column name, bound list.append) resolved once: pa.Field.name builds a new str
+        # on every access, and add() runs for every row of every table.
+        self._appenders: Tuple[Tuple[str, Callable], ...] = tuple((name, col.append) for name, col in self._cols.items())
         self._count = 0
         self._max_bytes = int(max_memory_mb) * 1024 * 1024
         self._last_check = 0
@@ -1909,8 +1958,9 @@ class _AdaptiveRowBuffer:
         return self._count > 0
 
     def add(self, row: Dict) -> None:
-        for f in self._schema:
-            self._cols[f.name].append(row.get(f.name))
+        get = row.get
+        for name, append in self._appenders:
+            append(get(name))
         self._count += 1
 
     def should_roll(self) -> bool:
@@ -1939,10 +1989,17 @@ class _AdaptiveRowBuffer:
         return int(avg * self._count)
 
     def to_table(self) -> pa.Table:
-        arrays = [pa.array(self._cols[f.name], type=f.type) for f in self._schema]
+        arrays = []
+        for f in self._schema:
+            col = self._cols[f.name]
+            if isinstance(col, array):
+                # tobytes() copies, so the table stays valid after clear() reuses col
+                arrays.append(pa.Array.from_buffers(f.type, len(col), [None, pa.py_buffer(col.tobytes())]))
+            else:
+                arrays.append(pa.array(col, type=f.type))
         return pa.Table.from_arrays(arrays, schema=self._schema)
 
     def clear(self) -> None:
-        for k in self._cols:
-            self._cols[k].clear()
+        for col in self._cols.values():
+            del col[:]  # in place: the bound appenders keep pointing at these objects
         self._count = 0
@@ -59,7 +59,7 @@ def main():
         enable_dfg=True,
         enable_symbols=True,
         enable_effects=True,
-        flush_every_n_files=10,  # Flush more frequently for smaller repos
+        flush_bytes=8 * 1024 * 1024,  # Flush more frequently for smaller repos
         node_edge_batch=1000,    # Smaller batches for testing
         cfg_batch=1000,
         dfg_batch=1000,
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+pytest.importorskip("duckdb")
+
+from provis.ucg.iterators import UcgReader
+
+
+def _prov(n: int) -> dict:
+    return {
+        "prov_blob_sha": ["sha"] * n,
+        "prov_grammar_sha": ["g"] * n,
+        "prov_run_id": ["run"] * n,
+        "prov_config_hash": ["cfg"] * n,
+        "prov_byte_start": list(range(n)),
+        "prov_byte_end": [i + 1 for i in range(n)],
+        "prov_line_start": [1] * n,
+        "prov_line_end": [1] * n,
+    }
+
+
+def _write_ucg(tmp_path: Path) -> Path:
+    paths = ["a.py", "b.py", "a.py", "c.py"]
+    (tmp_path / "nodes").mkdir()
+    (tmp_path / "edges").mkdir()
+    pq.write_table(
+        pa.table({
+            "id": [f"n{i}" for i in range(4)],
+            "kind": ["var_def", "var_use", "var_use", "param"],
+            "name": ["x", "y", "x", "p"],
+            "path": paths,
+            "lang": ["python"] * 4,
+            "attrs_json": ["{}"] * 4,
+            **_prov(4),
+        }),
+        tmp_path / "nodes" / "part-0.parquet",
+    )
+    pq.write_table(
+        pa.table({
+            "id": [f"e{i}" for i in range(4)],
+            "kind": ["def_use"] * 4,
+            "src_id": ["n0"] * 4,
+            "dst_id": ["n2", "n1", "n2", "n3"],
+            "path": paths,
+            "lang": ["python"] * 4,
+            "attrs_json": ["{}"] * 4,
+            **_prov(4),
+        }),
+        tmp_path / "edges" / "part-0.parquet",
+    )
+    return tmp_path
+
+
+def test_batched_path_scans_match_per_path_scans(tmp_path: Path) -> None:
+    reader = UcgReader(_write_ucg(tmp_path))
+    wanted = ["a.py", "b.py", "missing.py"]
+
+    nodes = reader.nodes_by_paths(wanted)
+    edges = reader.edges_by_paths(wanted)
+
+    assert set(nodes) == set(wanted)
+    assert nodes["missing.py"] == [] and edges["missing.py"] == []
+    for p in ("a.py", "b.py"):
+        assert nodes[p] == list(reader.iter_nodes_by_path(path=p))
+        assert edges[p] == list(reader.iter_edges_by_src_or_dst(path=p))
+    reader.close()
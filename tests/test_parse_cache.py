@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import hashlib
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from provis.ucg import parse_cache
+from provis.ucg.discovery import FileMeta, Language
+from provis.ucg.python_driver import PythonLibCstDriver
+
+
+def _file_meta_for(path: Path) -> FileMeta:
+    raw = path.read_bytes()
+    return FileMeta(
+        path=path.name,
+        real_path=str(path.resolve()),
+        blob_sha=hashlib.blake2b(raw, digest_size=20).hexdigest(),
+        size_bytes=len(raw),
+        mtime_ns=0,
+        run_id="test",
+        config_hash="test-config",
+        is_text=True,
+        encoding="utf-8",
+        encoding_confidence=1.0,
+        lang=Language.PY,
+        flags=set(),
+    )
+
+
+class _CountingDriver(PythonLibCstDriver):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    def parse_to_events(self, file):
+        self.calls += 1
+        return super().parse_to_events(file)
+
+
+def test_parse_cached_hits_on_unchanged_content(tmp_path: Path) -> None:
+    src = tmp_path / "mod.py"
+    src.write_text("def f(a):\n    b = a\n    return b\n")
+    fm = _file_meta_for(src)
+    cache_dir = tmp_path / "cache"
+    driver = _CountingDriver()
+
+    first = list(parse_cache.parse_cached(driver, fm, cache_dir=cache_dir).events)
+    second = list(parse_cache.parse_cached(driver, fm, cache_dir=cache_dir).events)
+
+    assert driver.calls == 1
+    assert first == second
+    assert first == list(PythonLibCstDriver().parse_to_events(fm))
+
+    # Editing the file changes the content hash, so the cache must miss.
+    src.write_text("def g():\n    return 1\n")
+    parse_cache.parse_cached(driver, fm, cache_dir=cache_dir)
+    assert driver.calls == 2
+
+
+def test_load_treats_corrupt_entry_as_miss(tmp_path: Path) -> None:
+    (tmp_path / "deadbeef.pkl").write_bytes(b"not a pickle")
+    assert parse_cache.load("deadbeef", cache_dir=tmp_path) is None
+
+
+def test_event_cache_shares_one_parse_per_blob(tmp_path: Path) -> None:
+    src = tmp_path / "mod.py"
+    src.write_text("x = 1\ny = x\n")
+    fm = _file_meta_for(src)
+    driver = _CountingDriver()
+    cache = parse_cache.EventCache()
+
+    first = list(cache.get_or_parse(fm, driver).events)
+    second = list(cache.get_or_parse(fm, driver).events)
+
+    assert driver.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert first == second
+
+
+def test_cache_key_covers_driver_code(monkeypatch) -> None:
+    info = PythonLibCstDriver().info()
+    before = parse_cache.cache_key("sha", info)
+    assert parse_cache.cache_key("sha", info) == before
+
+    # An edit to the driver sources must miss entries written by the old code.
+    monkeypatch.setattr(parse_cache, "_driver_code_sha", lambda: "edited")
+    assert parse_cache.cache_key("sha", info) != before
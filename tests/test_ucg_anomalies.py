@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import sys
+import threading
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from provis.ucg.anomalies import Anomaly, AnomalyKind, AnomalySink, Severity
+
+
+def _anomaly(kind: AnomalyKind, severity: Severity) -> Anomaly:
+    return Anomaly(path="mod.py", blob_sha="sha", kind=kind, severity=severity)
+
+
+def test_emit_many_matches_per_item_emit() -> None:
+    batch = [
+        _anomaly(AnomalyKind.PARSE_FAILED, Severity.ERROR),
+        _anomaly(AnomalyKind.PARSE_FAILED, Severity.WARN),
+        _anomaly(AnomalyKind.TIMEOUT, Severity.ERROR),
+    ]
+    one_by_one = AnomalySink()
+    for a in batch:
+        one_by_one.emit(a)
+    batched = AnomalySink()
+    batched.emit_many(batch)
+
+    assert batched.counters() == one_by_one.counters()
+    assert batched.counters()["total"] == 3
+    assert batched.counters()["kind:PARSE_FAILED"] == 2
+    assert [a._replace(ts_ms=None) for a in batched.drain()] == batch
+    assert batched.drain() == []
+
+
+def test_emit_stamps_unstamped_anomalies_at_emission() -> None:
+    sink = AnomalySink()
+    stamped = _anomaly(AnomalyKind.TIMEOUT, Severity.WARN)._replace(ts_ms=123)
+    sink.emit_many([_anomaly(AnomalyKind.TIMEOUT, Severity.WARN), stamped])
+    sink.emit(_anomaly(AnomalyKind.PARSE_FAILED, Severity.ERROR))
+
+    first, kept, single = sink.drain()
+    assert first.ts_ms is not None and single.ts_ms is not None
+    assert kept.ts_ms == 123
+
+
+def test_emit_many_ignores_empty_batch() -> None:
+    sink = AnomalySink()
+    sink.emit_many([])
+    assert sink.counters() == {"total": 0}
+
+
+def test_concurrent_emitters_lose_no_counts_or_items() -> None:
+    sink = AnomalySink()
+    a = _anomaly(AnomalyKind.TIMEOUT, Severity.WARN)
+    drained: list[Anomaly] = []
+
+    def emitter() -> None:
+        for _ in range(2000):
+            sink.emit(a)
+
+    threads = [threading.Thread(target=emitter) for _ in range(4)]
+    for t in threads:
+        t.start()
+    while any(t.is_alive() for t in threads):
+        drained.extend(sink.drain())
+    for t in threads:
+        t.join()
+    drained.extend(sink.drain())
+
+    assert len(drained) == 8000
+    assert sink.counters() == {"total": 8000, "kind:TIMEOUT": 8000, "sev:WARN": 8000}
+
+
+def test_bounded_sink_spills_full_buffer_to_callback() -> None:
+    spilled: list[list[Anomaly]] = []
+    sink = AnomalySink(max_buffered=3, on_full=spilled.append)
+    a = _anomaly(AnomalyKind.TIMEOUT, Severity.WARN)
+
+    for _ in range(7):
+        sink.emit(a)
+    sink.emit_many([a, a])
+
+    assert [len(batch) for batch in spilled] == [3, 3, 3]
+    assert len(sink.drain()) == 0
+    assert sink.counters()["total"] == 9
+
+
+def test_discovery_enums_are_counted_by_name() -> None:
+    from provis.ucg import discovery
+
+    sink = AnomalySink()
+    sink.emit(Anomaly(path="mod.py", blob_sha="sha", kind=discovery.AnomalyKind.TIMEOUT, severity=discovery.Severity.WARN))
+
+    assert sink.counters() == {"total": 1, "kind:TIMEOUT": 1, "sev:WARN": 1}
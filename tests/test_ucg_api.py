@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import hashlib
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+import pyarrow.parquet as pq
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from provis.ucg.api import Step1Config, build_ucg_for_files
+from provis.ucg.discovery import FileMeta, Language
+
+
+def _file_meta_for(path: Path) -> FileMeta:
+    raw = path.read_bytes()
+    return FileMeta(
+        path=path.name,
+        real_path=str(path.resolve()),
+        blob_sha=hashlib.blake2b(raw, digest_size=20).hexdigest(),
+        size_bytes=len(raw),
+        mtime_ns=0,
+        run_id="test",
+        config_hash="test-config",
+        is_text=True,
+        encoding="utf-8",
+        encoding_confidence=1.0,
+        lang=Language.PY,
+        flags=set(),
+    )
+
+
+def test_build_ucg_for_files_publishes_output(tmp_path: Path) -> None:
+    src = tmp_path / "mod.py"
+    src.write_text("def f(a):\n    b = a\n    return b\n")
+    out_dir = tmp_path / "out"
+
+    summary = build_ucg_for_files(
+        [_file_meta_for(src)],
+        out_dir,
+        cfg=Step1Config(enable_cfg=False, enable_effects=False),
+    )
+
+    assert (summary.files_total, summary.files_parsed) == (1, 1)
+    assert summary.nodes_rows > 0
+    assert (out_dir / "run_receipt.json").exists()
+
+
+def test_presorted_stream_rejects_out_of_order_files(tmp_path: Path) -> None:
+    metas = []
+    for name in ("b.py", "a.py"):
+        src = tmp_path / name
+        src.write_text("x = 1\n")
+        metas.append(_file_meta_for(src))
+
+    with pytest.raises(ValueError, match="not sorted"):
+        build_ucg_for_files(iter(metas), tmp_path / "out", cfg=Step1Config(workers=1), presorted=True)
+
+
+def test_binary_files_are_skipped_with_one_anomaly_per_extension(tmp_path: Path) -> None:
+    metas = []
+    for name in ("a.png", "b.png", "c.jpg"):
+        f = tmp_path / name
+        f.write_bytes(b"\x89PNG\x00\x00")
+        metas.append(replace(_file_meta_for(f), is_text=False, lang=Language.UNKNOWN))
+    src = tmp_path / "mod.py"
+    src.write_text("x = 1\n")
+    metas.append(_file_meta_for(src))
+    out_dir = tmp_path / "out"
+
+    summary = build_ucg_for_files(metas, out_dir, cfg=Step1Config(workers=1))
+
+    assert (summary.files_total, summary.files_parsed) == (4, 1)
+    anomalies = pq.read_table(out_dir / "anomalies").to_pylist()
+    binary = sorted((a["path"], a["detail"]) for a in anomalies if a["kind"].endswith("BINARY_FILE"))
+    assert binary == [("*.jpg", "binary-or-nontext:1-files"), ("*.png", "binary-or-nontext:2-files")]
+
+
+def test_failing_pass_is_reported_and_later_passes_still_run(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from provis.ucg import api
+
+    def broken_cfg(*args, **kwargs):
+        raise RuntimeError("boom")
+        yield  # pragma: no cover
+
+    monkeypatch.setattr(api, "build_cfg", broken_cfg)
+    src = tmp_path / "mod.py"
+    src.write_text("def f(a):\n    b = a\n    return b\n")
+    out_dir = tmp_path / "out"
+
+    summary = build_ucg_for_files([_file_meta_for(src)], out_dir, cfg=Step1Config(workers=1))
+
+    assert summary.cfg_blocks_rows == 0
+    assert summary.dfg_nodes_rows > 0
+    details = [a["detail"] for a in pq.read_table(out_dir / "anomalies").to_pylist()]
+    assert "cfg-exception:RuntimeError:boom" in details
+
+
+def test_store_errors_on_the_writer_thread_reach_the_caller(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from provis.ucg import api
+
+    def failing_append(self, rows):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(api.UcgStore, "append", failing_append)
+    src = tmp_path / "mod.py"
+    src.write_text("x = 1\n")
+
+    with pytest.raises(OSError, match="disk full"):
+        build_ucg_for_files([_file_meta_for(src)], tmp_path / "out", cfg=Step1Config(workers=1))
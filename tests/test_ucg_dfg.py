@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import hashlib
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from provis.ucg.dfg import AliasHint, DfgBuilder, DfgConfig, build_dfg
+from provis.ucg.discovery import AnomalySink, FileMeta, Language
+from provis.ucg.python_driver import PythonLibCstDriver
+
+
+def _file_meta_for(path: Path) -> FileMeta:
+    raw = path.read_bytes()
+    return FileMeta(
+        path=path.name,
+        real_path=str(path.resolve()),
+        blob_sha=hashlib.blake2b(raw, digest_size=20).hexdigest(),
+        size_bytes=len(raw),
+        mtime_ns=0,
+        run_id="test",
+        config_hash="test-config",
+        is_text=True,
+        encoding="utf-8",
+        encoding_confidence=1.0,
+        lang=Language.PY,
+        flags=set(),
+    )
+
+
+def _builder_for(path: Path) -> DfgBuilder:
+    fm = _file_meta_for(path)
+    events = list(PythonLibCstDriver().parse_to_events(fm))
+    return DfgBuilder(fm, None, events, AnomalySink(), DfgConfig())
+
+
+def test_assignment_gate_skips_operator_lookup_without_equals(tmp_path: Path) -> None:
+    src = tmp_path / "no_assign.py"
+    src.write_text("def f(a):\n    return a\n")
+    builder = _builder_for(src)
+
+    assert builder.has_assignment_syntax is False
+    kinds = [kind for kind, _ in builder.build()]
+    assert "alias_hint" not in kinds
+
+
+def test_assignment_gate_enabled_with_equals(tmp_path: Path) -> None:
+    src = tmp_path / "assign.py"
+    src.write_text("def f(a):\n    b = a\n    return b\n")
+    builder = _builder_for(src)
+
+    assert builder.has_assignment_syntax is True
+    assert any(kind == "dfg_node" for kind, _ in builder.build())
+
+
+def test_assign_offsets_cover_shift_assignments_but_not_comparisons(tmp_path: Path) -> None:
+    src = tmp_path / "ops.py"
+    src.write_text("a <<= 1\nb >>= 1\nc = a <= b >= a\n")
+    builder = _builder_for(src)
+
+    assert builder.assign_offsets == [4, 12, 18]
+
+
+def test_assign_operator_skips_equals_inside_nested_nodes(tmp_path: Path) -> None:
+    src = tmp_path / "nested.py"
+    src.write_text('d["k=v"] = 1\nx[(y:=1)] = 2\na <<= 3\n')
+    builder = _builder_for(src)
+    handle_token = builder._handle_token_event
+    resolved = []
+
+    def record(ev):
+        if builder.current_assignment:
+            resolved.append(builder.current_assignment["op_offset"])
+        return handle_token(ev)
+
+    builder._handle_token_event = record
+    list(builder.build())
+
+    assert sorted(set(resolved)) == [9, 23, 31]
+
+
+def test_kinds_filter_matches_filtered_full_output(tmp_path: Path) -> None:
+    src = tmp_path / "mixed.py"
+    src.write_text("def f(a):\n    b = a\n    c = b\n    return c\n")
+    fm = _file_meta_for(src)
+    events = list(PythonLibCstDriver().parse_to_events(fm))
+
+    full = list(build_dfg(fm, None, events, AnomalySink()))
+    only_edges = list(build_dfg(fm, None, events, AnomalySink(), kinds=frozenset({"dfg_edge"})))
+
+    assert only_edges == [item for item in full if item[0] == "dfg_edge"]
+
+
+def test_alias_hint_json_is_stable_for_diffing() -> None:
+    hint = AliasHint(lhs_name="b", rhs_name="a", scope_id="s1")
+
+    assert hint.to_json() == '{"byte_end":0,"byte_start":0,"lhs_name":"b","rhs_name":"a","scope_id":"s1"}'
+    assert hint == AliasHint(lhs_name="b", rhs_name="a", scope_id="s1")
+    assert not hasattr(hint, "__dict__")
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from provis.ucg.discovery import DiscoveryConfig, iter_discovered_files
+
+
+def test_discovery_yields_files_in_sorted_path_order(tmp_path: Path) -> None:
+    # "-" and "." sort before "/", so a walk that visits "a/" before "a.py" is wrong.
+    for rel in ("a/b.py", "a.py", "a-b.py", "a0.py", "b/c/d.py", "b/a.py", "z.py"):
+        f = tmp_path / rel
+        f.parent.mkdir(parents=True, exist_ok=True)
+        f.write_text("x = 1\n")
+
+    paths = [fm.path for fm in iter_discovered_files(tmp_path, DiscoveryConfig())]
+
+    assert paths == sorted(paths)
+    assert paths == ["a-b.py", "a.py", "a/b.py", "a0.py", "b/a.py", "b/c/d.py", "z.py"]